@@ -0,0 +1,91 @@
+"""
+Stress test of the player/meteor collision checks: compares testing every
+meteor every frame (arcade.check_for_collision_with_list) with the approach
+broad phase used by EnemyWordList, as the meteor count rises.
+
+Usage: python -m benchmarks.collision_benchmark [--frames N] [--counts 10 100 ...]
+"""
+import argparse
+import math
+import random
+import time
+import arcade
+from space_shooter.collisions import ApproachBroadPhase
+
+PLAYER_POSITION = (75, 360)
+SPAWN_DISTANCE_RANGE = (300, 1400)
+
+
+def spawn_meteor(rng: random.Random, speed: float) -> arcade.Sprite:
+    """
+    Creates a meteor on an arc to the right of the player, moving towards it
+    """
+    angle = rng.uniform(-math.pi / 3, math.pi / 3)
+    distance = rng.uniform(*SPAWN_DISTANCE_RANGE)
+    meteor = arcade.SpriteSolidColor(
+        45, 38,
+        center_x=PLAYER_POSITION[0] + distance * math.cos(angle),
+        center_y=PLAYER_POSITION[1] + distance * math.sin(angle)
+    )
+    meteor.change_angle = rng.uniform(-5.0, 5.0)
+    meteor.velocity = (-speed * math.cos(angle), -speed * math.sin(angle))
+    return meteor
+
+
+def run(meteor_count: int, frames: int, use_broad_phase: bool, seed: int = 0) -> tuple[float, float]:
+    """
+    Simulates `frames` frames with a constant number of meteors (a meteor that
+    hits the player is replaced). Returns the mean collision check time per
+    frame (in microseconds) and the mean number of precise tests per frame.
+    """
+    rng = random.Random(seed)
+    player = arcade.SpriteSolidColor(54, 40, center_x=PLAYER_POSITION[0], center_y=PLAYER_POSITION[1])
+    meteors = arcade.SpriteList()
+    broad_phase = ApproachBroadPhase(player)
+
+    def add_meteor() -> None:
+        speed = rng.uniform(0.75, 1.25)
+        meteor = spawn_meteor(rng, speed)
+        meteors.append(meteor)
+        broad_phase.add(meteor, speed)
+
+    for _ in range(meteor_count):
+        add_meteor()
+    delta_time = 1 / 60
+    check_seconds = 0.0
+    for _ in range(frames):
+        start = time.perf_counter()
+        if use_broad_phase:
+            collisions = broad_phase.collisions()
+        else:
+            collisions = arcade.check_for_collision_with_list(player, meteors)
+        check_seconds += time.perf_counter() - start
+        for meteor in collisions:
+            meteors.remove(meteor)
+            broad_phase.remove(meteor)
+            add_meteor()
+        meteors.update(delta_time)
+        broad_phase.advance(delta_time)
+    precise_checks = broad_phase.precise_checks if use_broad_phase else meteor_count * frames
+    return check_seconds / frames * 1e6, precise_checks / frames
+
+
+def main(argv: list[str] | None = None) -> None:
+    """
+    Runs the benchmark for each meteor count and prints a table
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--frames", type=int, default=1200, help="Frames simulated per run")
+    parser.add_argument(
+        "--counts", type=int, nargs="+", default=[5, 25, 100, 250, 500, 1000], help="Meteor counts"
+    )
+    args = parser.parse_args(argv)
+    print(f"{'meteors':>8} {'all (us/frame)':>15} {'broad (us/frame)':>17} {'tests/frame':>12}")
+    for count in args.counts:
+        brute_us, _ = run(count, args.frames, use_broad_phase=False)
+        broad_us, tests_per_frame = run(count, args.frames, use_broad_phase=True)
+        print(f"{count:>8} {brute_us:>15.1f} {broad_us:>17.1f} {tests_per_frame:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+"""
+Load test of the Space Shooter: plays many headless games with bot typists
+in a process pool, and reports the distribution of the simulation's frame
+times, the entity counts and the score curves.
+
+Usage: python -m benchmarks.shooter_load_test [--games N] [--workers N] [--minutes M]
+    [--difficulty 0|1|2] [--wpm MEAN STDDEV] [--error-rate R] [--policy closest|oldest|shortest|random]
+    [--profiles PATH] [--profile NAME] [--json PATH]
+
+With --profile, the games use a difficulty profile of a profiles file (by
+default the game's own), e.g. curves being tuned against the score curves.
+"""
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+import numpy as np
+from utils.frame_timer import histogram_percentiles
+from utils.word_manager import WordManager
+from space_shooter.bot_typist import BotProfile, BotTypist
+from space_shooter.difficulty import DIFFICULTY_PROFILES_PATH, Difficulty, load_difficulty_settings
+from space_shooter.simulation import SpaceShooterSimulation
+
+WIDTH, HEIGHT = 1280, 720
+# Frame times are counted in 1 µs bins; the last bin counts the longer frames
+FRAME_TIME_BINS = 20_000
+CHECKPOINT_SECONDS = 10
+FRAME_MICROSECONDS = round(SpaceShooterSimulation.MICROSECONDS / SpaceShooterSimulation.STEPS_PER_SECOND)
+ENTITIES = ("enemy_words", "lasers", "explosions")
+
+
+@dataclass
+class LoadTestConfig:
+    """
+    The setup shared by all the games of a load test
+    """
+    profile: BotProfile = field(default_factory=BotProfile)
+    difficulty_level: int = 1
+    max_seconds: float = 300.0
+    # Overrides the curves of the difficulty level
+    difficulty_setting: Difficulty.DifficultySetting | None = None
+
+
+@dataclass
+class GameReport:
+    """
+    The measurements of one simulated game
+    """
+    seed: int
+    score: int
+    seconds: float
+    game_over: bool
+    wpm: float
+    keystrokes: int
+    errors: int
+    # Count of frames per frame time (µs), see FRAME_TIME_BINS
+    frame_time_histogram: np.ndarray
+    entity_means: dict[str, float]
+    entity_maxima: dict[str, int]
+    # Score every CHECKPOINT_SECONDS, while the game lasts
+    score_curve: list[int]
+    allocated_sprites: int
+
+
+_word_manager: WordManager | None = None
+
+
+def _init_worker() -> None:
+    """
+    Loads the words once per worker process
+    """
+    global _word_manager
+    _word_manager = WordManager()
+
+
+def play_game(config: LoadTestConfig, seed: int) -> GameReport:
+    """
+    Plays one game with a bot typist, at 60 frames per second of simulated
+    time, until game over or `config.max_seconds`
+    """
+    simulation = SpaceShooterSimulation(
+        WIDTH,
+        HEIGHT,
+        difficulty_level=config.difficulty_level,
+        seed=seed,
+        word_manager=_word_manager,
+        difficulty_setting=config.difficulty_setting
+    )
+    bot = BotTypist(simulation, config.profile, seed=seed)
+    frame_seconds = FRAME_MICROSECONDS / SpaceShooterSimulation.MICROSECONDS
+    max_frames = int(config.max_seconds / frame_seconds)
+    checkpoint_frames = int(CHECKPOINT_SECONDS / frame_seconds)
+    frame_times_us = np.zeros(max_frames, dtype=np.int64)
+    entity_counts = np.zeros((max_frames, len(ENTITIES)), dtype=np.int64)
+    score_curve = []
+    frames = 0
+    while frames < max_frames and not simulation.game_over:
+        start = time.perf_counter_ns()
+        simulation.advance(FRAME_MICROSECONDS)
+        bot.update(frame_seconds)
+        frame_times_us[frames] = (time.perf_counter_ns() - start) // 1000
+        entity_counts[frames] = (
+            len(simulation.enemy_word_list), len(simulation.laser_list), len(simulation.explosion_list)
+        )
+        frames += 1
+        if frames % checkpoint_frames == 0:
+            score_curve.append(simulation.game_stats.score)
+    entity_counts = entity_counts[:frames]
+    return GameReport(
+        seed=seed,
+        score=simulation.game_stats.score,
+        seconds=simulation.time,
+        game_over=simulation.game_over,
+        wpm=bot.wpm,
+        keystrokes=bot.keystrokes,
+        errors=bot.errors,
+        frame_time_histogram=np.bincount(
+            np.minimum(frame_times_us[:frames], FRAME_TIME_BINS - 1), minlength=FRAME_TIME_BINS
+        ),
+        entity_means={name: float(entity_counts[:, i].mean()) for i, name in enumerate(ENTITIES)},
+        entity_maxima={name: int(entity_counts[:, i].max()) for i, name in enumerate(ENTITIES)},
+        score_curve=score_curve,
+        allocated_sprites=sum(counters["allocated"] for counters in simulation.get_pool_counters().values())
+    )
+
+
+def summarize(reports: list[GameReport]) -> dict:
+    """
+    Aggregates the reports of all the games
+    """
+    histogram = np.sum([report.frame_time_histogram for report in reports], axis=0)
+    percentiles = [50, 90, 99, 99.9]
+    scores = np.array([report.score for report in reports])
+    checkpoint_count = max(len(report.score_curve) for report in reports)
+    score_curve = []
+    for i in range(checkpoint_count):
+        alive = [report.score_curve[i] for report in reports if len(report.score_curve) > i]
+        score_curve.append(dict(
+            seconds=(i + 1) * CHECKPOINT_SECONDS,
+            alive=len(alive) / len(reports),
+            mean_score=float(np.mean(alive)),
+            p10_score=float(np.percentile(alive, 10)),
+            p90_score=float(np.percentile(alive, 90))
+        ))
+    return dict(
+        games=len(reports),
+        frames=int(histogram.sum()),
+        frame_time_us=dict(
+            zip([f"p{p:g}" for p in percentiles], histogram_percentiles(histogram, percentiles)),
+            max=int(np.flatnonzero(histogram)[-1])
+        ),
+        entities={
+            name: dict(
+                mean=float(np.mean([report.entity_means[name] for report in reports])),
+                max=max(report.entity_maxima[name] for report in reports)
+            )
+            for name in ENTITIES
+        },
+        score=dict(
+            mean=float(scores.mean()),
+            p10=float(np.percentile(scores, 10)),
+            p50=float(np.percentile(scores, 50)),
+            p90=float(np.percentile(scores, 90))
+        ),
+        game_over_rate=float(np.mean([report.game_over for report in reports])),
+        mean_seconds=float(np.mean([report.seconds for report in reports])),
+        error_rate=sum(report.errors for report in reports) / max(sum(report.keystrokes for report in reports), 1),
+        max_allocated_sprites=max(report.allocated_sprites for report in reports),
+        score_curve=score_curve
+    )
+
+
+def run(config: LoadTestConfig, games: int, workers: int | None = None, seed: int = 0) -> dict:
+    """
+    Plays the games in a process pool and returns their summary
+    """
+    seeds = range(seed, seed + games)
+    chunk_size = max(games // ((workers or os.cpu_count() or 1) * 4), 1)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+        reports = list(executor.map(play_game, [config] * games, seeds, chunksize=chunk_size))
+    return summarize(reports)
+
+
+def print_summary(summary: dict, elapsed: float) -> None:
+    """
+    Prints a summary as tables
+    """
+    frame_times = summary["frame_time_us"]
+    print(f"{summary['games']} games, {summary['frames']} frames in {elapsed:.1f} s")
+    print("Frame time (us): " + ", ".join(f"{name} {value}" for name, value in frame_times.items()))
+    for name, counts in summary["entities"].items():
+        print(f"{name:>12}: mean {counts['mean']:.1f}, max {counts['max']}")
+    score = summary["score"]
+    print(
+        f"Score: mean {score['mean']:.0f}, p10 {score['p10']:.0f}, p50 {score['p50']:.0f}, p90 {score['p90']:.0f}; "
+        f"game over in {summary['game_over_rate']:.0%} of the games (mean length {summary['mean_seconds']:.0f} s)"
+    )
+    print(f"Typing error rate: {summary['error_rate']:.1%}; sprites allocated per game: {summary['max_allocated_sprites']} at most")
+    print(f"{'seconds':>8} {'alive':>6} {'mean score':>11} {'p10':>8} {'p90':>8}")
+    for point in summary["score_curve"]:
+        print(
+            f"{point['seconds']:>8} {point['alive']:>6.0%} {point['mean_score']:>11.0f} "
+            f"{point['p10_score']:>8.0f} {point['p90_score']:>8.0f}"
+        )
+
+
+def main(argv: list[str] | None = None) -> None:
+    """
+    Runs the load test
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--games", type=int, default=200, help="Number of games")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Worker processes")
+    parser.add_argument("--minutes", type=float, default=5.0, help="Longest simulated game")
+    parser.add_argument("--difficulty", type=int, default=1, choices=[0, 1, 2], help="Difficulty level")
+    parser.add_argument("--wpm", type=float, nargs=2, default=[60.0, 10.0], metavar=("MEAN", "STDDEV"))
+    parser.add_argument("--error-rate", type=float, default=0.03, help="Probability of a wrong keystroke")
+    parser.add_argument("--policy", default="closest", choices=list(BotTypist.TARGET_POLICIES), help="Target policy")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the first game")
+    parser.add_argument("--profiles", default=DIFFICULTY_PROFILES_PATH, help="Difficulty profiles file")
+    parser.add_argument("--profile", help="Difficulty profile to play, instead of the difficulty level's")
+    parser.add_argument("--json", help="Also write the summary to this file")
+    args = parser.parse_args(argv)
+    difficulty_setting = load_difficulty_settings(args.profiles)[args.profile] if args.profile else None
+    config = LoadTestConfig(
+        profile=BotProfile(
+            wpm_mean=args.wpm[0], wpm_stddev=args.wpm[1], error_rate=args.error_rate, target_policy=args.policy
+        ),
+        difficulty_level=args.difficulty,
+        max_seconds=args.minutes * 60,
+        difficulty_setting=difficulty_setting
+    )
+    start = time.perf_counter()
+    summary = run(config, args.games, args.workers, args.seed)
+    print_summary(summary, time.perf_counter() - start)
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump(summary, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
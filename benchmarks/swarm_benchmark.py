@@ -0,0 +1,147 @@
+"""
+Swarm benchmark scene: a fixed crowd of meteors, shot down by a very fast
+autopilot typist (so that hundreds of lasers and explosions are alive at
+once), with an invulnerable player. Reports the p50/p99 frame times.
+
+With --headless, only the simulation runs (no window): this times the game
+logic and collision paths alone, and runs anywhere.
+
+Usage: python -m benchmarks.swarm_benchmark [--meteors N] [--seconds S] [--wpm WPM] [--seed N] [--headless]
+"""
+import argparse
+import dataclasses
+import math
+import time
+import arcade
+from utils.frame_timer import FrameTimer
+from space_shooter.bot_typist import BotProfile, BotTypist
+from space_shooter.difficulty import Difficulty, PiecewiseCurve
+from space_shooter.simulation import SpaceShooterSimulation
+
+WIDTH, HEIGHT = 1280, 720
+PERCENTILES = [50, 99]
+SPAWN_DEPTH_PIXELS = 150.0
+
+
+def swarm_setting(meteor_count: int) -> Difficulty.DifficultySetting:
+    """
+    The swarm difficulty, with a constant number of meteors, spawning close
+    to the screen so that the autopilot has targets from the start
+    """
+    setting = Difficulty(Difficulty.SWARM).difficulty_setting
+    return dataclasses.replace(
+        setting,
+        enemy_count=(PiecewiseCurve(((0.0, meteor_count),)),) * 2,
+        spawn_depth_pixels=SPAWN_DEPTH_PIXELS
+    )
+
+
+def autopilot(wpm: float) -> BotProfile:
+    """
+    A flawless bot typist, shooting at random meteors
+    """
+    return BotProfile(wpm_mean=wpm, wpm_stddev=0.0, error_rate=0.0, target_policy="random")
+
+
+def format_report(name: str, timer: FrameTimer, entity_means: dict[str, float]) -> str:
+    """
+    Formats the percentiles of a timer, with the mean entity counts
+    """
+    p50, p99 = timer.percentiles(PERCENTILES)
+    entities = ", ".join(f"{mean:.0f} {name}" for name, mean in entity_means.items())
+    return f"{name}: p50 {p50 * 1000:.2f} ms, p99 {p99 * 1000:.2f} ms over {len(timer)} frames ({entities})"
+
+
+def run_headless(meteor_count: int, seconds: float, wpm: float, seed: int) -> str:
+    """
+    Runs the scene without a window, timing the simulation steps only (the
+    autopilot's time is left out)
+    """
+    simulation = SpaceShooterSimulation(
+        WIDTH, HEIGHT, difficulty_level=Difficulty.SWARM, seed=seed, difficulty_setting=swarm_setting(meteor_count)
+    )
+    simulation.player.lives_remaining = math.inf
+    bot = BotTypist(simulation, autopilot(wpm), seed=seed)
+    timer = FrameTimer()
+    frame_us = round(SpaceShooterSimulation.MICROSECONDS / SpaceShooterSimulation.STEPS_PER_SECOND)
+    totals = dict(meteors=0, lasers=0, explosions=0)
+    frames = round(seconds * SpaceShooterSimulation.STEPS_PER_SECOND)
+    for _ in range(frames):
+        start = time.perf_counter()
+        simulation.advance(frame_us)
+        timer.add(time.perf_counter() - start)
+        bot.update(frame_us / SpaceShooterSimulation.MICROSECONDS)
+        totals["meteors"] += len(simulation.enemy_word_list)
+        totals["lasers"] += len(simulation.laser_list)
+        totals["explosions"] += len(simulation.explosion_list)
+    return format_report("simulation", timer, {name: total / frames for name, total in totals.items()})
+
+
+def run_window(meteor_count: int, seconds: float, wpm: float) -> list[str]:
+    """
+    Runs the scene in a window, with the frame time overlay
+    """
+    # Imported here, so that the headless run needs no window or fonts
+    from typesurge import load_fonts
+    from utils import global_state
+    from utils.user_profile import UserProfile
+    from space_shooter.views import SpaceShooterGameView
+
+    class SwarmBenchmarkView(SpaceShooterGameView):
+        """
+        The game view, with an invulnerable player, closing after the run
+        """
+
+        def setup(self) -> None:
+            super().setup()
+            self.player.lives_remaining = math.inf
+            self.entity_totals = dict(meteors=0, lasers=0, explosions=0)
+
+        def on_update(self, delta_time: float) -> None:
+            super().on_update(delta_time)
+            self.entity_totals["meteors"] += len(self.simulation.enemy_word_list)
+            self.entity_totals["lasers"] += len(self.simulation.laser_list)
+            self.entity_totals["explosions"] += len(self.simulation.explosion_list)
+            if self.simulation.time >= seconds and not reports:
+                frames = max(self.simulation.step_count, 1)
+                entity_means = {name: total / frames for name, total in self.entity_totals.items()}
+                reports.append(format_report("frame", self.frame_timer, entity_means))
+                reports.append(format_report("update+draw", self.work_timer, entity_means))
+                self.window.close()
+
+    reports: list[str] = []
+    global_state.current_user_profile = UserProfile("benchmark", "Benchmark")
+    load_fonts()
+    window = arcade.Window(WIDTH, HEIGHT, "TypeSurge swarm benchmark")
+    view = SwarmBenchmarkView(
+        arcade.View(),
+        difficulty_level=Difficulty.SWARM,
+        difficulty_setting=swarm_setting(meteor_count),
+        autopilot=autopilot(wpm),
+        show_frame_times=True
+    )
+    window.show_view(view)
+    arcade.run()
+    return reports
+
+
+def main(argv: list[str] | None = None) -> None:
+    """
+    Runs the scene and prints its frame times
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--meteors", type=int, default=1000, help="Number of meteors alive at once")
+    parser.add_argument("--seconds", type=float, default=30.0, help="Length of the run (simulated time)")
+    parser.add_argument("--wpm", type=float, default=20000.0, help="Typing speed of the autopilot")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the headless run")
+    parser.add_argument("--headless", action="store_true", help="Time the simulation only, without a window")
+    args = parser.parse_args(argv)
+    if args.headless:
+        print(run_headless(args.meteors, args.seconds, args.wpm, args.seed))
+    else:
+        for report in run_window(args.meteors, args.seconds, args.wpm):
+            print(report)
+
+
+if __name__ == "__main__":
+    main()
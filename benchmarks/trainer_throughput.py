@@ -0,0 +1,66 @@
+"""
+Throughput benchmark of the typing trainer's engine: feeds synthetic
+keystrokes (with some mistakes) through a headless TrainerEngine running an
+endless session, and reports the keystrokes processed per second.
+
+Usage: python -m benchmarks.trainer_throughput [--keystrokes N] [--error-rate R] [--seed N]
+"""
+import argparse
+import itertools
+import random
+import time
+from typing_trainer.trainer_engine import TrainerEngine
+from utils.word_manager import WordManager
+
+CHUNK_WORDS = 25
+CHARS_PER_CHUNK = 150
+INTERVAL_NS = 150_000_000
+
+
+def make_input(keystrokes: int, error_rate: float, seed: int) -> tuple[list[list[str]], list[int], list[bool]]:
+    """
+    Draws the word chunks, the keystroke timestamps and the mistakes ahead of
+    the run, so that only the engine is timed
+    """
+    rng = random.Random(seed)
+    words = WordManager().get_random_sample(1000)
+    chunks = [rng.sample(words, CHUNK_WORDS) for _ in range(keystrokes // CHARS_PER_CHUNK + 16)]
+    timestamps = list(itertools.accumulate(
+        int(rng.uniform(0.5, 1.5) * INTERVAL_NS) for _ in range(keystrokes)
+    ))
+    mistakes = [rng.random() < error_rate for _ in range(keystrokes)]
+    return chunks, timestamps, mistakes
+
+
+def run(keystrokes: int, error_rate: float, seed: int) -> float:
+    """
+    Types the keystrokes and returns the throughput (keystrokes per second)
+    """
+    chunks, timestamps, mistakes = make_input(keystrokes, error_rate, seed)
+    chunk_iterator = iter(chunks)
+    engine = TrainerEngine(next(chunk_iterator), word_chunks=chunk_iterator)
+    engine.start(clock_ns=0)
+    start = time.perf_counter()
+    for clock_ns, mistake in zip(timestamps, mistakes):
+        char = engine.expected_char(engine.position)
+        engine.type_char("q" if mistake and char != "q" else char, clock_ns=clock_ns)
+    engine.flush_segment()
+    elapsed = time.perf_counter() - start
+    return keystrokes / elapsed
+
+
+def main(argv: list[str] | None = None) -> None:
+    """
+    Runs the benchmark and prints the throughput
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--keystrokes", type=int, default=1_000_000, help="Number of keystrokes")
+    parser.add_argument("--error-rate", type=float, default=0.05, help="Probability of a wrong keystroke")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the synthetic input")
+    args = parser.parse_args(argv)
+    throughput = run(args.keystrokes, args.error_rate, args.seed)
+    print(f"{args.keystrokes} keystrokes: {throughput:,.0f} keystrokes/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+import random
+import string
+from dataclasses import dataclass
+from space_shooter.enemies import EnemyWord
+from space_shooter.simulation import SpaceShooterSimulation
+
+
+def _closest(enemy_words: list[EnemyWord], simulation: SpaceShooterSimulation, rng: random.Random) -> EnemyWord:
+    """
+    The enemy word closest to the player
+    """
+    player = simulation.player
+    return min(enemy_words, key=lambda e: (e.center_x - player.center_x) ** 2 + (e.center_y - player.center_y) ** 2)
+
+
+def _oldest(enemy_words: list[EnemyWord], simulation: SpaceShooterSimulation, rng: random.Random) -> EnemyWord:
+    """
+    The enemy word spawned first
+    """
+    return enemy_words[0]
+
+
+def _shortest(enemy_words: list[EnemyWord], simulation: SpaceShooterSimulation, rng: random.Random) -> EnemyWord:
+    """
+    The enemy word with the shortest word
+    """
+    return min(enemy_words, key=lambda e: len(e.word))
+
+
+def _random(enemy_words: list[EnemyWord], simulation: SpaceShooterSimulation, rng: random.Random) -> EnemyWord:
+    """
+    Any enemy word
+    """
+    return rng.choice(enemy_words)
+
+
+@dataclass
+class BotProfile:
+    """
+    The skill of a bot typist. Each game draws the bot's typing speed from a
+    normal distribution of words per minute (5 characters per word).
+    """
+    wpm_mean: float = 60.0
+    wpm_stddev: float = 10.0
+    error_rate: float = 0.03
+    target_policy: str = "closest"
+
+
+class BotTypist:
+    """
+    Plays a SpaceShooterSimulation like a typist: it picks a visible target
+    with its policy, types its word at its typing speed, and sometimes hits a
+    wrong key. It only reads what a player sees on screen.
+    """
+
+    TARGET_POLICIES = {
+        "closest": _closest,
+        "oldest": _oldest,
+        "shortest": _shortest,
+        "random": _random,
+    }
+    CHARACTERS_PER_WORD = 5
+    MIN_WPM = 5.0
+    # Relative spread of the intervals between keystrokes
+    RHYTHM_JITTER = 0.25
+
+    def __init__(self, simulation: SpaceShooterSimulation, profile: BotProfile, seed: int = 0) -> None:
+        """
+        Initializer
+        """
+        if profile.target_policy not in self.TARGET_POLICIES:
+            raise ValueError(f"Unknown target policy '{profile.target_policy}'")
+        self.simulation = simulation
+        self.profile = profile
+        self.rng = random.Random(seed)
+        self.choose_target = self.TARGET_POLICIES[profile.target_policy]
+        self.wpm = max(self.rng.gauss(profile.wpm_mean, profile.wpm_stddev), self.MIN_WPM)
+        self.mean_interval = 60.0 / (self.wpm * self.CHARACTERS_PER_WORD)
+        self.time_until_keystroke = self._next_interval()
+        self.target: EnemyWord | None = None
+        self.target_generation = 0
+        self.keystrokes = 0
+        self.errors = 0
+
+    def _next_interval(self) -> float:
+        """
+        Draws the time until the next keystroke
+        """
+        return max(self.rng.gauss(self.mean_interval, self.mean_interval * self.RHYTHM_JITTER), self.mean_interval / 4)
+
+    def _is_visible(self, enemy_word: EnemyWord) -> bool:
+        """
+        Whether an enemy word is on screen
+        """
+        return 0 <= enemy_word.center_x <= self.simulation.width and 0 <= enemy_word.center_y <= self.simulation.height
+
+    def _update_target(self) -> EnemyWord | None:
+        """
+        Keeps the current target while it can still be typed, otherwise
+        chooses a new one among the visible enemy words
+        """
+        target = self.target
+        if (
+            target is not None
+            and target.generation == self.target_generation
+            and target.sprite_lists
+            and not target.is_matched
+        ):
+            return target
+        candidates = [
+            enemy_word for enemy_word in self.simulation.enemy_word_list
+            if not enemy_word.is_matched and self._is_visible(enemy_word)
+        ]
+        self.target = self.choose_target(candidates, self.simulation, self.rng) if candidates else None
+        if self.target is not None:
+            self.target_generation = self.target.generation
+        return self.target
+
+    def update(self, delta_time: float) -> None:
+        """
+        Types the keystrokes due within the elapsed time
+        """
+        self.time_until_keystroke -= delta_time
+        while self.time_until_keystroke <= 0:
+            self.time_until_keystroke += self._next_interval()
+            target = self._update_target()
+            if target is None:
+                # Nothing to type: wait for the next keystroke
+                continue
+            char = target.word[target.match_count]
+            if self.rng.random() < self.profile.error_rate:
+                char = self.rng.choice(string.ascii_lowercase.replace(char, ""))
+                self.errors += 1
+            self.keystrokes += 1
+            self.simulation.type_key(char)
@@ -0,0 +1,97 @@
+import heapq
+import itertools
+import math
+import arcade
+
+
+class ApproachBroadPhase:
+    """
+    Broad phase for the collisions between a static target (the player) and
+    sprites that move at a bounded speed (the meteors).
+
+    A sprite cannot touch the target before it has covered the distance
+    between their bounding circles (around their hit boxes, whatever their
+    rotation) at its maximum speed, so each sprite is scheduled for a precise
+    hit box test at that earliest time. Each frame, only the sprites that are
+    due (i.e. within reach of the target) are tested: the cost does not grow
+    with the sprites that are still on their way.
+    """
+
+    # Sprite velocities are in pixels per frame at 60 fps (see arcade.Sprite.update)
+    FRAMES_PER_SECOND = 60
+
+    def __init__(self, target: arcade.Sprite) -> None:
+        """
+        Initializer
+        """
+        self.target = target
+        self.target_radius = self.bounding_radius(target)
+        self.clock = 0.0
+        self.precise_checks = 0
+        self._heap: list[tuple[float, int, arcade.Sprite]] = []
+        # Sprite -> (sequence number of its current heap entry, maximum speed, reach)
+        self._entries: dict[arcade.Sprite, tuple[int, float, float]] = {}
+        self._sequence = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def bounding_radius(sprite: arcade.Sprite) -> float:
+        """
+        Returns the radius of the circle around the sprite's hit box, which
+        contains it whatever the sprite's rotation
+        """
+        scale = max(abs(sprite.scale[0]), abs(sprite.scale[1]))
+        return max(math.hypot(x, y) for x, y in sprite.hit_box.points) * scale
+
+    def _schedule(self, sprite: arcade.Sprite, max_speed: float, reach: float) -> None:
+        """
+        Schedules the next precise test of a sprite
+        """
+        target = self.target
+        distance = math.hypot(sprite.center_x - target.center_x, sprite.center_y - target.center_y)
+        due_time = self.clock + max(distance - reach, 0.0) / (max_speed * self.FRAMES_PER_SECOND)
+        sequence = next(self._sequence)
+        self._entries[sprite] = (sequence, max_speed, reach)
+        heapq.heappush(self._heap, (due_time, sequence, sprite))
+
+    def add(self, sprite: arcade.Sprite, max_speed: float) -> None:
+        """
+        Adds a sprite that never moves faster than `max_speed` (pixels per frame)
+        """
+        self._schedule(sprite, max_speed, self.target_radius + self.bounding_radius(sprite))
+
+    def remove(self, sprite: arcade.Sprite) -> None:
+        """
+        Removes a sprite (its heap entry is discarded when it comes up)
+        """
+        self._entries.pop(sprite, None)
+
+    def advance(self, delta_time: float) -> None:
+        """
+        Advances the clock, after the sprites moved by `delta_time`
+        """
+        self.clock += delta_time
+
+    def collisions(self) -> list[arcade.Sprite]:
+        """
+        Returns the sprites that collide with the target, testing only the
+        sprites that are due
+        """
+        due = []
+        heap = self._heap
+        while heap and heap[0][0] <= self.clock:
+            _, sequence, sprite = heapq.heappop(heap)
+            entry = self._entries.get(sprite)
+            if entry is not None and entry[0] == sequence:
+                due.append(sprite)
+        collisions = []
+        for sprite in due:
+            self.precise_checks += 1
+            if arcade.check_for_collision(self.target, sprite):
+                collisions.append(sprite)
+            # Tested again once it can have moved closer (next frame, if in reach)
+            _, max_speed, reach = self._entries[sprite]
+            self._schedule(sprite, max_speed, reach)
+        return collisions
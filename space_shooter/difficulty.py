@@ -1,5 +1,99 @@
+import json
 import math
 from dataclasses import dataclass
+from functools import lru_cache
+import numpy as np
+
+DIFFICULTY_PROFILES_PATH = "assets/data/difficulty_profiles.json"
+
+
+def _parse_number(value: float | int | str) -> float | int:
+    """
+    Parses a number of a difficulty profile, which may also be written as a
+    fraction, e.g. "1/2000"
+    """
+    if isinstance(value, str):
+        numerator, _, denominator = value.partition("/")
+        return float(numerator) / float(denominator) if denominator else float(numerator)
+    return value
+
+
+@dataclass(frozen=True)
+class LinearCurve:
+    """
+    A value growing linearly with the score, from `start` up to `limit`
+    """
+    start: float
+    increment: float
+    limit: float
+
+    def __post_init__(self) -> None:
+        if self.increment < 0:
+            raise ValueError(f"A linear curve cannot decrease (increment {self.increment})")
+
+    @property
+    def end_score(self) -> float:
+        """
+        The score from which the value stays the same
+        """
+        if self.increment == 0 or self.start >= self.limit:
+            return 0.0
+        return (self.limit - self.start) / self.increment
+
+    def evaluate(self, scores: np.ndarray) -> np.ndarray:
+        """
+        Returns the values at the scores
+        """
+        return np.minimum(self.start + scores * self.increment, self.limit)
+
+    def to_data(self) -> dict:
+        return dict(start=self.start, increment=self.increment, limit=self.limit)
+
+
+@dataclass(frozen=True)
+class PiecewiseCurve:
+    """
+    A value interpolated linearly between (score, value) points, and constant
+    before the first point and after the last one. Any curve can be written
+    this way, e.g. one tuned offline with the load test.
+    """
+    points: tuple[tuple[float, float], ...]
+
+    def __post_init__(self) -> None:
+        if not self.points:
+            raise ValueError("A piecewise curve needs at least one point")
+        scores = [score for score, _ in self.points]
+        if any(a >= b for a, b in zip(scores, scores[1:])):
+            raise ValueError("The points of a piecewise curve must have increasing scores")
+
+    @property
+    def end_score(self) -> float:
+        """
+        The score from which the value stays the same
+        """
+        return max(self.points[-1][0], 0.0)
+
+    def evaluate(self, scores: np.ndarray) -> np.ndarray:
+        """
+        Returns the values at the scores
+        """
+        return np.interp(scores, [score for score, _ in self.points], [value for _, value in self.points])
+
+    def to_data(self) -> dict:
+        return dict(points=[list(point) for point in self.points])
+
+
+Curve = LinearCurve | PiecewiseCurve
+
+
+def curve_from_data(data: dict) -> Curve:
+    """
+    Creates a curve from its data: either "start", "increment" and "limit",
+    or a list of [score, value] "points"
+    """
+    if "points" in data:
+        return PiecewiseCurve(tuple((float(score), _parse_number(value)) for score, value in data["points"]))
+    return LinearCurve(_parse_number(data["start"]), _parse_number(data["increment"]), _parse_number(data["limit"]))
 
 
 class Difficulty:
@@ -22,117 +116,138 @@ class Difficulty:
         min: float = 0.75
         max: float = 1.25
 
-    @dataclass
+    @dataclass(frozen=True)
     class DifficultySetting:
-        ec_start: tuple[int, int]
-        ec_increment: tuple[float, float]
-        ec_limit: tuple[int, int]
-        ewl_start: tuple[int, int]
-        ewl_increment: tuple[float, float]
-        ewl_limit: tuple[int, int]
-        ems_start: tuple[float, float]
-        ems_increment: tuple[float, float]
-        ems_limit: tuple[float, float]
+        # (min, max) curves over the score
+        enemy_count: tuple[Curve, Curve]
+        enemy_word_length: tuple[Curve, Curve]
+        enemy_movement_speed: tuple[Curve, Curve]
         multiplier_streak: int
         multiplier_limit: float
+        # Enemies spawn up to this far behind the screen edge (and spread
+        # around their spawn point), so that crowds arrive over time
+        spawn_depth_pixels: float = 0.0
+
+        CURVE_FIELDS = ("enemy_count", "enemy_word_length", "enemy_movement_speed")
 
-    def __init__(self, difficulty_level: int = 1) -> None:
+        @classmethod
+        def from_data(cls, data: dict) -> "Difficulty.DifficultySetting":
+            """
+            Creates a setting from a profile of the profiles file
+            """
+            curves = {
+                name: (curve_from_data(data[name]["min"]), curve_from_data(data[name]["max"]))
+                for name in cls.CURVE_FIELDS
+            }
+            return cls(
+                **curves,
+                multiplier_streak=data["multiplier_streak"],
+                multiplier_limit=data["multiplier_limit"],
+                spawn_depth_pixels=data.get("spawn_depth_pixels", 0.0)
+            )
+
+        def to_data(self) -> dict:
+            """
+            Returns the setting as a profile of the profiles file
+            """
+            data = {
+                name: dict(min=getattr(self, name)[0].to_data(), max=getattr(self, name)[1].to_data())
+                for name in self.CURVE_FIELDS
+            }
+            data.update(
+                multiplier_streak=self.multiplier_streak,
+                multiplier_limit=self.multiplier_limit,
+                spawn_depth_pixels=self.spawn_depth_pixels
+            )
+            return data
+
+    LEVEL_NAMES = ("easy", "moderate", "hard", "swarm")
+    SWARM = 3
+
+    def __init__(self, difficulty_level: int = 1, difficulty_setting: DifficultySetting | None = None) -> None:
         self.enemy_count = self.EnemyCount()
         self.enemy_word_length = self.EnemyWordLength()
         self.enemy_movement_speed = self.EnemyMovementSpeed()
-        self.difficulty_setting = self._init_difficulty_setting(difficulty_level)
-        self.update_difficulty(0.0)
-
-    def _init_difficulty_setting(self, difficulty_level) -> DifficultySetting:
-        easy = self.DifficultySetting(
-            ec_start=(1, 2),
-            ec_increment=(1/2000, 1/2000),
-            ec_limit=(4, 5),
-            ewl_start=(3, 5),
-            ewl_increment=(1/4000, 1/3000),
-            ewl_limit=(5, 8),
-            ems_start=(0.7, 1.0),
-            ems_increment=(0.1/3000, 0.1/3000),
-            ems_limit=(1.4, 1.8),
-            multiplier_streak=5,
-            multiplier_limit=2.0
-        )
-        moderate = self.DifficultySetting(
-            ec_start=(2, 4),
-            ec_increment=(1/4000, 1/4000),
-            ec_limit=(4, 6),
-            ewl_start=(4, 6),
-            ewl_increment=(1/4000, 1/3000),
-            ewl_limit=(5, 10),
-            ems_start=(0.75, 1.25),
-            ems_increment=(0.1/6000, 0.1/6000),
-            ems_limit=(1.5, 2.0),
-            multiplier_streak=2,
-            multiplier_limit=5.0
-        )
-        hard = self.DifficultySetting(
-            ec_start=(4, 5),
-            ec_increment=(1/8000, 1/8000),
-            ec_limit=(5, 7),
-            ewl_start=(5, 8),
-            ewl_increment=(1/8000, 1/10000),
-            ewl_limit=(7, 15),
-            ems_start=(1.0, 1.5),
-            ems_increment=(0.1/10000, 0.1/10000),
-            ems_limit=(1.75, 2.5),
-            multiplier_streak=1,
-            multiplier_limit=10.0
-        )
-        self.difficulty_settings = [
-            easy,
-            moderate,
-            hard
-        ]
-        return self.difficulty_settings[difficulty_level]
-
-    def _calculate_score_based_values(
-        self,
-        score: float | int,
-        start: tuple,
-        increment: tuple,
-        limit: tuple,
-        as_int: bool = False
-    ) -> tuple:
-        """
-        Helper function for calculating a 2-tuple of values.
-        Uses the score and the predefined 2-tuples: start, increment and limits
-        """
-        values = tuple(min(start[i] + score * increment[i], limit[i]) for i in range(2))
-        if as_int:
-            values = tuple(math.floor(value) for value in values)
-        # Edge case: if the min values is growing faster than the max
-        if values[0] > values[1]:
-            values = (values[1], values[1])
-        return values
+        if difficulty_setting is None:
+            difficulty_setting = load_difficulty_settings()[self.LEVEL_NAMES[difficulty_level]]
+        self.difficulty_setting = difficulty_setting
+        self.table = DifficultyTable.for_setting(difficulty_setting)
+        self.update_difficulty(0)
 
     def update_difficulty(self, score: float) -> None:
         """
         Updates the difficulty setting values based on the score
         """
-        self.enemy_count.min, self.enemy_count.max = self._calculate_score_based_values(
-            score,
-            self.difficulty_setting.ec_start,
-            self.difficulty_setting.ec_increment,
-            self.difficulty_setting.ec_limit,
-            as_int=True
+        table = self.table
+        row = min(int(score) // table.SCORE_RESOLUTION, table.last_row)
+        self.enemy_count.min = table.enemy_count_min[row]
+        self.enemy_count.max = table.enemy_count_max[row]
+        self.enemy_word_length.min = table.enemy_word_length_min[row]
+        self.enemy_word_length.max = table.enemy_word_length_max[row]
+        self.enemy_movement_speed.min = table.enemy_movement_speed_min[row]
+        self.enemy_movement_speed.max = table.enemy_movement_speed_max[row]
+
+
+class DifficultyTable:
+    """
+    A difficulty setting compiled into lookup tables indexed by the score.
+    Row i holds the values at the score i * SCORE_RESOLUTION, up to the score
+    where every curve has reached its end; higher scores use the last row.
+    Scores only grow by multiples of 20 (points per character times an
+    integer multiplier), so the lookups give the exact values of the curves.
+    """
+
+    SCORE_RESOLUTION = 20
+    MAX_ROWS = 1_000_000
+    _tables: dict["Difficulty.DifficultySetting", "DifficultyTable"] = {}
+
+    def __init__(self, difficulty_setting: Difficulty.DifficultySetting) -> None:
+        """
+        Initializer
+        """
+        curves = [curve for name in difficulty_setting.CURVE_FIELDS for curve in getattr(difficulty_setting, name)]
+        row_count = math.ceil(max(curve.end_score for curve in curves) / self.SCORE_RESOLUTION) + 1
+        if row_count > self.MAX_ROWS:
+            raise ValueError(f"The difficulty curves are too long to compile ({row_count} rows)")
+        self.last_row = row_count - 1
+        scores = np.arange(row_count, dtype=np.float64) * self.SCORE_RESOLUTION
+        self.enemy_count_min, self.enemy_count_max = self._compile(
+            difficulty_setting.enemy_count, scores, as_int=True
         )
-        self.enemy_word_length.min, self.enemy_word_length.max = self._calculate_score_based_values(
-            score,
-            self.difficulty_setting.ewl_start,
-            self.difficulty_setting.ewl_increment,
-            self.difficulty_setting.ewl_limit,
-            as_int=True
+        self.enemy_word_length_min, self.enemy_word_length_max = self._compile(
+            difficulty_setting.enemy_word_length, scores, as_int=True
         )
-        self.enemy_movement_speed.min, self.enemy_movement_speed.max = self._calculate_score_based_values(
-            score,
-            self.difficulty_setting.ems_start,
-            self.difficulty_setting.ems_increment,
-            self.difficulty_setting.ems_limit,
-            as_int=False
+        self.enemy_movement_speed_min, self.enemy_movement_speed_max = self._compile(
+            difficulty_setting.enemy_movement_speed, scores, as_int=False
         )
-        # print(f"Difficulty updated: {self.enemy_count}, {self.enemy_word_length}, {self.enemy_movement_speed}")
+
+    @staticmethod
+    def _compile(curves: tuple[Curve, Curve], scores: np.ndarray, as_int: bool) -> tuple[list, list]:
+        """
+        Evaluates a pair of (min, max) curves at the scores
+        """
+        minima, maxima = (curve.evaluate(scores) for curve in curves)
+        if as_int:
+            minima, maxima = np.floor(minima).astype(np.int64), np.floor(maxima).astype(np.int64)
+        # Edge case: if the min values is growing faster than the max
+        minima = np.minimum(minima, maxima)
+        return minima.tolist(), maxima.tolist()
+
+    @classmethod
+    def for_setting(cls, difficulty_setting: Difficulty.DifficultySetting) -> "DifficultyTable":
+        """
+        Returns the table of a setting, compiling it the first time
+        """
+        if difficulty_setting not in cls._tables:
+            cls._tables[difficulty_setting] = cls(difficulty_setting)
+        return cls._tables[difficulty_setting]
+
+
+@lru_cache(maxsize=None)
+def load_difficulty_settings(file_path: str = DIFFICULTY_PROFILES_PATH) -> dict[str, Difficulty.DifficultySetting]:
+    """
+    Loads the difficulty profiles of a file, by name
+    """
+    with open(file_path, "r") as file:
+        profiles = json.load(file)
+    return {name: Difficulty.DifficultySetting.from_data(data) for name, data in profiles.items()}
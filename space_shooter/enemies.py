@@ -2,15 +2,21 @@ import arcade
 from arcade.clock import GLOBAL_CLOCK
 import random
 import math
+from typing import Callable
 from utils.helpers import calculate_angle_between_points
 from pyglet.graphics import Batch
+from pyglet.text import DocumentLabel
+from pyglet.text.document import FormattedDocument
 from utils.word_manager import WordManager
 import numpy as np
 from utils.colors import BROWN
 from utils.resources import METEOR_SPRITE_1, METEOR_SPRITE_2, METEOR_SPRITE_3
+from space_shooter.word_trie import WordTrie
+from space_shooter.collisions import ApproachBroadPhase
+from space_shooter.sprite_pool import PooledSprite, SpritePool
 
 
-class EnemyWord(arcade.Sprite):
+class EnemyWord(PooledSprite):
     """
     Requirements:
     1. Each word consists of individual characters
@@ -37,123 +43,186 @@ class EnemyWord(arcade.Sprite):
         position: tuple[float, float],
         target_position: tuple[float, float],
         movement_speed_range: list[float],
+        batch: Batch | None = None,
+        rng: random.Random | None = None
     ) -> None:
         """
-        Initializer
+        Initializer. The label of the word is added to the given batch
+        (typically the shared batch of an EnemyWordList). Without a batch,
+        the word has no label (e.g. in a headless simulation).
         """
-        self.meteor_sprite_texture = random.choice(self.METEOR_SPRITE_OPTIONS)
-        x, y = position
-        super().__init__(
-            self.meteor_sprite_texture, 
-            center_x=x, 
-            center_y=y,
-            scale=self.METEOR_SPRITE_SCALE
-        )
-        self.movement_speed = random.uniform(
+        super().__init__(scale=self.METEOR_SPRITE_SCALE)
+        self.WORD_OFFSET_PIXELS = 35
+        self.text_batch: Batch | None = None
+        self.text_document: FormattedDocument | None = None
+        self.text_label: DocumentLabel | None = None
+        self.generation = 0
+        self.reset(word, position, target_position, movement_speed_range, batch, rng)
+
+    def reset(
+        self,
+        word: str,
+        position: tuple[float, float],
+        target_position: tuple[float, float],
+        movement_speed_range: list[float],
+        batch: Batch | None = None,
+        rng: random.Random | None = None
+    ) -> None:
+        """
+        Reset the enemy word for a new word, reusing its label (and the
+        glyph slots of its batch, which its previous word freed).
+        """
+        if rng is None:
+            rng = random  # type: ignore[assignment]
+        # Lasers fired at the previous word must not follow the new one
+        self.generation += 1
+        self.meteor_sprite_texture = rng.choice(self.METEOR_SPRITE_OPTIONS).get()
+        self.texture = self.meteor_sprite_texture
+        # The texture setter keeps the hit box of the previous meteor
+        self.sync_hit_box_to_texture()
+        self.scale = self.METEOR_SPRITE_SCALE
+        self.angle = 0
+        self.position = position
+        self.previous_position = position
+        self.movement_speed = rng.uniform(
             movement_speed_range[0],
             movement_speed_range[1]
         )
-        self.change_angle = random.uniform(-5.0, 5.0)
+        self.change_angle = rng.uniform(-5.0, 5.0)
         theta = calculate_angle_between_points(position, target_position)
         self.base_velocity = (
             self.movement_speed * math.cos(theta), 
             self.movement_speed * math.sin(theta)
         )
         self.velocity = self.base_velocity
-        self.WORD_OFFSET_PIXELS = 35
         self.word = word
         self.text_characters = [c for c in word]
-        self.text_batch = Batch()
-        self.text_list = []
-        for c in self.text_characters:
-            text = arcade.Text(
-                text=c, 
-                x=x, 
-                y=y, 
-                color=self.UNMATCHED_COLOR,
-                font_name=self.FONT_NAME,
-                font_size=self.FONT_SIZE, 
-                batch=self.text_batch, 
-                anchor_y='center'
-            )
-            self.text_list.append(text)
-        self._update_text_character_positions()
+        self.match_count = 0
         self.is_matched = False
+        if batch is not None:
+            self._reset_text(batch)
+
+    def _reset_text(self, batch: Batch) -> None:
+        """
+        Lay the word out in the given batch, creating the label on first use.
+        """
+        if self.text_label is None:
+            # The word is laid out once, as a single label with per-character
+            # colors. Moving it only updates its translation, without any layout.
+            self.text_document = FormattedDocument()
+            self.text_label = DocumentLabel(self.text_document, anchor_y="center", batch=batch)
+        elif batch is not self.text_batch:
+            self.text_label.batch = batch
+        self.text_batch = batch
+        self.text_label.begin_update()
+        self.text_document.delete_text(0, len(self.text_document.text))
+        self.text_document.insert_text(0, self.word, dict(
+            font_name=self.FONT_NAME,
+            font_size=self.FONT_SIZE,
+            color=self.UNMATCHED_COLOR
+        ))
+        self.sync_text()
+        self.text_label.end_update()
 
     def update(self, delta_time: float = 1 / 60) -> None:
         """
-        Update the enemy word.
+        Update the enemy word, remembering where it moved from.
         """
+        self.previous_position = self.position
         super().update(delta_time=delta_time)
-        self._update_text_character_positions()
-
-    def _update_text_character_positions(self) -> None:
-        """
-        Update the positions of the text characters.
-        """
-        x, y = self.center_x + self.WORD_OFFSET_PIXELS, self.center_y
-        for text in self.text_list:
-            text.x, text.y = x, y
-            x = text.right
-
-    def match_text(self, other: str) -> str:
-        """
-        Match the input text with the enemy word.
-        """
-        match_count = 0
-        if not self.is_matched:
-            for i, c in enumerate(other):
-                if i >= len(self.text_characters) or self.text_characters[i] != c:
-                    self.reset_color_and_velocity()
-                    return "mismatch"
-                self.text_list[i].color = self.MATCHED_COLOR
-                match_count += 1
-            velocity_multiplier = 1.0 * (len(self.word) - match_count) / len(self.word)
-            self.velocity = (
-                self.base_velocity[0] * velocity_multiplier,
-                self.base_velocity[1] * velocity_multiplier
-            )
-            if len(self.text_characters) == len(other):
-                self.is_matched = True
-                return "full"
-            return "partial"
-        else:
-            return "mismatch"
-    
-    def reset_color_and_velocity(self) -> None:
+
+    def sync_text(self) -> None:
         """
-        Reset the color of the text characters and the velocity.
+        Move the label next to the meteor (where it is displayed).
         """
-        for text in self.text_list:
-            text.color = self.UNMATCHED_COLOR
-        self.velocity = self.base_velocity
-    
-    def draw(self) -> None:
+        if self.text_label is not None:
+            self.text_label.position = (self.center_x + self.WORD_OFFSET_PIXELS, self.center_y, 0)
+
+    def set_match_count(self, match_count: int) -> None:
         """
-        Draw the enemy word.
+        Set the number of leading characters matched by the input: recolor
+        only the characters whose state changes, and slow the enemy down in
+        proportion to the matched characters.
         """
-        self.text_batch.draw()
-        arcade.draw_sprite(self)
+        if match_count == self.match_count:
+            return
+        if self.text_document is not None:
+            color = self.MATCHED_COLOR if match_count > self.match_count else self.UNMATCHED_COLOR
+            start, end = sorted((self.match_count, match_count))
+            self.text_document.set_style(start, end, dict(color=color))
+        self.match_count = match_count
+        velocity_multiplier = 1.0 * (len(self.word) - match_count) / len(self.word)
+        self.velocity = (
+            self.base_velocity[0] * velocity_multiplier,
+            self.base_velocity[1] * velocity_multiplier
+        )
+
+    def clear_text(self) -> None:
+        """
+        Remove the characters from the batch, keeping the label for reuse.
+        """
+        if self.text_document is not None:
+            self.text_document.delete_text(0, len(self.text_document.text))
 
 
 class EnemyWordList(arcade.SpriteList):
     """
-    A list of enemy words.
+    A list of enemy words. The characters of all the words are drawn through
+    one shared batch, so drawing takes the same number of draw calls however
+    many enemies there are. The words that can still be matched are indexed
+    in a prefix trie, and collisions with the player go through a broad phase.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, player: arcade.Sprite, text_batch: Batch | None = None) -> None:
         """
-        Initializer
+        Initializer. The player must not move. Without a text batch, the
+        words are not laid out (e.g. in a headless simulation).
         """
         super().__init__()
+        self.text_batch = text_batch
+        self.word_trie = WordTrie()
+        self.player_broad_phase = ApproachBroadPhase(player)
+
+    def append(self, sprite: EnemyWord) -> None: # type: ignore
+        """
+        Add an enemy word, matching it against the current input right away.
+        """
+        super().append(sprite)
+        if self.word_trie.insert(sprite.word, sprite):
+            sprite.set_match_count(self.word_trie.depth)
+        # Matching only ever slows an enemy down, so its base speed is its maximum
+        self.player_broad_phase.add(sprite, sprite.movement_speed)
+
+    def remove(self, sprite: EnemyWord) -> None: # type: ignore
+        """
+        Remove an enemy word, and its characters from the shared batch.
+        """
+        super().remove(sprite)
+        self.word_trie.remove(sprite.word, sprite)
+        self.player_broad_phase.remove(sprite)
+        sprite.clear_text()
+
+    def update(self, delta_time: float = 1 / 60, *args, **kwargs) -> None:
+        """
+        Move the enemy words.
+        """
+        super().update(delta_time, *args, **kwargs)
+        self.player_broad_phase.advance(delta_time)
+
+    def check_for_collision_with_player(self) -> list[EnemyWord]:
+        """
+        Get the enemy words that collide with the player. Only the enemies
+        that are close enough to reach the player get a precise hit box test.
+        """
+        return self.player_broad_phase.collisions()
 
     def draw(self) -> None: # type: ignore
         """
-        Draw the enemy words.
+        Draw the meteors, then all the words on top of them.
         """
-        for enemy_word in self:
-            arcade.draw_sprite(enemy_word)
-            enemy_word.text_batch.draw()
+        super().draw()
+        if self.text_batch is not None:
+            self.text_batch.draw()
 
 
 class EnemySpawner():
@@ -166,11 +235,20 @@ class EnemySpawner():
     SPAWN_POINTS_COUNT = 9  # Number of distinct spawn points
     SPAWN_COOLDOWN_SECONDS = 5
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        rng: random.Random | None = None,
+        clock: Callable[[], float] = lambda: GLOBAL_CLOCK.time,
+        word_manager: WordManager | None = None
+    ) -> None:
         """
-        Initializer
+        Initializer. The spawns are drawn from the given random generator
+        (default: the global one), and spawn point cooldowns follow the clock.
+        A word manager can be shared between spawners (it only reads its words).
         """
-        self.word_manager = WordManager()
+        self.rng = rng if rng is not None else random.Random(random.getrandbits(64))
+        self.clock = clock
+        self.word_manager = word_manager if word_manager is not None else WordManager()
         self.spawn_angles = np.linspace(
             -self.ANGLE_RANGE_DEGREES/2, 
             self.ANGLE_RANGE_DEGREES/2,
@@ -178,6 +256,7 @@ class EnemySpawner():
         )
         self.recently_spawned = {}  # key: point index, value: spawn time
         self.available_indexes = set(range(self.SPAWN_POINTS_COUNT))
+        self.enemy_word_pool = SpritePool(EnemyWord)
 
     def _get_spawn_angle(self) -> float:
         """
@@ -186,13 +265,13 @@ class EnemySpawner():
         self._update_available_indexes()
         # Choose from one of the available points (if exists)
         if len(self.available_indexes) > 0:
-            idx = random.choice(list(self.available_indexes))
+            idx = self.rng.choice(list(self.available_indexes))
             # Remove from available indexes
             self.available_indexes.remove(idx)
         else:
-            idx = random.choice(list(range(self.SPAWN_POINTS_COUNT)))
+            idx = self.rng.choice(list(range(self.SPAWN_POINTS_COUNT)))
         # Update recently spawned time
-        self.recently_spawned[idx] = GLOBAL_CLOCK.time
+        self.recently_spawned[idx] = self.clock()
         return self.spawn_angles[idx]
 
     def _update_available_indexes(self) -> None:
@@ -200,11 +279,17 @@ class EnemySpawner():
         Iterate through the recent indexes and make them available if their cooldown has expired
         """
         for idx in list(self.recently_spawned.keys()):
-            if GLOBAL_CLOCK.time_since(self.recently_spawned[idx]) > self.SPAWN_COOLDOWN_SECONDS:
+            if self.clock() - self.recently_spawned[idx] > self.SPAWN_COOLDOWN_SECONDS:
                 self.available_indexes.add(idx)
                 del self.recently_spawned[idx]
         
-    def _get_enemy_spawn_position_at_random(self, player_position: tuple[float, float], window_width: int, window_height: int) -> tuple[float, float]:
+    def _get_enemy_spawn_position_at_random(
+        self,
+        player_position: tuple[float, float],
+        window_width: int,
+        window_height: int,
+        spawn_depth_pixels: float = 0.0
+    ) -> tuple[float, float]:
         """
         Get coordinates for an enemy spawn around the player in an arc. The steps are:
         1. Choose an angle at random, say between -20 degrees and +20 degrees (to the right of the player).
@@ -213,8 +298,13 @@ class EnemySpawner():
         2. Check the edge of the screen at which to spawn - top, right or bottom
         3. Provide some offset, so that the spawn happens offscreen
         4. Return the coordinates (x, y)
+        With a spawn depth, the angle is spread within the spawn point's sector,
+        and the spawn is pushed up to that distance further away from the player.
         """
         angle_degrees = self._get_spawn_angle()
+        if spawn_depth_pixels > 0:
+            sector_degrees = self.ANGLE_RANGE_DEGREES / (self.SPAWN_POINTS_COUNT - 1)
+            angle_degrees += self.rng.uniform(-sector_degrees / 2, sector_degrees / 2)
         x_distance_to_edge = window_width - player_position[0]
         cutoff_angle_degrees = math.degrees(math.atan2(window_height/2, x_distance_to_edge))
         if -cutoff_angle_degrees <= angle_degrees <= cutoff_angle_degrees:
@@ -226,6 +316,11 @@ class EnemySpawner():
                 y = window_height + self.OFFSCREEN_SPAWN_OFFSET_PIXELS
             else:
                 y = -self.OFFSCREEN_SPAWN_OFFSET_PIXELS
+        if spawn_depth_pixels > 0:
+            depth = self.rng.uniform(0, spawn_depth_pixels)
+            distance = math.hypot(x - player_position[0], y - player_position[1])
+            x += (x - player_position[0]) / distance * depth
+            y += (y - player_position[1]) / distance * depth
         return x, y
     
     def spawn_enemy_word(
@@ -234,22 +329,29 @@ class EnemySpawner():
         window_width: int,
         window_height: int,
         character_count_range: list[int] = [4, 7],
-        movement_speed_range: list[float] = [0.75, 1.25]
+        movement_speed_range: list[float] = [0.75, 1.25],
+        batch: Batch | None = None,
+        spawn_depth_pixels: float = 0.0
     ) -> EnemyWord:
         """
-        Spawn an enemy word.
+        Spawn an enemy word, with its characters in the given batch. The
+        sprite is reused from the pool of destroyed enemy words if possible.
         """
-        enemy_word = EnemyWord(
+        enemy_word = self.enemy_word_pool.acquire(
             self.word_manager.generate_word(
                 min_character_count=character_count_range[0],
-                max_character_count=character_count_range[1]
+                max_character_count=character_count_range[1],
+                rng=self.rng
             ), 
             position=self._get_enemy_spawn_position_at_random(
                 player_position, 
                 window_width, 
-                window_height
+                window_height,
+                spawn_depth_pixels
             ), 
             target_position=player_position,
-            movement_speed_range=movement_speed_range
+            movement_speed_range=movement_speed_range,
+            batch=batch,
+            rng=self.rng
         )
         return enemy_word
@@ -1,8 +1,9 @@
 import arcade
-from utils.resources import EXPLOSION_SOUND, EXPLOSION_TEXTURE_LIST
+from utils.resources import EXPLOSION_TEXTURE_LIST, EXPLOSION_TEXTURE_SCALE
+from space_shooter.sprite_pool import PooledSprite
 
 
-class Explosion(arcade.Sprite):
+class Explosion(PooledSprite):
     """
     An explosion animation.
     """
@@ -11,11 +12,18 @@ class Explosion(arcade.Sprite):
         """
         Initializer
         """
-        super().__init__(EXPLOSION_TEXTURE_LIST[0])
-        self.time_elapsed = 0
+        textures = EXPLOSION_TEXTURE_LIST.get()
+        super().__init__(textures[0], scale=1 / EXPLOSION_TEXTURE_SCALE)
         self.animation_time = 0.6
-        self.textures = EXPLOSION_TEXTURE_LIST
-        self._play_sound()
+        self.textures = textures
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Restart the animation from its first frame.
+        """
+        self.time_elapsed = 0
+        self.set_texture(0)
 
     def update(self, delta_time: float = 1 / 60) -> None:
         """
@@ -23,13 +31,7 @@ class Explosion(arcade.Sprite):
         """
         self.time_elapsed += delta_time
         if self.time_elapsed <= self.animation_time:
-            index = int(len(self.textures) * (self.time_elapsed / self.animation_time))
+            index = min(int(len(self.textures) * (self.time_elapsed / self.animation_time)), len(self.textures) - 1)
             self.set_texture(index)
         else:
             self.remove_from_sprite_lists()
-
-    def _play_sound(self) -> None:
-        """
-        Play explosion sound
-        """
-        arcade.play_sound(EXPLOSION_SOUND)
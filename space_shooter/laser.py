@@ -1,12 +1,13 @@
 import arcade
 import math
-from utils.resources import LASER_SPRITE, LASER_SOUND
-from utils.helpers import calculate_angle_between_points
+from utils.resources import LASER_SPRITE
+from utils.helpers import calculate_angle_between_points, segment_intersects_circle
 from space_shooter.player import Player
 from space_shooter.enemies import EnemyWord
+from space_shooter.sprite_pool import PooledSprite
 
 
-class Laser(arcade.Sprite):
+class Laser(PooledSprite):
     """
     Spawns a laser that starts from a player position and moves towards the target
     """
@@ -17,14 +18,24 @@ class Laser(arcade.Sprite):
         target: EnemyWord,
         speed: float = 30.0
     ) -> None:
-        super().__init__(
-            LASER_SPRITE,
-            center_y=player.center_y,
-            scale=0.8
-        )
+        super().__init__(LASER_SPRITE.get(), scale=0.8)
+        self.reset(player, target, speed)
+
+    def reset(
+        self,
+        player: Player,
+        target: EnemyWord,
+        speed: float = 30.0
+    ) -> None:
+        """
+        Aim the laser from the player at a new target.
+        """
+        self.center_y = player.center_y
         self.left = player.right
         self.speed = speed
         self.target = target
+        # The target's sprite may be reused for another word once destroyed
+        self.target_generation = target.generation
         theta = calculate_angle_between_points(self.position, target.position)
         LASER_ANGLE_OFFSET = 90
         self.velocity = (
@@ -32,4 +43,37 @@ class Laser(arcade.Sprite):
             self.speed * math.sin(theta)
         )
         self.angle = math.degrees(2 * math.pi - theta) + LASER_ANGLE_OFFSET
-        arcade.play_sound(LASER_SOUND)
+        self.previous_position = self.position
+
+    def update(self, delta_time: float = 1 / 60, *args, **kwargs) -> None:
+        """
+        Move the laser, remembering where it moved from.
+        """
+        self.previous_position = self.position
+        super().update(delta_time, *args, **kwargs)
+
+    def is_target_destroyed(self) -> bool:
+        """
+        Check whether the target is gone (e.g. it hit the player first).
+        """
+        return self.target.generation != self.target_generation or not self.target.sprite_lists
+
+    def hits_target(self) -> bool:
+        """
+        Check whether the laser reached its target during its last move. The
+        laser's tip (half its length ahead of its center) is swept against a
+        circle approximating the target.
+        """
+        target_radius = (self.target.width + self.target.height) / 4
+        return segment_intersects_circle(
+            self.previous_position,
+            self.position,
+            self.target.position,
+            target_radius + self.height / 2
+        )
+
+    def is_off_screen(self, width: float, height: float) -> bool:
+        """
+        Check whether the laser has left the screen on any edge.
+        """
+        return self.right < 0 or self.left > width or self.top < 0 or self.bottom > height
@@ -1,6 +1,7 @@
 import arcade
+from utils.colors import BEIGE
 from utils.resources import (
-    SPACESHIP_SPRITE, 
+    spaceship_sprite,
     SPACESHIP_DAMAGE_SPRITE_1, 
     SPACESHIP_DAMAGE_SPRITE_2
 )
@@ -11,28 +12,33 @@ class Player(arcade.Sprite):
     The player sprite.
     """
 
-    def __init__(self, center_x: float, center_y: float) -> None:
+    def __init__(
+        self,
+        center_x: float,
+        center_y: float,
+        ship_color: tuple[int, int, int] = BEIGE[:3]
+    ) -> None:
         """
         Initializer
         """
         ANGLE = 90
         SCALE = 0.8
         super().__init__(
-            SPACESHIP_SPRITE,
+            spaceship_sprite(ship_color).get(),
             center_x=center_x,
             center_y=center_y,
             angle=ANGLE,
             scale=SCALE
         )
         self.damage_sprite_1 = arcade.Sprite(
-            SPACESHIP_DAMAGE_SPRITE_1,
+            SPACESHIP_DAMAGE_SPRITE_1.get(),
             center_x=center_x,
             center_y=center_y,
             angle=ANGLE,
             scale=SCALE
         )
         self.damage_sprite_2 = arcade.Sprite(
-            SPACESHIP_DAMAGE_SPRITE_2,
+            SPACESHIP_DAMAGE_SPRITE_2.get(),
             center_x=center_x,
             center_y=center_y,
             angle=ANGLE,
@@ -0,0 +1,338 @@
+import math
+import random
+from contextlib import contextmanager
+from typing import Iterator
+import arcade
+from pyglet.graphics import Batch
+from utils.colors import BEIGE
+from utils.word_manager import WordManager
+from space_shooter.player import Player
+from space_shooter.enemies import EnemySpawner, EnemyWordList, EnemyWord
+from space_shooter.explosion import Explosion
+from space_shooter.laser import Laser
+from space_shooter.game_stats import GameStats
+from space_shooter.difficulty import Difficulty
+from space_shooter.sprite_pool import SpritePool
+
+
+class ShooterListener:
+    """
+    Receives the events of a SpaceShooterSimulation. All the methods are
+    no-ops, so a listener only overrides what it renders or plays.
+    """
+
+    def on_laser_fired(self, laser: Laser) -> None:
+        """
+        Called when a laser is fired at a fully matched word
+        """
+
+    def on_explosion(self, explosion: Explosion) -> None:
+        """
+        Called when an enemy word explodes
+        """
+
+    def on_key_checked(self, matches: bool) -> None:
+        """
+        Called after a typed key is matched against the words, with whether
+        any word still matches the input
+        """
+
+    def on_score_changed(self, score: int, multiplier: float) -> None:
+        """
+        Called when the score or the multiplier changes
+        """
+
+    def on_lives_changed(self, lives_remaining: int) -> None:
+        """
+        Called when the player loses a life
+        """
+
+    def on_game_over(self) -> None:
+        """
+        Called when the player has no lives left
+        """
+
+
+class SpaceShooterSimulation:
+    """
+    The space shooter's logic, without any rendering, sound or windowing.
+
+    The game advances in fixed steps of 1/60 s (the sprite speeds are in
+    pixels per step), whatever the frame rate: the frame times are added to
+    an accumulator, which is consumed one step at a time. The frame times are
+    counted in whole microseconds, and the accumulator is exact (in units of
+    1/60 µs), so a game only depends on its seed and on the sequence of frame
+    times and key presses: it can be replayed, or run headless faster than
+    real time, with identical results on any hardware.
+
+    Rendering is a step behind: the moving sprites are displayed between
+    their previous and current positions (see `interpolated`).
+    """
+
+    STEPS_PER_SECOND = 60
+    STEP_SECONDS = 1 / STEPS_PER_SECOND
+    MICROSECONDS = 1_000_000
+    # Longest frame time simulated at once, so that a stall (e.g. dragging
+    # the window) does not trigger a burst of steps
+    MAX_FRAME_MICROSECONDS = 250_000
+    PLAYER_X = 75
+
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        difficulty_level: int = 1,
+        seed: int | None = None,
+        listener: ShooterListener | None = None,
+        text_batch: Batch | None = None,
+        ship_color: tuple[int, int, int] = BEIGE[:3],
+        word_manager: WordManager | None = None,
+        difficulty_setting: Difficulty.DifficultySetting | None = None
+    ) -> None:
+        """
+        Initializer. Without a seed, one is drawn from the global random
+        generator. Without a text batch, the words are not laid out. A
+        difficulty setting replaces the difficulty level's setting.
+        """
+        self.width = width
+        self.height = height
+        self.seed = seed if seed is not None else random.getrandbits(63)
+        self.rng = random.Random(self.seed)
+        self.listener = listener if listener is not None else ShooterListener()
+        self.step_count = 0
+        # Pending simulation time, in 1/60 µs
+        self.accumulator = 0
+        self.enemy_spawner = EnemySpawner(rng=self.rng, clock=lambda: self.time, word_manager=word_manager)
+        self.laser_pool = SpritePool(Laser)
+        self.explosion_pool = SpritePool(Explosion)
+        self.player = Player(center_x=self.PLAYER_X, center_y=height // 2, ship_color=ship_color)
+        self.laser_list = arcade.SpriteList()
+        self.explosion_list = arcade.SpriteList()
+        self.enemy_word_list = EnemyWordList(self.player, text_batch)
+        self.game_stats = GameStats()
+        self.difficulty = Difficulty(difficulty_level=difficulty_level, difficulty_setting=difficulty_setting)
+        self.input = ""
+        self.multiplier = 1.0
+        self.streak = 0
+        self.game_over = False
+        self._spawn_enemies()
+
+    @property
+    def time(self) -> float:
+        """
+        The simulated time, in seconds
+        """
+        return self.step_count * self.STEP_SECONDS
+
+    @property
+    def alpha(self) -> float:
+        """
+        The fraction of a step pending in the accumulator, used to
+        interpolate the display between the last two steps
+        """
+        return self.accumulator / self.MICROSECONDS
+
+    def update(self, delta_time: float) -> int:
+        """
+        Advances the simulation by a frame time in seconds (see `advance`)
+        """
+        return self.advance(round(delta_time * self.MICROSECONDS))
+
+    def advance(self, delta_us: int) -> int:
+        """
+        Advances the simulation by a frame time in microseconds, running as
+        many fixed steps as are due. Returns the number of steps run.
+        """
+        self.accumulator += min(delta_us, self.MAX_FRAME_MICROSECONDS) * self.STEPS_PER_SECOND
+        steps = 0
+        while self.accumulator >= self.MICROSECONDS and not self.game_over:
+            self.accumulator -= self.MICROSECONDS
+            self.step()
+            steps += 1
+        return steps
+
+    def step(self) -> None:
+        """
+        Runs one fixed step of the game.
+        """
+        self.step_count += 1
+        self._check_player_collision()
+        if self.game_over:
+            return
+        self._check_laser_collisions()
+        self.explosion_list.update(delta_time=self.STEP_SECONDS)
+        self.enemy_word_list.update(delta_time=self.STEP_SECONDS)
+
+    @contextmanager
+    def interpolated(self, alpha: float | None = None) -> Iterator[None]:
+        """
+        Within the context, the moving sprites (and the words' labels) are at
+        their display positions, between their previous and current positions.
+        """
+        if alpha is None:
+            alpha = self.alpha
+        moving: list[arcade.Sprite] = [*self.enemy_word_list, *self.laser_list]
+        positions = [sprite.position for sprite in moving]
+        for sprite, (x, y) in zip(moving, positions):
+            previous_x, previous_y = sprite.previous_position
+            sprite.position = (previous_x + (x - previous_x) * alpha, previous_y + (y - previous_y) * alpha)
+        for enemy_word in self.enemy_word_list:
+            enemy_word.sync_text()
+        try:
+            yield
+        finally:
+            for sprite, position in zip(moving, positions):
+                sprite.position = position
+
+    def type_key(self, key_pressed: str) -> None:
+        """
+        Types a character (an empty string for the keys that are not mapped
+        to characters) and matches the input against the words.
+        """
+        if self.game_over:
+            return
+        self.input = self.input + key_pressed
+        word_trie = self.enemy_word_list.word_trie
+        full_matches = []
+        if key_pressed:
+            advanced, dropped = word_trie.advance(key_pressed)
+            for enemy_word in dropped:
+                enemy_word.set_match_count(0)
+            for enemy_word in advanced:
+                enemy_word.set_match_count(word_trie.depth)
+                if len(enemy_word.word) == word_trie.depth:
+                    full_matches.append(enemy_word)
+        # If none of the words matches or there are full matches, reset the input
+        matches = word_trie.has_matches()
+        if not matches:
+            self.input = ""
+            word_trie.reset()
+            self.streak = 0
+        elif full_matches:
+            for enemy_word in full_matches:
+                enemy_word.is_matched = True
+                word_trie.remove(enemy_word.word, enemy_word)
+                self._fire_laser_at(enemy_word)
+            for enemy_word in word_trie.reset():
+                enemy_word.set_match_count(0)
+            self.input = ""
+            self.streak += 1
+        self.listener.on_key_checked(matches)
+        self._update_multiplier()
+
+    def get_results(self) -> dict[str, int]:
+        """
+        Returns the results of the game (as saved with its recording)
+        """
+        return dict(score=self.game_stats.score, lives_remaining=self.player.lives_remaining)
+
+    def get_pool_counters(self) -> dict[str, dict[str, int]]:
+        """
+        Get the allocation counters of the sprite pools. Once the game has
+        reached its largest number of sprites alive at once, the allocated
+        counts stay constant.
+        """
+        return dict(
+            enemy_word=self.enemy_spawner.enemy_word_pool.get_counters(),
+            laser=self.laser_pool.get_counters(),
+            explosion=self.explosion_pool.get_counters()
+        )
+
+    def _spawn_enemies(self) -> None:
+        """
+        Keep spawning enemies according to the difficulty setting
+        """
+        current_enemy_count = len(self.enemy_word_list)
+        count_target = self.rng.randrange(
+            self.difficulty.enemy_count.min,
+            self.difficulty.enemy_count.max + 1
+        )
+        while current_enemy_count < count_target:
+            enemy_word = self.enemy_spawner.spawn_enemy_word(
+                player_position=self.player.position,
+                window_width=self.width,
+                window_height=self.height,
+                character_count_range=[
+                    self.difficulty.enemy_word_length.min,
+                    self.difficulty.enemy_word_length.max
+                ],
+                movement_speed_range=[
+                    self.difficulty.enemy_movement_speed.min,
+                    self.difficulty.enemy_movement_speed.max
+                ],
+                batch=self.enemy_word_list.text_batch,
+                spawn_depth_pixels=self.difficulty.difficulty_setting.spawn_depth_pixels
+            )
+            self.enemy_word_list.append(enemy_word)
+            current_enemy_count += 1
+
+    def _update_difficulty(self) -> None:
+        """
+        Update the difficulty based on the score.
+        """
+        self.difficulty.update_difficulty(self.game_stats.score)
+
+    def _fire_laser_at(self, enemy_word: EnemyWord) -> None:
+        """
+        Fire a laser at the given enemy word.
+        """
+        laser = self.laser_pool.acquire(self.player, enemy_word)
+        self.laser_list.append(laser)
+        self.listener.on_laser_fired(laser)
+
+    def _create_explosion_at_sprite(self, sprite: arcade.Sprite) -> None:
+        """
+        Create an explosion at the given sprite (and remove the sprite).
+        """
+        explosion = self.explosion_pool.acquire()
+        explosion.position = sprite.position
+        self.explosion_list.append(explosion)
+        sprite.remove_from_sprite_lists()
+        self.listener.on_explosion(explosion)
+
+    def _add_score_from_word(self, enemy_word: EnemyWord) -> None:
+        """
+        Add scores from the given enemy words.
+        """
+        self.game_stats.score += int(20 * self.multiplier * len(enemy_word.word))
+        self.listener.on_score_changed(self.game_stats.score, self.multiplier)
+
+    def _check_laser_collisions(self) -> None:
+        """
+        Check for laser collisions. Each laser is only tested against its own
+        target; lasers whose target is gone or that left the screen are removed.
+        """
+        self.laser_list.update(delta_time=self.STEP_SECONDS)
+        for laser in list(self.laser_list):
+            if laser.is_target_destroyed() or laser.is_off_screen(self.width, self.height):
+                laser.remove_from_sprite_lists()
+            elif laser.hits_target():
+                enemy_word = laser.target
+                laser.remove_from_sprite_lists()
+                self._add_score_from_word(enemy_word)
+                self._create_explosion_at_sprite(enemy_word)
+                self._spawn_enemies()
+                self._update_difficulty()
+
+    def _check_player_collision(self) -> None:
+        """
+        Check if any of the enemy words collides with the player.
+        Update player lives, and end the game if no lives remain.
+        """
+        collisions = self.enemy_word_list.check_for_collision_with_player()
+        for enemy_word in collisions:
+            self._create_explosion_at_sprite(enemy_word)
+            self.player.lives_remaining -= 1
+            self.listener.on_lives_changed(self.player.lives_remaining)
+            self._spawn_enemies()
+            if self.player.lives_remaining <= 0 and not self.game_over:
+                self.game_over = True
+                self.listener.on_game_over()
+
+    def _update_multiplier(self) -> None:
+        multiplier = min(
+            1.0 + self.streak * 1.0 / self.difficulty.difficulty_setting.multiplier_streak,
+            self.difficulty.difficulty_setting.multiplier_limit
+        )
+        self.multiplier = math.floor(multiplier)
+        self.listener.on_score_changed(self.game_stats.score, self.multiplier)
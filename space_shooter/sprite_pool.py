@@ -0,0 +1,88 @@
+from typing import Generic, TypeVar
+import arcade
+
+
+class PooledSprite(arcade.Sprite):
+    """
+    A sprite that goes back to its pool when it is removed from its sprite
+    lists. Subclasses implement `reset`, which takes the same arguments as
+    their initializer and brings a released sprite back to its initial state.
+    """
+
+    pool: "SpritePool | None" = None
+    is_released = False
+
+    def reset(self, *args, **kwargs) -> None:
+        """
+        Reset the sprite before it is reused.
+        """
+        raise NotImplementedError
+
+    def remove_from_sprite_lists(self) -> None:
+        """
+        Remove the sprite from all its sprite lists, and release it to its pool.
+        """
+        super().remove_from_sprite_lists()
+        if self.pool is not None:
+            self.pool.release(self)
+
+
+PooledSpriteType = TypeVar("PooledSpriteType", bound=PooledSprite)
+
+
+class SpritePool(Generic[PooledSpriteType]):
+    """
+    A pool of reusable sprites of one class. Sprites are only created when no
+    released sprite is available, so once the pool has grown to the largest
+    number of sprites alive at once, `allocated` stops increasing.
+    """
+
+    def __init__(self, sprite_class: type[PooledSpriteType]) -> None:
+        """
+        Initializer
+        """
+        self.sprite_class = sprite_class
+        self.free: list[PooledSpriteType] = []
+        self.allocated = 0
+        self.reused = 0
+        self.released = 0
+
+    def __len__(self) -> int:
+        return len(self.free)
+
+    def acquire(self, *args, **kwargs) -> PooledSpriteType:
+        """
+        Get a sprite initialized with the given arguments, reusing a released
+        sprite if there is one.
+        """
+        if self.free:
+            sprite = self.free.pop()
+            sprite.reset(*args, **kwargs)
+            sprite.is_released = False
+            self.reused += 1
+        else:
+            sprite = self.sprite_class(*args, **kwargs)
+            sprite.pool = self
+            self.allocated += 1
+        return sprite
+
+    def release(self, sprite: PooledSpriteType) -> None:
+        """
+        Give a sprite back to the pool (releasing it again has no effect).
+        """
+        if sprite.is_released:
+            return
+        sprite.is_released = True
+        self.free.append(sprite)
+        self.released += 1
+
+    def get_counters(self) -> dict[str, int]:
+        """
+        Get the allocation counters of the pool.
+        """
+        return dict(
+            allocated=self.allocated,
+            reused=self.reused,
+            released=self.released,
+            free=len(self.free)
+        )
@@ -1,44 +1,89 @@
 import arcade
 from arcade.gui import UIOnClickEvent
 import random
-import math
-from space_shooter.player import Player
-from space_shooter.enemies import EnemySpawner, EnemyWordList, EnemyWord
+import time
+from pyglet.graphics import Batch
 from space_shooter.explosion import Explosion
 from space_shooter.laser import Laser
 from space_shooter.game_stats import GameStats
+from space_shooter.simulation import SpaceShooterSimulation, ShooterListener
 from space_shooter.difficulty import Difficulty
+from space_shooter.bot_typist import BotProfile, BotTypist
+from utils.frame_timer import FrameTimer
 from utils.helpers import key_mapping
 from utils.resources import (
     SEPIA_BACKGROUND,
     SPACE_SHOOTER_MUSIC, 
     KEYPRESS_SOUND, 
     ERROR_SOUND,
-    GAME_OVER_SOUND
+    GAME_OVER_SOUND,
+    LASER_SOUND,
+    EXPLOSION_SOUND
 )
 from utils.menu_view import MenuView
 from utils.music_manager import MusicManager
+from utils.sound_manager import SoundManager
 from utils import global_state
+from utils.input_log import InputLog, InputRecorder
 from utils.save_manager import SaveManager
 
 
-class SpaceShooterGameView(arcade.View):
+class SpaceShooterGameView(arcade.View, ShooterListener):
     """
-    The main game view.
+    The main game view. The game itself runs in a SpaceShooterSimulation;
+    the view feeds it the frame times and key presses, and renders it.
     """
 
     SOUND_VOLUME = 1.0
     FONT_NAME = "Pixelzone"
+    OVERLAY_REFRESH_SECONDS = 0.5
     
-    def __init__(self, main_menu_view: arcade.View, difficulty_level: int = 1) -> None:
-        """
-        Initializer
+    def __init__(
+        self,
+        main_menu_view: arcade.View,
+        difficulty_level: int = 1,
+        difficulty_setting: Difficulty.DifficultySetting | None = None,
+        autopilot: BotProfile | None = None,
+        show_frame_times: bool | None = None
+    ) -> None:
+        """
+        Initializer. With an autopilot, a bot typist plays the game. The
+        frame time overlay (toggled with F3) is shown by default in swarm mode.
         """
         super().__init__()
         self.window.set_mouse_visible(False)
         self.main_menu_view = main_menu_view
-        self.enemy_spawner = EnemySpawner()
-        self.player = Player(center_x=75, center_y=self.window.height//2)
+        self.difficulty_level = difficulty_level
+        self.difficulty_setting = difficulty_setting
+        self.autopilot = autopilot
+        if show_frame_times is None:
+            show_frame_times = difficulty_level == Difficulty.SWARM
+        self.show_frame_times = show_frame_times
+        # Time between frames, and time spent updating and drawing each frame
+        self.frame_timer = FrameTimer()
+        self.work_timer = FrameTimer()
+        self.last_frame_time: float | None = None
+        self.update_seconds = 0.0
+        self.overlay_age = 0.0
+        self.frame_time_text = arcade.Text(
+            text="",
+            x=10,
+            y=self.window.height - 10,
+            font_size=12,
+            color=arcade.color.BLACK,
+            anchor_y="top",
+            multiline=True,
+            width=self.window.width - 20
+        )
+        self.recorder = InputRecorder(
+            "space_shooter",
+            metadata=dict(
+                difficulty_level=difficulty_level,
+                difficulty_setting=difficulty_setting.to_data() if difficulty_setting else None,
+                width=self.window.width,
+                height=self.window.height
+            )
+        ) if global_state.record_input and autopilot is None else None
         self.player_lives_text = arcade.Text(
             text="", 
             x=10, 
@@ -48,10 +93,6 @@ class SpaceShooterGameView(arcade.View):
             color=arcade.color.ANTIQUE_RUBY,
             bold=True
         )
-        self.input = ""
-        self.explosion_list: arcade.SpriteList
-        self.game_stats = GameStats()
-        self.game_stats.score = 0
         self.score_text = arcade.Text(
             text="",
             x=10,
@@ -61,208 +102,183 @@ class SpaceShooterGameView(arcade.View):
             color=arcade.color.ANTIQUE_RUBY,
             bold=True
         )
-        self.difficulty = Difficulty(difficulty_level=difficulty_level)
-        self.multiplier = 1.0
-        self.streak = 0
-        MusicManager.play_music(SPACE_SHOOTER_MUSIC)
+        MusicManager.play_music(SPACE_SHOOTER_MUSIC.get())
         self.setup()
 
     def setup(self) -> None:
         """
         Set up the game.
         """
-        self.input = ""
-        self._update_player_lives_text()
-        self.game_stats.score = 0
-        self._update_score_text()
-        self.laser_list = arcade.SpriteList()
-        self.explosion_list = arcade.SpriteList()
-        self.enemy_word_list = EnemyWordList()
-        self._spawn_enemies()
+        self.simulation = SpaceShooterSimulation(
+            self.window.width,
+            self.window.height,
+            difficulty_level=self.difficulty_level,
+            # A recorded game is replayed from the recording's seed
+            seed=self.recorder.log.seed if self.recorder is not None else None,
+            listener=self,
+            text_batch=Batch(),
+            ship_color=global_state.current_user_profile.ship_color,
+            difficulty_setting=self.difficulty_setting
+        )
+        self.bot = BotTypist(self.simulation, self.autopilot, seed=self.simulation.seed) if self.autopilot else None
+        self.game_stats: GameStats = self.simulation.game_stats
+        self.player = self.simulation.player
+        self.on_lives_changed(self.player.lives_remaining)
+        self.on_score_changed(self.game_stats.score, self.simulation.multiplier)
 
     def on_draw(self) -> None:
         """
-        Draw the game.
+        Draw the game, interpolated between the last two simulation steps.
         """
+        draw_start = time.perf_counter()
         self.clear()
         arcade.draw_texture_rect(
-            SEPIA_BACKGROUND,
+            SEPIA_BACKGROUND.get(),
             arcade.LBWH(0, 0, self.window.width, self.window.height)
         )
-        self.laser_list.draw()
-        self.player.draw()
-        self.enemy_word_list.draw()
-        self.explosion_list.draw()
+        simulation = self.simulation
+        with simulation.interpolated():
+            simulation.laser_list.draw()
+            self.player.draw()
+            simulation.enemy_word_list.draw()
+            simulation.explosion_list.draw()
         self.score_text.draw()
         self.player_lives_text.draw()
-
-    def _spawn_enemies(self) -> None:
-        """
-        Keep spawning enemies according to the difficulty setting
-        """
-        current_enemy_count = len(self.enemy_word_list)
-        count_target = random.randrange(
-            self.difficulty.enemy_count.min, 
-            self.difficulty.enemy_count.max + 1
+        if self.show_frame_times:
+            self.frame_time_text.draw()
+        self._time_frame(draw_start)
+
+    def _time_frame(self, draw_start: float) -> None:
+        """
+        Record the frame's times, and refresh the overlay periodically.
+        """
+        now = time.perf_counter()
+        self.work_timer.add(self.update_seconds + now - draw_start)
+        self.update_seconds = 0.0
+        if self.last_frame_time is not None:
+            self.frame_timer.add(now - self.last_frame_time)
+            self.overlay_age += now - self.last_frame_time
+        self.last_frame_time = now
+        if self.show_frame_times and self.overlay_age >= self.OVERLAY_REFRESH_SECONDS:
+            self.overlay_age = 0.0
+            self._update_frame_time_text()
+
+    def _update_frame_time_text(self) -> None:
+        """
+        Update the frame time overlay (milliseconds over the last frames).
+        """
+        frame_p50, frame_p99 = self.frame_timer.recent_percentiles([50, 99])
+        work_p50, work_p99 = self.work_timer.recent_percentiles([50, 99])
+        simulation = self.simulation
+        self.frame_time_text.text = (
+            f"FPS {1 / frame_p50 if frame_p50 else 0:.0f} | "
+            f"frame p50 {frame_p50 * 1000:.1f} ms, p99 {frame_p99 * 1000:.1f} ms | "
+            f"update+draw p50 {work_p50 * 1000:.1f} ms, p99 {work_p99 * 1000:.1f} ms\n"
+            f"{len(simulation.enemy_word_list)} meteors, {len(simulation.laser_list)} lasers, "
+            f"{len(simulation.explosion_list)} explosions"
         )
-        while current_enemy_count < count_target:
-            enemy_word = self.enemy_spawner.spawn_enemy_word(
-                player_position=self.player.position,
-                window_width=self.window.width,
-                window_height=self.window.height,
-                character_count_range=[
-                    self.difficulty.enemy_word_length.min,
-                    self.difficulty.enemy_word_length.max
-                ],
-                movement_speed_range=[
-                    self.difficulty.enemy_movement_speed.min,
-                    self.difficulty.enemy_movement_speed.max
-                ]
-            )
-            self.enemy_word_list.append(enemy_word)
-            current_enemy_count += 1
 
-    def _update_difficulty(self) -> None:
-        """
-        Update the difficulty based on the score.
+    def get_pool_counters(self) -> dict[str, dict[str, int]]:
         """
-        self.difficulty.update_difficulty(self.game_stats.score)
-        
-    def _fire_laser_at(self, enemy_word: EnemyWord) -> None:
+        Get the allocation counters of the simulation's sprite pools.
         """
-        Fire a laser at the given enemy word.
-        """
-        laser = Laser(self.player, enemy_word)
-        self.laser_list.append(laser)
+        return self.simulation.get_pool_counters()
 
-    def _create_explosion_at_sprite(self, sprite: arcade.Sprite) -> None:
-        """
-        Create an explosion at the given sprite (and remove the sprite).
-        """
-        explosion = Explosion()
-        explosion.position = sprite.position
-        self.explosion_list.append(explosion)
-        sprite.remove_from_sprite_lists()
-
-    def _add_score_from_word(self, enemy_word: EnemyWord) -> None:
+    def on_update(self, delta_time: float) -> None:
         """
-        Add scores from the given enemy words.
+        Update the game.
         """
-        self.game_stats.score += int(20 * self.multiplier * len(enemy_word.word))
-        self._update_score_text()
+        update_start = time.perf_counter()
+        delta_us = round(delta_time * 1_000_000)
+        if self.recorder is not None:
+            self.recorder.record(InputLog.UPDATE, code=delta_us)
+        self.simulation.advance(delta_us)
+        if self.bot is not None:
+            self.bot.update(delta_time)
+        self.update_seconds += time.perf_counter() - update_start
 
-    def _check_laser_collisions(self, delta_time: float) -> None:
+    def on_laser_fired(self, laser: Laser) -> None:
         """
-        Check for laser collisions.
+        Play the laser sound.
         """
-        self.laser_list.update()
-        for laser in self.laser_list:
-            if laser.left > self.window.width:
-                laser.remove_from_sprite_lists()
-            collisions = arcade.check_for_collision_with_list(laser, self.enemy_word_list)
-            for enemy_word in collisions:
-                if enemy_word == laser.target:
-                    laser.remove_from_sprite_lists()
-                    self._add_score_from_word(enemy_word)
-                    self._create_explosion_at_sprite(enemy_word)
-                    self._spawn_enemies()
-                    self._update_difficulty()
+        SoundManager.play_sound(LASER_SOUND.get())
 
-    def _check_player_collision(self) -> None:
+    def on_explosion(self, explosion: Explosion) -> None:
         """
-        Check if any of the enemy words collides with the player.
-        Update player lives and show 'Game Over' if no lives remain.
+        Play the explosion sound.
         """
-        collisions = arcade.check_for_collision_with_list(self.player, self.enemy_word_list)
-        for enemy_word in collisions:
-            self._create_explosion_at_sprite(enemy_word)
-            self.player.lives_remaining -= 1
-            self._update_player_lives_text()
-            self._spawn_enemies()
-            if self.player.lives_remaining <= 0:
-                game_over_view = GameOverView(self.game_stats, self.main_menu_view)
-                arcade.play_sound(GAME_OVER_SOUND, volume=1.0)
-                self.window.show_view(game_over_view)
+        SoundManager.play_sound(EXPLOSION_SOUND.get())
 
-    def _check_word_matches(self) -> None:
+    def on_key_checked(self, matches: bool) -> None:
         """
-        Check for word matches.
+        Play the keypress sound, or the error sound if nothing matches.
         """
-        mismatch_count = 0
-        full_match_count = 0
-        for enemy_word in self.enemy_word_list:
-            matching_result = enemy_word.match_text(self.input)
-            if matching_result == "mismatch":
-                mismatch_count += 1
-            elif matching_result == "full":
-                full_match_count += 1
-                self._fire_laser_at(enemy_word)
-        # If none of the words matches or there are full matches, reset the input
-        if mismatch_count == len(self.enemy_word_list):
-            self.input = ""
-            self._play_error_sound()
-            self.streak = 0
-        elif full_match_count > 0:
-            self.input = ""
+        if matches:
             self._play_keypress_sound()
-            self.streak += 1
         else:
-            self._play_keypress_sound()
-        self._update_multiplier()
+            self._play_error_sound()
 
-    def on_update(self, delta_time: float) -> None:
+    def on_score_changed(self, score: int, multiplier: float) -> None:
         """
-        Update the game.
+        Update the score text.
         """
-        self._check_player_collision()
-        self._check_laser_collisions(delta_time=delta_time)
-        self.explosion_list.update(delta_time=delta_time)
-        self.enemy_word_list.update(delta_time=delta_time)
-
-    def _update_multiplier(self) -> None:
-        multiplier = min(
-            1.0 + self.streak * 1.0 / self.difficulty.difficulty_setting.multiplier_streak, 
-            self.difficulty.difficulty_setting.multiplier_limit
-        )
-        self.multiplier = math.floor(multiplier)
-        self._update_score_text()
+        self.score_text.text = f"Score: {score:.0f}, Multiplier: {multiplier:.0f}x"
 
-    def _update_score_text(self) -> None:
+    def on_lives_changed(self, lives_remaining: int) -> None:
         """
-        Update the score text.
+        Update the player lives text.
         """
-        self.score_text.text = f"Score: {self.game_stats.score:.0f}, Multiplier: {self.multiplier:.0f}x"
+        self.player_lives_text.text = f"Lives: {lives_remaining}/{self.player.MAX_LIVES}"
 
-    def _update_player_lives_text(self) -> None:
+    def on_game_over(self) -> None:
         """
-        Update the player lives text.
+        Show 'Game Over'.
         """
-        self.player_lives_text.text = f"Lives: {self.player.lives_remaining}/{self.player.MAX_LIVES}"
+        self.save_recording()
+        game_over_view = GameOverView(self.game_stats, self.main_menu_view)
+        SoundManager.play_sound(GAME_OVER_SOUND.get(), volume=1.0)
+        self.window.show_view(game_over_view)
             
     def on_key_press(self, symbol: int, modifiers: int) -> None:
         """
         Handle key presses.
         """
+        if symbol == arcade.key.F3:
+            # Not part of the game, so not recorded
+            self.show_frame_times = not self.show_frame_times
+            self._update_frame_time_text()
+            return
+        if self.recorder is not None:
+            self.recorder.record(InputLog.KEY_PRESS, code=symbol, modifiers=modifiers)
         if symbol == arcade.key.ESCAPE:
             pause_view = PauseView(self, self.game_stats)
             self.window.show_view(pause_view)
         else:
-            key_pressed = key_mapping.get(symbol, "")
-            self.input = self.input + key_pressed
-            self._check_word_matches()
+            self.simulation.type_key(key_mapping.get(symbol, ""))
+
+    def save_recording(self) -> None:
+        """
+        Saves the recording of the session, if recording
+        """
+        if self.recorder is not None:
+            self.recorder.save(
+                global_state.current_user_profile.name,
+                self.simulation.get_results()
+            )
+            self.recorder = None
 
     def _play_keypress_sound(self):
         """
         Play the keypress sound
         """
-        arcade.play_sound(
-            KEYPRESS_SOUND, 
+        SoundManager.play_sound(
+            KEYPRESS_SOUND.get(),
             volume=random.uniform(0.65, 0.75),
             speed=random.uniform(0.98, 1.02)
         )
 
     def _play_error_sound(self):
-        arcade.play_sound(ERROR_SOUND, volume=0.4)
+        SoundManager.play_sound(ERROR_SOUND.get(), volume=0.4)
 
     def on_show_view(self) -> None:
         """
@@ -312,6 +328,14 @@ class SSDifficultySelectionView(MenuView):
         def _(event: UIOnClickEvent) -> None:
             self._start_game(2)
 
+        button_swarm = self.create_button(
+            button_text="Swarm",
+            tooltip_text="Hundreds of slow meteors at once, then thousands. A stress test (F3 shows frame times)."
+        )
+        @button_swarm.event("on_click")
+        def _(event: UIOnClickEvent) -> None:
+            self._start_game(Difficulty.SWARM)
+
         button_back = self.create_button(
             button_text="Back",
             tooltip_text="Return to the Main Menu"
@@ -325,6 +349,7 @@ class SSDifficultySelectionView(MenuView):
                 button_easy,
                 button_moderate,
                 button_hard,
+                button_swarm,
                 button_back
             ]
         )
@@ -398,6 +423,7 @@ class PauseView(MenuView):
         Return to the main menu.
         """
         self.save_manager.save_game_score_to_db(self.game_stats)
+        self.game_view.save_recording()
         self.window.show_view(self.game_view.main_menu_view)
 
 
@@ -0,0 +1,119 @@
+from typing import Hashable
+
+
+class _Node:
+    """
+    A trie node, with the items whose words pass through it (in insertion order)
+    """
+
+    __slots__ = ("children", "items")
+
+    def __init__(self) -> None:
+        """
+        Initializer
+        """
+        self.children: dict[str, _Node] = {}
+        self.items: dict[Hashable, None] = {}
+
+
+class WordTrie:
+    """
+    A prefix trie over the words of the active enemies, with a cursor that
+    follows the typed input one character at a time.
+
+    Every node keeps the items (enemies) whose word starts with the node's
+    prefix, so the enemies matching the input are the items of the cursor
+    node, and advancing the cursor by one character yields exactly the items
+    whose match state changes.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initializer
+        """
+        self.root = _Node()
+        self.node = self.root
+        self.prefix = ""
+
+    def __len__(self) -> int:
+        return len(self.root.items)
+
+    @property
+    def depth(self) -> int:
+        """
+        The length of the input followed by the cursor
+        """
+        return len(self.prefix)
+
+    def has_matches(self) -> bool:
+        """
+        Returns whether any item's word starts with the input
+        """
+        return bool(self.node.items)
+
+    def insert(self, word: str, item: Hashable) -> bool:
+        """
+        Adds an item under a word. Returns True if the word starts with the
+        current input, i.e. if the item is a match already.
+        """
+        node = self.root
+        node.items[item] = None
+        for i, char in enumerate(word):
+            if i == len(self.prefix) and word.startswith(self.prefix):
+                # The cursor node may have been pruned and created again
+                self.node = node
+            node = node.children.setdefault(char, _Node())
+            node.items[item] = None
+        if len(word) == len(self.prefix) and word == self.prefix:
+            self.node = node
+        return word.startswith(self.prefix)
+
+    def remove(self, word: str, item: Hashable) -> None:
+        """
+        Removes an item (if present), pruning the nodes left without items
+        """
+        if item not in self.root.items:
+            return
+        node = self.root
+        del node.items[item]
+        pruned = False
+        for char in word:
+            child = node.children[char]
+            del child.items[item]
+            # The nodes below a pruned node are cleared too, as the cursor may
+            # still be on one of them
+            if not child.items and not pruned:
+                del node.children[char]
+                pruned = True
+            node = child
+
+    def advance(self, char: str) -> tuple[list[Hashable], list[Hashable]]:
+        """
+        Moves the cursor by one typed character. Returns the items that still
+        match (one more character), and the items that stopped matching
+        after matching at least one character (the items of the root match
+        no character, so the first character of the input drops none).
+        If nothing matches any more, the cursor stays on an empty node until
+        `reset` is called.
+        """
+        next_node = self.node.children.get(char)
+        if next_node is None:
+            dropped = list(self.node.items) if self.prefix else []
+            next_node = _Node()
+            advanced = []
+        else:
+            dropped = [item for item in self.node.items if item not in next_node.items] if self.prefix else []
+            advanced = list(next_node.items)
+        self.node = next_node
+        self.prefix += char
+        return advanced, dropped
+
+    def reset(self) -> list[Hashable]:
+        """
+        Moves the cursor back to the root (empty input). Returns the items that
+        were matching the input.
+        """
+        matched = list(self.node.items) if self.prefix else []
+        self.node = self.root
+        self.prefix = ""
+        return matched
@@ -1,6 +1,7 @@
 import sys
 import os
 from unittest.mock import patch, MagicMock
+import pytest
 
 # Add the project root to the Python path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
@@ -22,3 +23,17 @@ def pytest_unconfigure(config):
     Clean up the patches after the test session.
     """
     patch.stopall()
+
+
+@pytest.fixture
+def real_textures(monkeypatch):
+    """
+    Fixture that lifts the texture loading mock, for the tests that need real
+    textures (and reloads the assets that were loaded as mocks).
+    """
+    import arcade
+    from utils.resources import ASSETS
+    monkeypatch.setattr(arcade, "load_texture", arcade.texture.load_texture)
+    for handle in ASSETS.handles.values():
+        if handle.loaded and isinstance(handle.get(), MagicMock):
+            monkeypatch.setattr(handle, "_loaded", False)
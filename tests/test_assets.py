@@ -0,0 +1,132 @@
+import threading
+import pytest
+from unittest.mock import MagicMock
+from utils.assets import AssetHandle, AssetRegistry
+
+
+@pytest.fixture
+def registry():
+    """Fixture for a registry that runs the ready callbacks immediately."""
+    registry = AssetRegistry(schedule=lambda callback: callback())
+    yield registry
+    registry.shutdown()
+
+
+def test_handle_loads_on_first_get_only():
+    """Test that the loader runs on the first get and its result is reused."""
+    loader = MagicMock(return_value="texture")
+    handle = AssetHandle("background", loader)
+    assert not handle.loaded
+    loader.assert_not_called()
+    assert handle.get() == "texture"
+    assert handle.get() == "texture"
+    assert handle.loaded
+    assert handle.load_seconds is not None
+    loader.assert_called_once()
+
+
+def test_failed_load_is_retried():
+    """Test that a failed load leaves the handle unloaded, so a later get retries it."""
+    loader = MagicMock(side_effect=[OSError("missing"), "sound"])
+    handle = AssetHandle("sound", loader)
+    with pytest.raises(OSError):
+        handle.get()
+    assert not handle.loaded
+    assert handle.get() == "sound"
+
+
+def test_concurrent_gets_load_once():
+    """Test that a get during a background load waits for it instead of loading again."""
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def loader():
+        calls.append(1)
+        started.set()
+        release.wait(timeout=5)
+        return "spritesheet"
+
+    handle = AssetHandle("explosion", loader)
+    thread = threading.Thread(target=handle.get)
+    thread.start()
+    started.wait(timeout=5)
+    release.set()
+    assert handle.get() == "spritesheet"
+    thread.join()
+    assert len(calls) == 1
+
+
+def test_register_rejects_duplicate_names(registry):
+    """Test that an asset name can only be registered once."""
+    registry.register("laser", lambda: "laser")
+    with pytest.raises(ValueError):
+        registry.register("laser", lambda: "other laser")
+
+
+def test_register_does_not_load(registry):
+    """Test that registering an asset does not run its loader."""
+    loader = MagicMock()
+    registry.register("meteor", loader)
+    loader.assert_not_called()
+
+
+def test_load_manifest(registry):
+    """Test that loading a manifest loads all its assets, and only them."""
+    meteor = registry.register("meteor", lambda: "meteor")
+    laser = registry.register("laser", lambda: "laser")
+    music = registry.register("music", lambda: "music")
+    registry.add_manifest("space_shooter", [meteor, laser])
+    assert registry.pending("space_shooter") == ["meteor", "laser"]
+    registry.load("space_shooter")
+    assert registry.pending("space_shooter") == []
+    assert not music.loaded
+
+
+def test_preload_runs_in_background_then_calls_on_ready(registry):
+    """Test that a preload loads the manifest off the calling thread, then runs on_ready."""
+    load_threads = []
+    meteor = registry.register("meteor", lambda: load_threads.append(threading.current_thread()))
+    registry.add_manifest("space_shooter", [meteor])
+    on_ready = MagicMock()
+    registry.preload("space_shooter", on_ready=on_ready).result(timeout=5)
+    assert meteor.loaded
+    assert load_threads[0] is not threading.current_thread()
+    on_ready.assert_called_once()
+
+
+def test_preloads_run_in_order(registry):
+    """Test that preloads run one after the other, in request order."""
+    order = []
+    first = registry.register("first", lambda: order.append("first"))
+    second = registry.register("second", lambda: order.append("second"))
+    registry.add_manifest("menu", [first])
+    registry.add_manifest("game", [second, first])
+    registry.preload("menu")
+    registry.preload("game").result(timeout=5)
+    assert order == ["first", "second"]
+
+
+def test_preload_failure_is_kept_in_future(registry):
+    """Test that a failed preload reports its error through the future and skips on_ready."""
+    broken = registry.register("broken", MagicMock(side_effect=OSError("missing")))
+    registry.add_manifest("game", [broken])
+    on_ready = MagicMock()
+    future = registry.preload("game", on_ready=on_ready)
+    with pytest.raises(OSError):
+        future.result(timeout=5)
+    on_ready.assert_not_called()
+    assert not broken.loaded
+
+
+def test_preload_unknown_manifest(registry):
+    """Test that preloading an unknown manifest raises a KeyError."""
+    with pytest.raises(KeyError):
+        registry.preload("unknown")
+
+
+def test_resources_import_loads_nothing():
+    """Test that importing the resources module does not load any asset."""
+    from utils.resources import ASSETS
+    assert ASSETS.handles
+    assert not any(handle.loaded for handle in ASSETS.handles.values())
@@ -0,0 +1,51 @@
+import shutil
+import pytest
+from pyglet.media.codecs.base import AudioFormat
+from utils.audio_cache import AudioCache, decode_sound
+
+
+@pytest.fixture
+def sound_file(tmp_path):
+    """Fixture for a copy of a WAV effect."""
+    path = tmp_path / "laser.wav"
+    shutil.copy("assets/sounds/laser2.wav", path)
+    return str(path)
+
+
+def test_decodes_once(tmp_path, sound_file):
+    """Test that a cached effect is memory-mapped instead of decoded again."""
+    cache = AudioCache(folder=str(tmp_path / "cache"))
+    first = cache.load(sound_file)
+    assert cache.decoded_count == 1
+    second_cache = AudioCache(folder=str(tmp_path / "cache"))
+    second = second_cache.load(sound_file)
+    assert second_cache.decoded_count == 0
+    data, audio_format = decode_sound(sound_file)
+    assert bytes(second.source._data) == data
+    assert second.source.audio_format == audio_format
+    assert first.source.duration == pytest.approx(second.source.duration)
+
+
+def test_changed_file_is_decoded_again(tmp_path, sound_file):
+    """Test that the cache is keyed by the content of the source file."""
+    cache = AudioCache(folder=str(tmp_path / "cache"))
+    path = cache.cache_path(sound_file)
+    with open(sound_file, "ab") as file:
+        file.write(b"\0\0")
+    assert cache.cache_path(sound_file) != path
+
+
+def test_reader_streams_and_seeks(tmp_path, sound_file):
+    """Test that queued readers return the PCM in packets and can rewind."""
+    pcm = bytes(range(256)) * 8
+    cache = AudioCache(
+        folder=str(tmp_path / "cache"),
+        decode=lambda file_name: (pcm, AudioFormat(1, 16, 1000))
+    )
+    reader = cache.load(sound_file).source.get_queue_source()
+    packets = []
+    while (audio_data := reader.get_audio_data(300)) is not None:
+        packets.append(audio_data.data)
+    assert b"".join(packets) == pcm
+    reader.seek(0.5)
+    assert reader.get_audio_data(4).data == pcm[1000:1004]
@@ -0,0 +1,48 @@
+import pytest
+import numpy as np
+from typing_trainer.bigram_stats import BigramStats
+
+
+def test_add_and_merge():
+    """Test that merging two accumulators equals recording everything in one."""
+    first, second, combined = BigramStats(), BigramStats(), BigramStats()
+    for i, t in enumerate([0.1, 0.2, 0.3, 0.4, 0.5]):
+        (first if i < 2 else second).add("e", "r", t)
+        combined.add("e", "r", t)
+    first.merge(second)
+    i, j = BigramStats.CHAR_INDEX["e"], BigramStats.CHAR_INDEX["r"]
+    assert first.count[i, j] == 5
+    assert first.mean[i, j] == pytest.approx(0.3)
+    assert first.m2[i, j] == pytest.approx(combined.m2[i, j])
+
+
+def test_unknown_characters_are_ignored():
+    """Test that transitions outside the alphabet are not recorded."""
+    stats = BigramStats()
+    stats.add("A", "b", 0.2)
+    stats.add("b", "?", 0.2)
+    assert len(stats) == 0
+
+
+def test_rows_round_trip():
+    """Test conversion to and from database rows."""
+    stats = BigramStats()
+    stats.add("q", "u", 0.25)
+    stats.add(" ", "t", 0.4)
+    restored = BigramStats.from_rows(stats.to_rows())
+    assert (restored.count == stats.count).all()
+    assert np.allclose(restored.mean, stats.mean)
+
+
+def test_add_batch_matches_add():
+    """Test that recording transitions in a batch equals recording them one by one."""
+    chars = list("the quick brown fox? the Lazy dog")
+    previous_chars = [None] + chars[:-1]
+    flight_times = np.linspace(0.1, 0.4, len(chars))
+    single, batched = BigramStats(), BigramStats()
+    for previous_char, char, t in zip(previous_chars, chars, flight_times):
+        single.add(previous_char, char, t)
+    batched.add_batch(previous_chars, chars, flight_times)
+    assert (batched.count == single.count).all()
+    assert np.allclose(batched.mean, single.mean)
+    assert np.allclose(batched.m2, single.m2)
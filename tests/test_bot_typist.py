@@ -0,0 +1,48 @@
+import pytest
+from space_shooter.bot_typist import BotProfile, BotTypist
+from space_shooter.simulation import SpaceShooterSimulation
+
+pytestmark = pytest.mark.usefixtures("real_textures")
+
+
+def _play(profile, seed, seconds):
+    """Plays a game with a bot for a number of simulated seconds."""
+    simulation = SpaceShooterSimulation(1280, 720, difficulty_level=1, seed=seed)
+    bot = BotTypist(simulation, profile, seed=seed)
+    for _ in range(seconds * 60):
+        simulation.advance(16_667)
+        bot.update(1 / 60)
+    return simulation, bot
+
+
+def test_bot_scores():
+    """Test that a flawless bot destroys meteors without mistakes."""
+    simulation, bot = _play(BotProfile(wpm_mean=80, wpm_stddev=0, error_rate=0.0), seed=1, seconds=60)
+    assert bot.errors == 0
+    assert bot.keystrokes == pytest.approx(60 * 80 * 5 / 60, rel=0.1)
+    assert simulation.game_stats.score > 0
+    assert simulation.streak > 0
+
+
+def test_bot_is_deterministic():
+    """Test that a bot plays the same game from the same seed."""
+    profile = BotProfile(error_rate=0.1, target_policy="random")
+    first, first_bot = _play(profile, seed=5, seconds=30)
+    second, second_bot = _play(profile, seed=5, seconds=30)
+    assert first.get_results() == second.get_results()
+    assert (first_bot.keystrokes, first_bot.errors) == (second_bot.keystrokes, second_bot.errors)
+    assert first_bot.errors > 0
+
+
+def test_slow_bot_loses():
+    """Test that a very slow bot ends up losing all its lives."""
+    simulation, _ = _play(BotProfile(wpm_mean=5, wpm_stddev=0), seed=2, seconds=120)
+    assert simulation.game_over
+    assert simulation.player.lives_remaining == 0
+
+
+def test_unknown_policy():
+    """Test that an unknown target policy is rejected."""
+    simulation = SpaceShooterSimulation(1280, 720, seed=0)
+    with pytest.raises(ValueError):
+        BotTypist(simulation, BotProfile(target_policy="loudest"))
@@ -0,0 +1,76 @@
+import math
+import random
+import arcade
+import pytest
+from space_shooter.collisions import ApproachBroadPhase
+
+
+def make_meteor(rng: random.Random, target: arcade.Sprite, speed: float) -> arcade.Sprite:
+    """Create a meteor at a random point of an arc, moving towards the target."""
+    angle = rng.uniform(-math.pi / 3, math.pi / 3)
+    distance = rng.uniform(200, 1200)
+    meteor = arcade.SpriteSolidColor(
+        40, 30,
+        center_x=target.center_x + distance * math.cos(angle),
+        center_y=target.center_y + distance * math.sin(angle)
+    )
+    meteor.change_angle = rng.uniform(-5, 5)
+    meteor.velocity = (-speed * math.cos(angle), -speed * math.sin(angle))
+    return meteor
+
+
+@pytest.fixture
+def player():
+    """Fixture for a static player sprite."""
+    return arcade.SpriteSolidColor(60, 50, center_x=75, center_y=360)
+
+
+def test_matches_brute_force(player):
+    """Test that the broad phase reports the same collisions, on the same frame, as testing every sprite."""
+    rng = random.Random(7)
+    broad_phase = ApproachBroadPhase(player)
+    meteors = arcade.SpriteList()
+    for _ in range(150):
+        speed = rng.uniform(0.75, 3.0)
+        meteor = make_meteor(rng, player, speed)
+        # Some meteors are slowed down below their maximum speed
+        if rng.random() < 0.3:
+            meteor.velocity = (meteor.velocity[0] * 0.5, meteor.velocity[1] * 0.5)
+        meteors.append(meteor)
+        broad_phase.add(meteor, speed)
+    delta_time = 1 / 60
+    total_collisions = 0
+    for _ in range(900):
+        expected = arcade.check_for_collision_with_list(player, meteors)
+        actual = broad_phase.collisions()
+        assert set(actual) == set(expected)
+        for meteor in actual:
+            meteors.remove(meteor)
+            broad_phase.remove(meteor)
+        total_collisions += len(actual)
+        meteors.update(delta_time)
+        broad_phase.advance(delta_time)
+    assert total_collisions > 50
+    # Far fewer precise tests than testing every meteor every frame
+    assert broad_phase.precise_checks < 900 * 150 / 10
+
+
+def test_removed_sprites_are_not_reported(player):
+    """Test that a removed sprite is never reported, even when it is due."""
+    meteor = arcade.SpriteSolidColor(40, 30, center_x=player.center_x, center_y=player.center_y)
+    broad_phase = ApproachBroadPhase(player)
+    broad_phase.add(meteor, 1.0)
+    broad_phase.remove(meteor)
+    assert broad_phase.collisions() == []
+    assert len(broad_phase) == 0
+
+
+def test_far_sprites_are_not_tested(player):
+    """Test that a sprite is not tested before it can have reached the player."""
+    meteor = arcade.SpriteSolidColor(40, 30, center_x=player.center_x + 600, center_y=player.center_y)
+    broad_phase = ApproachBroadPhase(player)
+    broad_phase.add(meteor, 1.0)
+    for _ in range(60):
+        broad_phase.collisions()
+        broad_phase.advance(1 / 60)
+    assert broad_phase.precise_checks == 0
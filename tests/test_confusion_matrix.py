@@ -0,0 +1,45 @@
+from typing_trainer.confusion_matrix import ConfusionMatrix
+from typing_trainer.session_stats import SessionStats, SessionStatsList
+
+
+def test_other_characters_are_mistakes():
+    """Test that typed characters outside the alphabet count as mistakes of the expected character."""
+    matrix = ConfusionMatrix()
+    matrix.add("a", "a", 3)
+    matrix.add("a", "A")
+    matrix.add("a", "?")
+    a = ConfusionMatrix.CHAR_INDEX["a"]
+    assert matrix.count_total()[a] == 5
+    assert matrix.count_correct()[a] == 3
+    assert matrix.to_dict() == {"a": {"a": 3, ConfusionMatrix.OTHER_KEY: 2}}
+
+
+def test_dict_round_trip():
+    """Test conversion to and from the stored nested dicts, including older ones."""
+    matrix = ConfusionMatrix.from_dict({"e": {"e": 4, "r": 1, "E": 2}, " ": {" ": 7}})
+    assert matrix.get("e", "r") == 1
+    assert matrix.get("e", "!") == 2
+    assert ConfusionMatrix.from_dict(matrix.to_dict()).counts.tolist() == matrix.counts.tolist()
+
+
+def test_sessions_sum():
+    """Test that the overall matrix of a session list is the sum of the session matrices."""
+    sessions = SessionStatsList([SessionStats() for _ in range(3)])
+    for i, stats in enumerate(sessions):
+        stats.char_confusion_matrix.add("t", "t", i + 1)
+        stats.char_confusion_matrix.add("t", "y")
+    overall = sessions.compute_overall_confusion_matrix()
+    assert overall.get("t", "t") == 6
+    assert overall.get("t", "y") == 3
+    assert len(overall) == 9
+
+
+def test_add_batch_matches_add():
+    """Test that recording keystrokes in a batch equals recording them one by one."""
+    expected_chars = list("typing trainer")
+    typed_chars = list("tyPing trainwr")
+    single, batched = ConfusionMatrix(), ConfusionMatrix()
+    for expected_char, typed_char in zip(expected_chars, typed_chars):
+        single.add(expected_char, typed_char)
+    batched.add_batch(expected_chars, typed_chars)
+    assert (batched.counts == single.counts).all()
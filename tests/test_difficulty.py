@@ -0,0 +1,115 @@
+import json
+import math
+import pytest
+from space_shooter.difficulty import (
+    Difficulty,
+    DifficultyTable,
+    LinearCurve,
+    PiecewiseCurve,
+    curve_from_data,
+    load_difficulty_settings
+)
+
+
+def _formula(score, minimum, maximum, as_int):
+    """The difficulty values of a (min, max) pair of linear curves, computed directly."""
+    values = tuple(min(curve.start + score * curve.increment, curve.limit) for curve in (minimum, maximum))
+    if as_int:
+        values = tuple(math.floor(value) for value in values)
+    if values[0] > values[1]:
+        values = (values[1], values[1])
+    return values
+
+
+@pytest.mark.parametrize("difficulty_level", range(4))
+def test_lookup_matches_curves(difficulty_level):
+    """Test that the lookup tables give the values of the linear curves at every score."""
+    difficulty = Difficulty(difficulty_level)
+    setting = difficulty.difficulty_setting
+    for score in range(0, (difficulty.table.last_row + 10) * DifficultyTable.SCORE_RESOLUTION, 20):
+        difficulty.update_difficulty(score)
+        assert (difficulty.enemy_count.min, difficulty.enemy_count.max) == _formula(score, *setting.enemy_count, True)
+        assert (difficulty.enemy_word_length.min, difficulty.enemy_word_length.max) == _formula(
+            score, *setting.enemy_word_length, True
+        )
+        assert (difficulty.enemy_movement_speed.min, difficulty.enemy_movement_speed.max) == _formula(
+            score, *setting.enemy_movement_speed, False
+        )
+
+
+def test_profiles_file():
+    """Test that the difficulty levels are the profiles of the profiles file."""
+    settings = load_difficulty_settings()
+    assert list(settings) == list(Difficulty.LEVEL_NAMES)
+    assert settings["easy"].enemy_count[0] == LinearCurve(1, 1 / 2000, 4)
+    assert settings["easy"].enemy_movement_speed[0].increment == 0.1 / 3000
+    assert Difficulty(Difficulty.SWARM).difficulty_setting.spawn_depth_pixels == 600.0
+
+
+def test_piecewise_curve():
+    """Test that a piecewise curve interpolates between its points and stays constant outside them."""
+    setting = Difficulty(1).difficulty_setting
+    curve = curve_from_data(dict(points=[[100, 1], [300, 3], [500, 2]]))
+    difficulty = Difficulty(difficulty_setting=Difficulty.DifficultySetting(
+        enemy_count=(curve, PiecewiseCurve(((0, 10),))),
+        enemy_word_length=setting.enemy_word_length,
+        enemy_movement_speed=setting.enemy_movement_speed,
+        multiplier_streak=2,
+        multiplier_limit=5.0
+    ))
+    counts = {}
+    for score in (0, 100, 200, 280, 300, 400, 500, 10000):
+        difficulty.update_difficulty(score)
+        counts[score] = difficulty.enemy_count.min
+    assert counts == {0: 1, 100: 1, 200: 2, 280: 2, 300: 3, 400: 2, 500: 2, 10000: 2}
+
+
+def test_min_above_max():
+    """Test that a min curve above its max curve is capped to the max."""
+    setting = Difficulty(1).difficulty_setting
+    difficulty = Difficulty(difficulty_setting=Difficulty.DifficultySetting(
+        enemy_count=(LinearCurve(1, 1 / 100, 10), LinearCurve(2, 0, 2)),
+        enemy_word_length=setting.enemy_word_length,
+        enemy_movement_speed=setting.enemy_movement_speed,
+        multiplier_streak=2,
+        multiplier_limit=5.0
+    ))
+    difficulty.update_difficulty(500)
+    assert (difficulty.enemy_count.min, difficulty.enemy_count.max) == (2, 2)
+
+
+def test_custom_profiles(tmp_path):
+    """Test that custom profiles load from a file and survive a round trip through their data."""
+    path = tmp_path / "profiles.json"
+    path.write_text(json.dumps(dict(tuned=dict(
+        enemy_count=dict(min=dict(points=[[0, 1], [4000, 3]]), max=dict(start=2, increment="1/1000", limit=6)),
+        enemy_word_length=dict(min=dict(start=3, increment=0, limit=3), max=dict(start=5, increment=0, limit=5)),
+        enemy_movement_speed=dict(min=dict(start=0.5, increment=0, limit=0.5), max=dict(points=[[0, 1.0]])),
+        multiplier_streak=3,
+        multiplier_limit=4.0
+    ))))
+    setting = load_difficulty_settings(str(path))["tuned"]
+    assert setting.enemy_count[1] == LinearCurve(2, 0.001, 6)
+    assert Difficulty.DifficultySetting.from_data(json.loads(json.dumps(setting.to_data()))) == setting
+    difficulty = Difficulty(difficulty_setting=setting)
+    difficulty.update_difficulty(2000)
+    assert (difficulty.enemy_count.min, difficulty.enemy_count.max) == (2, 4)
+
+
+def test_invalid_curves():
+    """Test that curves which cannot be compiled are rejected."""
+    with pytest.raises(ValueError):
+        LinearCurve(1, -1 / 1000, 0)
+    with pytest.raises(ValueError):
+        PiecewiseCurve(((100, 1), (100, 2)))
+    with pytest.raises(ValueError):
+        PiecewiseCurve(())
+    setting = Difficulty(1).difficulty_setting
+    with pytest.raises(ValueError):
+        DifficultyTable(Difficulty.DifficultySetting(
+            enemy_count=(LinearCurve(1, 1e-9, 2), LinearCurve(1, 1e-9, 2)),
+            enemy_word_length=setting.enemy_word_length,
+            enemy_movement_speed=setting.enemy_movement_speed,
+            multiplier_streak=2,
+            multiplier_limit=5.0
+        ))
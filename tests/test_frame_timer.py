@@ -0,0 +1,32 @@
+import pytest
+from utils.frame_timer import FrameTimer, histogram_percentiles
+
+
+def test_histogram_percentiles():
+    """Test that percentiles are read from the cumulative counts of a histogram."""
+    histogram = [0, 50, 0, 40, 10]
+    assert histogram_percentiles(histogram, [50, 90, 99]) == [1, 3, 4]
+    assert histogram_percentiles([0, 0], [50]) == [0]
+
+
+def test_recent_frames_only():
+    """Test that the live percentiles only cover the last frames."""
+    timer = FrameTimer(window_size=10)
+    for _ in range(10):
+        timer.add(0.050)
+    for _ in range(10):
+        timer.add(0.010)
+    assert timer.recent_percentiles([50, 99]) == pytest.approx([0.010, 0.010])
+    assert len(timer) == 20
+
+
+def test_all_frames():
+    """Test that the overall percentiles cover every frame, to the microsecond."""
+    timer = FrameTimer(window_size=10)
+    for _ in range(98):
+        timer.add(0.016667)
+    timer.add(0.100)
+    timer.add(10.0)
+    assert timer.percentiles([50, 99]) == pytest.approx([0.016667, 0.100])
+    # Frames longer than the histogram are counted in its last bin
+    assert timer.percentiles([100]) == [FrameTimer.MAX_MICROSECONDS / 1_000_000]
@@ -1,7 +1,7 @@
 import pytest
 import math
 from PIL import Image
-from utils.helpers import calculate_angle_between_points, tint_image, load_image, key_mapping
+from utils.helpers import calculate_angle_between_points, segment_intersects_circle, tint_image, load_image, key_mapping
 import arcade
 
 def test_calculate_angle_between_points():
@@ -14,6 +14,19 @@ def test_calculate_angle_between_points():
     # Test another angle
     assert calculate_angle_between_points((0, 0), (-10, 10)) == pytest.approx(3 * math.pi / 4)
 
+def test_segment_intersects_circle():
+    # Segment passing through the circle
+    assert segment_intersects_circle((0, 0), (10, 0), (5, 1), 2)
+    # Fast mover jumping over the circle in one step is still caught
+    assert segment_intersects_circle((0, 0), (100, 0), (50, 0), 1)
+    # Segment ending before the circle
+    assert not segment_intersects_circle((0, 0), (10, 0), (15, 0), 2)
+    # Segment passing beside the circle
+    assert not segment_intersects_circle((0, 0), (10, 0), (5, 5), 2)
+    # Stationary point inside and outside the circle
+    assert segment_intersects_circle((1, 1), (1, 1), (0, 0), 2)
+    assert not segment_intersects_circle((3, 3), (3, 3), (0, 0), 2)
+
 def test_key_mapping():
     assert key_mapping[arcade.key.A] == "a"
     assert key_mapping[arcade.key.Z] == "z"
@@ -0,0 +1,43 @@
+import pytest
+from utils.input_log import InputEvent, InputLog, InputRecorder
+
+
+def test_round_trip():
+    """Test that a log survives serialization, including payloads and metadata."""
+    log = InputLog("typing_trainer", seed=12345, metadata=dict(words=["héllo", "world"]))
+    log.events = [
+        InputEvent(0, InputLog.START),
+        InputEvent(150_000_000, InputLog.TEXT, ord("é")),
+        InputEvent(300_000_000, InputLog.KEY_PRESS, 97, 1),
+        InputEvent(310_000_000, InputLog.TEXT_CHUNK, payload="alpha beta"),
+    ]
+    loaded = InputLog.from_bytes(log.to_bytes())
+    assert loaded.game == "typing_trainer"
+    assert loaded.seed == 12345
+    assert loaded.metadata == log.metadata
+    assert loaded.events == log.events
+
+
+def test_records_are_compact():
+    """Test that an event without payload takes a fixed, small number of bytes."""
+    log = InputLog("typing_trainer", seed=1)
+    size = len(log.to_bytes())
+    log.events.append(InputEvent(1, InputLog.TEXT, ord("a")))
+    assert len(log.to_bytes()) - size == InputLog.RECORD.size <= 20
+
+
+def test_rejects_other_files():
+    """Test that loading something that is not a log fails clearly."""
+    with pytest.raises(ValueError):
+        InputLog.from_bytes(b"not a log at all, really")
+
+
+def test_recorder_seeds_random():
+    """Test that a recorder with a given seed reproduces the random stream."""
+    import random
+    InputRecorder("space_shooter", seed=7)
+    first = [random.random() for _ in range(3)]
+    recorder = InputRecorder("space_shooter", seed=7)
+    assert [random.random() for _ in range(3)] == first
+    recorder.record(InputLog.UPDATE, code=16_667, clock_ns=5)
+    assert recorder.log.events == [InputEvent(5, InputLog.UPDATE, 16_667)]
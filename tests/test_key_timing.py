@@ -0,0 +1,121 @@
+import pytest
+import random
+import json
+import sqlite3
+import numpy as np
+from typing_trainer.key_timing import KeyTimingStats
+from typing_trainer.session_stats import SessionStats, SessionStatsList
+from utils.save_manager import SaveManager
+from utils.user_profile import UserProfile
+
+
+@pytest.fixture
+def flight_times():
+    """Fixture for random per-key flight times."""
+    rng = random.Random(42)
+    return {
+        "a": [rng.uniform(0.1, 0.3) for _ in range(200)],
+        "b": [rng.uniform(0.2, 0.6) for _ in range(150)],
+    }
+
+
+def test_add_matches_numpy(flight_times):
+    """Test that the Welford moments match a batch computation."""
+    stats = KeyTimingStats()
+    for key, times in flight_times.items():
+        for t in times:
+            stats.add(key, t)
+    for key, times in flight_times.items():
+        row = stats.key_index[key]
+        assert stats.count[row] == len(times)
+        assert stats.mean[row] == pytest.approx(np.mean(times))
+        assert stats.variance()[row] == pytest.approx(np.var(times, ddof=1))
+
+
+def test_add_batch_matches_add(flight_times):
+    """Test that adding keystrokes in batches equals adding them one by one."""
+    keys = [key for key, times in flight_times.items() for _ in times]
+    values = [t for times in flight_times.values() for t in times]
+    random.Random(0).shuffle(keys)
+    single, batched = KeyTimingStats(), KeyTimingStats()
+    for key, value in zip(keys, values):
+        single.add(key, value)
+    batched.add_batch(keys[:100], np.array(values[:100]))
+    batched.add_batch(keys[100:], np.array(values[100:]))
+    for key in single.keys:
+        row, batched_row = single.key_index[key], batched.key_index[key]
+        assert batched.count[batched_row] == single.count[row]
+        assert batched.mean[batched_row] == pytest.approx(single.mean[row])
+        assert batched.m2[batched_row] == pytest.approx(single.m2[row])
+        assert (batched.histogram[batched_row] == single.histogram[row]).all()
+
+
+def test_merge_is_exact(flight_times):
+    """Test that merging split accumulators equals accumulating everything at once."""
+    first = KeyTimingStats.from_char_times({k: v[:50] for k, v in flight_times.items()})
+    second = KeyTimingStats.from_char_times({"a": flight_times["a"][50:]})
+    third = KeyTimingStats.from_char_times({"b": flight_times["b"][50:], "c": [1.0]})
+    merged = KeyTimingStats.merge_all([first, second, third])
+    expected = KeyTimingStats.from_char_times({**flight_times, "c": [1.0]})
+    for key in expected.keys:
+        row, expected_row = merged.key_index[key], expected.key_index[key]
+        assert merged.count[row] == expected.count[expected_row]
+        assert merged.mean[row] == pytest.approx(expected.mean[expected_row])
+        assert merged.m2[row] == pytest.approx(expected.m2[expected_row])
+        assert (merged.histogram[row] == expected.histogram[expected_row]).all()
+
+
+def test_quantiles_are_close(flight_times):
+    """Test that the sketch quantiles stay within one bucket of the exact values."""
+    stats = KeyTimingStats.from_char_times(flight_times)
+    bucket_ratio = KeyTimingStats.BUCKET_EDGES[1] / KeyTimingStats.BUCKET_EDGES[0]
+    estimates = stats.quantiles([0.5, 0.9, 0.99])
+    for key, times in flight_times.items():
+        exact = np.quantile(times, [0.5, 0.9, 0.99])
+        for estimate, value in zip(estimates[stats.key_index[key]], exact):
+            assert value / bucket_ratio <= estimate <= value * bucket_ratio
+
+
+def test_dict_round_trip(flight_times):
+    """Test serialization to and from a dict."""
+    stats = KeyTimingStats.from_char_times(flight_times)
+    restored = KeyTimingStats.from_dict(stats.to_dict())
+    assert restored.keys == stats.keys
+    assert (restored.histogram == stats.histogram).all()
+    assert restored.mean == pytest.approx(stats.mean)
+
+
+def test_aggregate_char_metrics_uses_accumulators(flight_times):
+    """Test that the aggregated metrics are computed from the merged accumulators."""
+    session_stats_list = SessionStatsList()
+    for times in (flight_times["a"][:100], flight_times["a"][100:]):
+        stats = SessionStats()
+        stats.char_confusion_matrix.add("a", "a", len(times))
+        for t in times:
+            stats.char_timing.add("a", t)
+        session_stats_list.append(stats)
+    metrics_df = session_stats_list.compute_aggregate_char_metrics()
+    assert metrics_df.loc["a", "count_total"] == 200
+    assert metrics_df.loc["a", "mean_flight_time"] == pytest.approx(np.mean(flight_times["a"]))
+    assert metrics_df.loc["a", "p50_flight_time"] < metrics_df.loc["a", "p99_flight_time"]
+
+
+def test_saved_sessions_store_only_accumulators(tmp_path, monkeypatch, flight_times):
+    """Test that new rows keep no raw flight times, and that legacy rows are rebuilt from them."""
+    monkeypatch.setattr(SaveManager, "SAVE_FOLDER", str(tmp_path))
+    save_manager = SaveManager(UserProfile("timing", "Timing"))
+    stats = SessionStats(chars_typed_total=200, chars_typed_correctly=200, duration_seconds=60.0)
+    stats.char_confusion_matrix.add("a", "a", 200)
+    for t in flight_times["a"]:
+        stats.char_timing.add("a", t)
+    save_manager.save_session_stats_to_db(stats)
+    with sqlite3.connect(save_manager.file_path) as conn:
+        assert conn.execute("SELECT char_times FROM trainer_session_stats").fetchone()[0] is None
+        conn.execute(
+            "INSERT INTO trainer_session_stats (session_start_time, char_confusion_matrix, char_times, "
+            "word_mistype_counts, chars_typed_total) VALUES ('2000-01-01 00:00:00', '{}', ?, '{}', 150)",
+            (json.dumps({"b": flight_times["b"]}),)
+        )
+    legacy, saved = save_manager.get_all_session_stats()
+    assert saved.char_timing.count[saved.char_timing.key_index["a"]] == 200
+    assert legacy.char_timing.mean[legacy.char_timing.key_index["b"]] == pytest.approx(np.mean(flight_times["b"]))
@@ -0,0 +1,85 @@
+import pytest
+from typing_trainer.keystroke_timer import KeystrokeTimer
+
+
+class FakeClock:
+    """A manually advanced nanosecond clock."""
+
+    def __init__(self) -> None:
+        self.now = 1_000_000_000
+
+    def __call__(self) -> int:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += int(seconds * 1_000_000_000)
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def timer(clock):
+    timer = KeystrokeTimer(clock=clock)
+    timer.start()
+    return timer
+
+
+def test_flight_times(timer, clock):
+    """Test flight times between consecutive keystrokes."""
+    first = timer.record()
+    clock.advance(0.25)
+    second = timer.record()
+    assert timer.flight_time(first) is None
+    assert timer.flight_time(second) == pytest.approx(0.25)
+
+
+def test_records_every_keystroke(timer, clock):
+    """Test that the buffer keeps every keystroke of the segment."""
+    for _ in range(10):
+        clock.advance(0.1)
+        timer.record()
+    assert timer.count == 10
+    assert timer.flight_times() == pytest.approx([0.1] * 9)
+
+
+def test_pause_is_excluded(timer, clock):
+    """Test that paused intervals are excluded from flight times and elapsed time."""
+    clock.advance(1.0)
+    timer.record()
+    clock.advance(0.5)
+    timer.pause()
+    clock.advance(30.0)
+    assert timer.elapsed_seconds() == pytest.approx(1.5)
+    timer.resume()
+    clock.advance(0.2)
+    index = timer.record()
+    assert timer.flight_time(index) == pytest.approx(0.7)
+    assert timer.elapsed_seconds() == pytest.approx(1.7)
+    assert timer.pause_intervals == [(clock.now - int(0.2e9) - int(30e9), clock.now - int(0.2e9))]
+
+
+def test_explicit_timestamps(clock):
+    """Test recording externally supplied timestamps."""
+    timer = KeystrokeTimer(clock=clock)
+    timer.start(clock_ns=0)
+    timer.record(clock_ns=100_000_000)
+    timer.record(clock_ns=350_000_000)
+    assert timer.last_keystroke_seconds() == pytest.approx(0.35)
+    assert timer.flight_time(1) == pytest.approx(0.25)
+
+
+def test_flush_keeps_last_keystroke(timer, clock):
+    """Test that flushing starts a new segment at the latest keystroke."""
+    for _ in range(5):
+        clock.advance(0.1)
+        timer.record()
+    timer.flush()
+    assert timer.count == 1
+    assert timer.elapsed_seconds() == pytest.approx(0.0)
+    clock.advance(0.3)
+    index = timer.record()
+    assert timer.flight_time(index) == pytest.approx(0.3)
+    assert timer.last_keystroke_seconds() == pytest.approx(0.3)
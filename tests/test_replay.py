@@ -0,0 +1,80 @@
+import itertools
+import random
+import pytest
+from types import SimpleNamespace
+from utils.input_log import InputLog, InputRecorder
+from utils.replay import replay, compare_results
+from typing_trainer.trainer_engine import TrainerEngine
+from typing_trainer.trainer_views import TypingTrainerView
+
+
+def _record_session(engine, rng, keystrokes):
+    """Types with random mistakes, backspaces and a pause, returning the clock."""
+    clock_ns = 1_000_000_000
+    engine.start(clock_ns=clock_ns)
+    for i in range(keystrokes):
+        clock_ns += rng.randint(50_000_000, 400_000_000)
+        if i == keystrokes // 2:
+            engine.pause(clock_ns=clock_ns)
+            clock_ns += 10_000_000_000
+            engine.resume(clock_ns=clock_ns)
+        if rng.random() < 0.05:
+            engine.backspace(clock_ns=clock_ns)
+        elif rng.random() < 0.1:
+            engine.type_char("x", clock_ns=clock_ns)
+        elif not engine.completed:
+            engine.type_char(engine.expected_char(engine.position), clock_ns=clock_ns)
+
+
+@pytest.fixture
+def rng():
+    return random.Random(11)
+
+
+def test_replay_matches_recording(rng):
+    """Test that a recorded session replays to identical stats."""
+    recorder = InputRecorder("typing_trainer", seed=3)
+    engine = TrainerEngine(["quick", "brown", "fox", "jumps"] * 5, recorder=recorder)
+    _record_session(engine, rng, 150)
+    recorder.log.metadata["results"] = engine.recording_results()
+    log = InputLog.from_bytes(recorder.log.to_bytes())
+    assert compare_results(log.metadata["results"], replay(log)) == []
+
+
+def test_replay_endless_session(rng):
+    """Test that an endless session replays its streamed chunks and segments."""
+    words = itertools.cycle(["alpha", "beta", "gamma", "delta", "epsilon"])
+    chunks = iter(lambda: [next(words) for _ in range(10)], None)
+    recorder = InputRecorder("typing_trainer", seed=5)
+    engine = TrainerEngine(next(chunks), word_chunks=chunks, recorder=recorder)
+    _record_session(engine, rng, 3000)
+    results = engine.recording_results()
+    assert len(results["segments"]) > 2
+    recorder.log.metadata["results"] = results
+    log = InputLog.from_bytes(recorder.log.to_bytes())
+    assert compare_results(log.metadata["results"], replay(log)) == []
+
+
+def test_detects_mismatch(rng):
+    """Test that a replay that diverges from the recording is reported."""
+    recorder = InputRecorder("typing_trainer", seed=3)
+    engine = TrainerEngine(["quick", "brown", "fox"], recorder=recorder)
+    _record_session(engine, rng, 10)
+    results = engine.recording_results()
+    results["segments"][0]["chars_typed_total"] += 1
+    differences = compare_results(results, replay(recorder.log))
+    assert differences == ["segments[0].chars_typed_total"]
+
+
+def test_composed_text_is_recorded_per_character():
+    """Test that text input delivering several characters at once is recorded and replayed."""
+    recorder = InputRecorder("typing_trainer", seed=3)
+    engine = TrainerEngine(["quick", "fox"], recorder=recorder)
+    view = SimpleNamespace(engine=engine)
+    engine.start(clock_ns=0)
+    for text in ("qu", "ick f", "ox\r"):
+        TypingTrainerView.on_text(view, text)  # type: ignore[arg-type]
+    assert engine.completed
+    recorder.log.metadata["results"] = engine.recording_results()
+    log = InputLog.from_bytes(recorder.log.to_bytes())
+    assert compare_results(log.metadata["results"], replay(log)) == []
@@ -0,0 +1,77 @@
+import random
+import pytest
+from utils.word_manager import WordManager
+from typing_trainer.retargeting import AdaptiveRetargeter
+from typing_trainer.session_stats import SessionStats
+
+
+@pytest.fixture
+def word_manager(tmp_path):
+    """Fixture for a word manager over a small word file."""
+    word_file = tmp_path / "words.txt"
+    word_file.write_text("quiz quest squad plain train brain grain stain")
+    return WordManager(file_path=str(word_file))
+
+
+def _make_retargeter(word_manager, seed=None):
+    """Creates a retargeter with a small pool."""
+    retargeter = AdaptiveRetargeter(
+        word_manager,
+        initial_pool=["plain"],
+        stored_word_mistype_counts={},
+        bigram_weights=None,
+        min_character_count=4,
+        max_character_count=5,
+        seed=seed
+    )
+    retargeter.POOL_SIZE = 3
+    return retargeter
+
+
+@pytest.fixture
+def retargeter(word_manager):
+    retargeter = _make_retargeter(word_manager)
+    yield retargeter
+    retargeter.shutdown()
+
+
+def test_retarget_uses_live_stats(retargeter):
+    """Test that a rebuilt pool targets the characters mistyped in the live session."""
+    live_stats = SessionStats()
+    for char in "plaintrbgsu":
+        live_stats.char_confusion_matrix.add(char, char, 60)
+    live_stats.char_confusion_matrix.add("q", "w", 60)
+    assert retargeter.candidates() == ["plain"]
+    assert retargeter.request_retarget(live_stats)
+    retargeter.pending.result()
+    assert retargeter.retarget_count == 1
+    assert all("q" in word for word in retargeter.candidates())
+
+
+def test_snapshot_is_independent(retargeter):
+    """Test that the worker gets a copy of the live stats."""
+    live_stats = SessionStats()
+    live_stats.char_confusion_matrix.add("a", "a")
+    live_stats.char_timing.add("a", 0.2)
+    snapshot = retargeter._snapshot(live_stats)
+    live_stats.char_confusion_matrix.add("a", "a")
+    live_stats.char_timing.add("a", 0.2)
+    assert snapshot.char_confusion_matrix.get("a", "a") == 1
+    assert snapshot.char_timing.count[0] == 1
+
+
+def test_seeded_retargeting_is_reproducible(word_manager):
+    """Test that the worker draws from its own seeded generator, not the global one."""
+    live_stats = SessionStats()
+    for char in "plaintrbgsuq":
+        live_stats.char_confusion_matrix.add(char, char, 60)
+    pools = []
+    for _ in range(2):
+        retargeter = _make_retargeter(word_manager, seed=3)
+        global_state = random.getstate()
+        retargeter.request_retarget(live_stats)
+        retargeter.pending.result()
+        retargeter.shutdown()
+        assert random.getstate() == global_state
+        pools.append(retargeter.candidates())
+    assert pools[0] == pools[1]
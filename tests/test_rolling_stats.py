@@ -0,0 +1,83 @@
+import pytest
+import random
+import string
+from datetime import datetime, timedelta
+from typing_trainer.session_stats import SessionStats, SessionStatsList
+from typing_trainer.rolling_stats import RollingWindowStore, WindowDefinition
+
+
+@pytest.fixture
+def sessions():
+    """Fixture for 30 daily sessions with random typing data."""
+    rng = random.Random(3)
+    start = datetime(2025, 1, 1)
+    sessions = []
+    for day in range(30):
+        stats = SessionStats(session_start_time=start + timedelta(days=day))
+        for _ in range(rng.randint(50, 150)):
+            char = rng.choice(string.ascii_lowercase)
+            typed_char = char if rng.random() < 0.9 else rng.choice(string.ascii_lowercase)
+            stats.char_confusion_matrix.add(char, typed_char)
+            stats.char_timing.add(char, rng.uniform(0.05, 0.5))
+            stats.chars_typed_total += 1
+        sessions.append(stats)
+    return sessions
+
+
+@pytest.fixture
+def store():
+    """Fixture for a store with session, age and keystroke windows."""
+    return RollingWindowStore((
+        WindowDefinition("sessions", max_sessions=5),
+        WindowDefinition("days", max_age=timedelta(days=7)),
+        WindowDefinition("keystrokes", max_keystrokes=500),
+    ))
+
+
+def _assert_matches(store, window_name, expected_sessions, now):
+    """Compare a window against a full recomputation over the expected sessions."""
+    metrics = store.compute_aggregate_char_metrics(window_name, now=now)
+    expected = SessionStatsList(expected_sessions).compute_aggregate_char_metrics()
+    assert set(metrics.index) == set(expected.index)
+    for char in expected.index:
+        assert metrics.loc[char, "count_total"] == expected.loc[char, "count_total"]
+        assert metrics.loc[char, "count_correct"] == expected.loc[char, "count_correct"]
+        assert metrics.loc[char, "mean_flight_time"] == pytest.approx(expected.loc[char, "mean_flight_time"])
+        assert metrics.loc[char, "p90_flight_time"] == pytest.approx(expected.loc[char, "p90_flight_time"])
+
+
+def test_session_count_window(store, sessions):
+    """Test that the session window keeps only the most recent sessions."""
+    for stats in sessions:
+        store.add(stats)
+    now = sessions[-1].session_start_time
+    _assert_matches(store, "sessions", sessions[-5:], now)
+
+
+def test_age_window(store, sessions):
+    """Test that the age window expires old sessions, including at query time."""
+    for stats in sessions:
+        store.add(stats)
+    now = sessions[-1].session_start_time
+    _assert_matches(store, "days", sessions[-8:], now)
+    _assert_matches(store, "days", sessions[-6:], now + timedelta(days=2))
+
+
+def test_keystroke_window(store, sessions):
+    """Test that the keystroke window keeps just enough sessions to cover the limit."""
+    for stats in sessions:
+        store.add(stats)
+    expected, keystrokes = [], 0
+    for stats in reversed(sessions):
+        expected.insert(0, stats)
+        keystrokes += stats.chars_typed_total
+        if keystrokes >= 500:
+            break
+    _assert_matches(store, "keystrokes", expected, sessions[-1].session_start_time)
+
+
+def test_history_is_sufficient(store):
+    """Test the early-stop check used when loading history."""
+    now = datetime.now()
+    assert not store.history_is_sufficient(5, 400, now - timedelta(days=1))
+    assert store.history_is_sufficient(5, 500, now - timedelta(days=8))
@@ -0,0 +1,64 @@
+import pytest
+import random
+import string
+import numpy as np
+from collections import defaultdict
+from typing_trainer.session_stats import SessionStats, SessionStatsList, CHAR_METRICS_DTYPE
+
+
+@pytest.fixture
+def session_stats_list():
+    """Fixture for a list of randomly generated sessions."""
+    rng = random.Random(7)
+    stats_list = SessionStatsList()
+    for _ in range(20):
+        stats = SessionStats()
+        for _ in range(100):
+            char = rng.choice(string.ascii_lowercase)
+            typed_char = char if rng.random() < 0.9 else rng.choice(string.ascii_lowercase)
+            stats.char_confusion_matrix.add(char, typed_char)
+            stats.char_timing.add(char, rng.uniform(0.05, 0.5))
+        stats_list.append(stats)
+    return stats_list
+
+
+def test_char_metrics_array_matches_confusion_matrix(session_stats_list):
+    """Test the vectorized aggregation against the confusion counts summed per session."""
+    metrics = session_stats_list.compute_char_metrics_array()
+    assert metrics.dtype == CHAR_METRICS_DTYPE
+    confusion_matrix = defaultdict(lambda: defaultdict(int))
+    for stats in session_stats_list:
+        for char, counts in stats.char_confusion_matrix.to_dict().items():
+            for typed_char, count in counts.items():
+                confusion_matrix[char][typed_char] += count
+    assert set(metrics["char"]) == set(confusion_matrix.keys())
+    for row in metrics:
+        counts = confusion_matrix[row["char"]]
+        assert row["count_total"] == sum(counts.values())
+        assert row["count_correct"] == counts[row["char"]]
+        assert row["accuracy"] == pytest.approx(counts[row["char"]] / sum(counts.values()))
+
+
+def test_char_metrics_array_timing(session_stats_list):
+    """Test that the timing columns match the merged accumulators."""
+    metrics = session_stats_list.compute_char_metrics_array()
+    char_timing = session_stats_list.merge_char_timing()
+    for row in metrics:
+        mean = char_timing.mean[char_timing.key_index[row["char"]]]
+        assert row["mean_flight_time"] == pytest.approx(mean)
+        assert row["char_wpm"] == pytest.approx(12 / mean)
+
+
+def test_char_without_timing_gets_default():
+    """Test that characters without timing data get the default flight time."""
+    stats = SessionStats()
+    stats.char_confusion_matrix.add("x", "y")
+    metrics = SessionStatsList([stats]).compute_char_metrics_array()
+    assert metrics[0]["mean_flight_time"] == 10.0
+    assert np.isnan(metrics[0]["p50_flight_time"])
+
+
+def test_empty_list_returns_empty_dataframe():
+    """Test aggregation on an empty list."""
+    metrics_df = SessionStatsList().compute_aggregate_char_metrics()
+    assert metrics_df.shape[0] == 0
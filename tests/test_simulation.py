@@ -0,0 +1,91 @@
+import arcade
+import pytest
+from utils.helpers import key_mapping
+from utils.input_log import InputLog, InputRecorder
+from utils.replay import replay, compare_results
+from space_shooter.simulation import SpaceShooterSimulation
+from space_shooter.difficulty import Difficulty
+
+SYMBOLS = {char: symbol for symbol, char in key_mapping.items()}
+# The sprites' hit boxes depend on their textures
+pytestmark = pytest.mark.usefixtures("real_textures")
+
+
+def _play(simulation, frame_us, frames, recorder=None):
+    """Types the word of the closest enemy every 20 frames, recording the input."""
+    for frame in range(frames):
+        if recorder is not None:
+            recorder.record(InputLog.UPDATE, code=frame_us[frame % len(frame_us)])
+        simulation.advance(frame_us[frame % len(frame_us)])
+        if frame % 20 == 0 and len(simulation.enemy_word_list):
+            target = min(simulation.enemy_word_list, key=lambda enemy_word: enemy_word.center_x)
+            typed = target.word[:3] + "q" if frame % 60 == 0 else target.word
+            for char in typed:
+                if recorder is not None:
+                    recorder.record(InputLog.KEY_PRESS, code=SYMBOLS[char])
+                simulation.type_key(char)
+
+
+def _state(simulation):
+    """The positions of the enemies and the results of a simulation."""
+    return [(enemy_word.word, enemy_word.position) for enemy_word in simulation.enemy_word_list], simulation.get_results()
+
+
+@pytest.fixture
+def simulation():
+    """Fixture for a moderate game."""
+    return SpaceShooterSimulation(1280, 720, difficulty_level=1, seed=42)
+
+
+def test_same_seed_same_game(simulation):
+    """Test that two games with the same seed and input are identical."""
+    _play(simulation, [16_667], 3000)
+    other = SpaceShooterSimulation(1280, 720, difficulty_level=1, seed=42)
+    _play(other, [16_667], 3000)
+    assert _state(simulation) == _state(other)
+    assert simulation.game_stats.score > 0
+
+
+def test_frame_rate_independence():
+    """Test that the game advances by the same steps whatever the frame times."""
+    fast = SpaceShooterSimulation(1280, 720, seed=3)
+    slow = SpaceShooterSimulation(1280, 720, seed=3)
+    for _ in range(240):
+        fast.advance(6_944)
+    for _ in range(50):
+        slow.advance(33_333)
+    # 1.666 s at 144 fps and at 30 fps
+    assert fast.step_count == slow.step_count == 99
+    assert _state(fast) == _state(slow)
+
+
+def test_alpha_interpolates_positions(simulation):
+    """Test that sprites are displayed between their last two positions, and restored after."""
+    simulation.advance(16_667 * 10 + 8_333)
+    assert simulation.alpha == pytest.approx(0.5, abs=0.001)
+    enemy_word = simulation.enemy_word_list[0]
+    position = enemy_word.position
+    previous_x = enemy_word.previous_position[0]
+    with simulation.interpolated():
+        assert enemy_word.center_x == pytest.approx((previous_x + position[0]) / 2, abs=0.01)
+    assert enemy_word.position == position
+
+
+def test_replay_matches_recording():
+    """Test that a recorded game replays to identical results."""
+    recorder = InputRecorder("space_shooter", metadata=dict(difficulty_level=2, width=1280, height=720), seed=9)
+    simulation = SpaceShooterSimulation(1280, 720, difficulty_level=2, seed=recorder.log.seed)
+    _play(simulation, [16_000, 17_500, 15_200, 40_000], 4000, recorder)
+    recorder.record(InputLog.KEY_PRESS, code=arcade.key.ESCAPE)
+    recorder.log.metadata["results"] = simulation.get_results()
+    log = InputLog.from_bytes(recorder.log.to_bytes())
+    assert compare_results(log.metadata["results"], replay(log)) == []
+
+
+def test_swarm_spawns_spread_out():
+    """Test that the swarm mode spawns hundreds of meteors, spread around the spawn points and behind the edge."""
+    simulation = SpaceShooterSimulation(1280, 720, difficulty_level=Difficulty.SWARM, seed=4)
+    assert len(simulation.enemy_word_list) >= 300
+    positions = {(round(enemy_word.center_x), round(enemy_word.center_y)) for enemy_word in simulation.enemy_word_list}
+    assert len(positions) == len(simulation.enemy_word_list)
+    assert max(enemy_word.center_x for enemy_word in simulation.enemy_word_list) > 1280 + 100
@@ -0,0 +1,107 @@
+import pytest
+from utils.sound_manager import SoundManager, SoundPool
+
+
+class FakeVoice:
+    """A voice that plays until stopped by the test."""
+
+    def __init__(self, source) -> None:
+        self.source = source
+        self.playing = False
+        self.volume = 1.0
+        self.pitch = 1.0
+        self.starts = 0
+
+    def play(self) -> None:
+        self.playing = True
+        self.starts += 1
+
+    def pause(self) -> None:
+        self.playing = False
+
+    def seek(self, time: float) -> None:
+        pass
+
+    def delete(self) -> None:
+        pass
+
+
+class FakeClock:
+    """A manually advanced clock."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def _pool(clock, voice_count=3, steal=True):
+    return SoundPool("source", voice_count, steal=steal, voice_factory=FakeVoice, clock=clock)
+
+
+def test_voices_are_reused(clock):
+    """Test that plays reuse the preallocated voices once they are free."""
+    pool = _pool(clock)
+    for _ in range(10):
+        clock.now += 1.0
+        assert pool.play()
+        pool.voices[0].playing = False
+    assert pool.voices[0].starts == 10
+    assert pool.plays == 10
+    assert pool.voices_in_use() == 0
+
+
+def test_voice_stealing(clock):
+    """Test that the oldest voice is restarted when all are busy."""
+    pool = _pool(clock)
+    for _ in range(4):
+        clock.now += 1.0
+        assert pool.play(volume=0.5)
+    assert pool.voices_in_use() == 3
+    assert pool.stolen == 1
+    assert pool.voices[0].starts == 2
+
+
+def test_drops_without_stealing(clock):
+    """Test that plays are dropped when stealing is disabled and all voices are busy."""
+    pool = _pool(clock, voice_count=1, steal=False)
+    assert pool.play()
+    clock.now += 1.0
+    assert not pool.play()
+    assert pool.dropped == 1
+
+
+def test_bursts_are_coalesced(clock):
+    """Test that plays within one frame merge into one, keeping the loudest volume."""
+    pool = _pool(clock)
+    assert pool.play(volume=0.3)
+    clock.now += 0.005
+    assert not pool.play(volume=0.8)
+    assert pool.coalesced == 1
+    assert pool.voices_in_use() == 1
+    assert pool.voices[0].volume == 0.8
+
+
+def test_manager_counters(monkeypatch):
+    """Test that the manager allocates pools per sound and aggregates counters."""
+    monkeypatch.setattr(SoundManager, "voice_factory", FakeVoice)
+    monkeypatch.setattr(SoundManager, "_pools", {})
+    monkeypatch.setattr(SoundManager, "_settings", {})
+
+    class Sound:
+        source = "source"
+
+    first_sound, second_sound = Sound(), Sound()
+    SoundManager.configure(first_sound, voice_count=2)
+    SoundManager.play_sound(first_sound)
+    SoundManager.play_sound(second_sound)
+    counters = SoundManager.get_counters()
+    assert counters["voices"] == 2 + SoundManager.DEFAULT_VOICE_COUNT
+    assert counters["voices_in_use"] == 2
+    assert counters["plays"] == 2
@@ -0,0 +1,92 @@
+import random
+import arcade
+import pytest
+from space_shooter.enemies import EnemyWord
+from space_shooter.sprite_pool import PooledSprite, SpritePool
+
+
+class Block(PooledSprite):
+    """A pooled sprite that counts its initializations."""
+
+    initializations = 0
+
+    def __init__(self, x: float) -> None:
+        super().__init__(arcade.make_soft_square_texture(8, arcade.color.WHITE))
+        Block.initializations += 1
+        self.reset(x)
+
+    def reset(self, x: float) -> None:
+        self.center_x = x
+        self.change_x = 1.0
+
+
+@pytest.fixture
+def pool():
+    """Fixture for an empty pool of blocks."""
+    Block.initializations = 0
+    return SpritePool(Block)
+
+
+def test_released_sprites_are_reused(pool):
+    """Test that a sprite removed from its lists is reset and handed out again."""
+    sprite_list = arcade.SpriteList()
+    block = pool.acquire(10)
+    sprite_list.append(block)
+    block.remove_from_sprite_lists()
+    assert len(pool) == 1
+    reused = pool.acquire(42)
+    assert reused is block
+    assert reused.center_x == 42
+    assert not reused.is_released
+    assert pool.get_counters() == dict(allocated=1, reused=1, released=1, free=0)
+
+
+def test_double_release_is_ignored(pool):
+    """Test that releasing a sprite twice does not hand it out twice."""
+    block = pool.acquire(0)
+    block.remove_from_sprite_lists()
+    block.remove_from_sprite_lists()
+    assert len(pool) == 1
+    assert pool.acquire(1) is not pool.acquire(2)
+
+
+def test_steady_state_allocates_nothing(pool):
+    """Test that once the pool has grown, spawning and destroying sprites creates no sprite."""
+    sprite_list = arcade.SpriteList()
+    for frame in range(600):
+        # Destroy the sprites that moved off a 100 pixel wide screen, then spawn
+        for block in list(sprite_list):
+            if block.center_x > 100:
+                block.remove_from_sprite_lists()
+        if frame % 10 == 0:
+            sprite_list.append(pool.acquire(0))
+        sprite_list.update()
+        if frame == 300:
+            allocated = pool.allocated
+    assert pool.allocated == allocated
+    assert Block.initializations == allocated
+    assert pool.reused > 0
+
+
+class PickTexture(random.Random):
+    """A random generator whose choices are the option at a fixed index."""
+
+    def __init__(self, index: int) -> None:
+        super().__init__(0)
+        self.index = index
+
+    def choice(self, options):
+        return options[self.index]
+
+
+def test_reused_enemy_hit_box_follows_texture(real_textures):
+    """Test that an enemy reused with a different meteor texture gets that texture's hit box."""
+    pool = SpritePool(EnemyWord)
+    enemy = pool.acquire("first", (0.0, 0.0), (100.0, 0.0), [1.0, 1.0], rng=PickTexture(0))
+    enemy.remove_from_sprite_lists()
+    reused = pool.acquire("second", (0.0, 0.0), (100.0, 0.0), [1.0, 1.0], rng=PickTexture(2))
+    assert reused is enemy
+    texture = EnemyWord.METEOR_SPRITE_OPTIONS[2].get()
+    assert texture is not EnemyWord.METEOR_SPRITE_OPTIONS[0].get()
+    assert reused.texture is texture
+    assert reused.hit_box.points == texture.hit_box_points
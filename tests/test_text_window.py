@@ -0,0 +1,112 @@
+import pytest
+from pyglet.text.document import FormattedDocument
+from typing_trainer.text_window import TextWindow, GlyphAdvanceTable
+
+COLORS = {
+    TextWindow.UNMATCHED: (0, 0, 0, 255),
+    TextWindow.CORRECT: (0, 255, 0, 255),
+    TextWindow.INCORRECT: (255, 0, 0, 255),
+}
+
+
+@pytest.fixture
+def text():
+    return " ".join(["word"] * 500)
+
+
+@pytest.fixture
+def text_window(text):
+    window = TextWindow(
+        document=FormattedDocument(),
+        layout=None,
+        text=text,
+        base_attributes=dict(font_size=12),
+        state_colors=COLORS
+    )
+    window.move_caret(0)
+    return window
+
+
+def _color_at(text_window, position):
+    return text_window.document.get_style("color", position - text_window.start)
+
+
+def test_document_holds_only_the_window(text_window, text):
+    """Test that the document never holds more than the window around the caret."""
+    max_size = 2 * (TextWindow.MARGIN + TextWindow.SHIFT)
+    for position in range(len(text)):
+        text_window.set_char(position, TextWindow.CORRECT)
+        text_window.move_caret(position + 1)
+        assert len(text_window.document.text) <= max_size
+        assert text_window.start <= text_window.position <= text_window.end
+        assert text_window.document.text == text[text_window.start:text_window.end]
+
+
+def test_rebuilds_are_amortized(text_window, text):
+    """Test that the document is only rebuilt once every SHIFT characters."""
+    rebuilds = sum(text_window.move_caret(position) for position in range(len(text)))
+    assert rebuilds <= len(text) // TextWindow.SHIFT + 1
+
+
+def test_states_survive_window_shifts(text_window, text):
+    """Test that incorrect characters and colors are restored after a shift."""
+    text_window.set_char(0, TextWindow.CORRECT)
+    text_window.set_char(1, TextWindow.INCORRECT, "x")
+    text_window.move_caret(1000)
+    assert text_window.start > 1
+    text_window.move_caret(2)
+    assert text_window.document.text[1 - text_window.start] == "x"
+    assert _color_at(text_window, 0) == COLORS[TextWindow.CORRECT]
+    assert _color_at(text_window, 1) == COLORS[TextWindow.INCORRECT]
+    assert _color_at(text_window, 2) == COLORS[TextWindow.UNMATCHED]
+
+
+def test_reset_restores_original_char(text_window, text):
+    """Test that resetting a character (backspace) restores the expected text."""
+    text_window.set_char(3, TextWindow.INCORRECT, "z")
+    text_window.set_char(3, TextWindow.UNMATCHED)
+    assert text_window.document.text[3] == text[3]
+    assert 3 not in text_window.display_chars
+
+
+def test_caret_x_matches_prefix_sums(text):
+    """Test that caret x-positions stay consistent across edits and window shifts."""
+    advances = {"w": 10.0, "o": 8.0, "r": 6.0, "d": 9.0, " ": 5.0, "x": 20.0}
+    text_window = TextWindow(
+        document=FormattedDocument(),
+        layout=None,
+        text=text,
+        base_attributes=dict(font_size=12),
+        state_colors=COLORS,
+        advance_table=GlyphAdvanceTable(lambda char: advances[char])
+    )
+    text_window.move_caret(0)
+    text_window.set_char(5, TextWindow.INCORRECT, "x")
+    for position in list(range(0, 800, 7)) + list(range(800, 0, -13)):
+        text_window.move_caret(position)
+        displayed = text[:5] + "x" + text[6:position]
+        assert text_window.caret_x == pytest.approx(sum(advances[c] for c in displayed[:position]))
+
+
+def test_append_and_trim(text_window, text):
+    """Test that appended text is reachable and trimmed text keeps positions absolute."""
+    text_window.append_text(" more words")
+    assert text_window.length == len(text) + 11
+    text_window.set_char(1000, TextWindow.INCORRECT, "q")
+    text_window.move_caret(1200)
+    text_window.trim(1100)
+    assert text_window.base == 1100
+    assert text_window.expected_char(1100) == text[1100]
+    assert 1000 not in text_window.display_chars
+    text_window.move_caret(text_window.length)
+    assert text_window.document.text.endswith("more words")
+    text_window.move_caret(1100)
+    assert text_window.start == 1100
+    assert text_window.document.text.startswith(text[1100:1110])
+
+
+def test_trim_never_cuts_into_the_window(text_window):
+    """Test that trimming stops at the start of the window."""
+    text_window.move_caret(500)
+    text_window.trim(text_window.position)
+    assert text_window.base == text_window.start < text_window.position
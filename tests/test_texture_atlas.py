@@ -0,0 +1,56 @@
+import pytest
+from PIL import Image, ImageDraw
+from utils.texture_atlas import AnimationAtlas, centered_trim_box, displayed_frame_indices
+
+
+@pytest.fixture
+def sheet():
+    """Fixture for a 4x2 spritesheet of 64x64 frames, each a growing centered square."""
+    sheet = Image.new("RGBA", (256, 128), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(sheet)
+    for index in range(8):
+        row, column = divmod(index, 4)
+        half = 4 + index * 2
+        center_x, center_y = column * 64 + 32, row * 64 + 32
+        draw.rectangle(
+            (center_x - half, center_y - half, center_x + half - 1, center_y + half - 1),
+            fill=(255, index * 30, 0, 255)
+        )
+    return sheet
+
+
+def test_displayed_frame_indices():
+    """Test that the displayed frames match the frames indexed during playback."""
+    assert displayed_frame_indices(160, 36)[:4] == [0, 4, 8, 13]
+    assert len(displayed_frame_indices(160, 36)) == 36
+    assert displayed_frame_indices(8, 8) == list(range(8))
+    # Playback at 60 fps indexes int(count * t / duration) for t = k / 60
+    assert displayed_frame_indices(160, 36) == [int(160 * (k / 60) / 0.6) for k in range(36)]
+
+
+def test_centered_trim_box_is_symmetric():
+    """Test that the trim box is centered on the frame, around all opaque pixels."""
+    frame = Image.new("RGBA", (64, 64), (0, 0, 0, 0))
+    frame.putpixel((40, 30), (255, 0, 0, 255))
+    empty = Image.new("RGBA", (64, 64), (0, 0, 0, 0))
+    assert centered_trim_box([frame, empty]) == (23, 30, 41, 34)
+
+
+def test_build_atlas(sheet):
+    """Test that the atlas packs the trimmed and downsampled frames in a grid."""
+    image = AnimationAtlas.build_image(
+        sheet, frame_size=(64, 64), sheet_columns=4, frame_indices=[0, 3, 7], scale=0.5, columns=2
+    )
+    # The largest frame (index 7) is a 36x36 square, halved
+    assert image.size == (2 * 18, 2 * 18)
+    atlas = AnimationAtlas(image, frame_count=3, columns=2)
+    assert atlas.rects == [(0, 0, 18, 18), (18, 0, 18, 18), (0, 18, 18, 18)]
+    last = atlas.frame(2)
+    assert last.size == (18, 18)
+    assert last.getpixel((9, 9))[1] == 7 * 30
+    # The smaller frames keep their transparent border, centered
+    first = atlas.frame(0)
+    assert first.getpixel((0, 0))[3] == 0
+    assert first.getpixel((9, 9))[3] == 255
+    # The unused grid cell stays transparent
+    assert image.getpixel((27, 27))[3] == 0
@@ -0,0 +1,59 @@
+import shutil
+import pytest
+from utils.helpers import load_image
+from utils.texture_cache import TextureCache
+
+
+@pytest.fixture
+def image_file(tmp_path):
+    """Fixture for a copy of the test image."""
+    path = tmp_path / "test_image.png"
+    shutil.copy("tests/temp_assets/test_image.png", path)
+    return str(path)
+
+
+def test_derives_once(tmp_path, image_file, mocker):
+    """Test that a cached image is read back without deriving it again."""
+    cache = TextureCache(folder=str(tmp_path / "cache"))
+    first = cache.load_image(image_file, invert=True, tint_color=(0, 255, 0))
+    assert cache.derived_count == 1
+    second_cache = TextureCache(folder=str(tmp_path / "cache"))
+    derive = mocker.patch("utils.texture_cache.load_image")
+    second = second_cache.load_image(image_file, invert=True, tint_color=(0, 255, 0))
+    derive.assert_not_called()
+    assert second_cache.derived_count == 0
+    assert second.mode == "RGBA"
+    assert second.size == first.size
+    assert second.tobytes() == load_image(image_file, invert=True, tint_color=(0, 255, 0)).tobytes()
+
+
+def test_transforms_are_cached_separately(tmp_path, image_file):
+    """Test that each tint (e.g. per-profile ship colors) gets its own cached image."""
+    cache = TextureCache(folder=str(tmp_path / "cache"))
+    red = cache.load_image(image_file, tint_color=(255, 0, 0))
+    blue = cache.load_image(image_file, tint_color=(0, 0, 255))
+    inverted = cache.load_image(image_file, invert=True, tint_color=(0, 255, 255))
+    assert cache.derived_count == 3
+    assert len({red.tobytes(), blue.tobytes(), inverted.tobytes()}) == 3
+    cache.load_image(image_file, tint_color=(0, 0, 255))
+    assert cache.derived_count == 3
+
+
+def test_changed_file_is_derived_again(tmp_path, image_file):
+    """Test that the cache is keyed by the content of the source file."""
+    cache = TextureCache(folder=str(tmp_path / "cache"))
+    path = cache.cache_path(image_file, False, (255, 255, 255))
+    with open(image_file, "ab") as file:
+        file.write(b"\0\0")
+    assert cache.cache_path(image_file, False, (255, 255, 255)) != path
+
+
+def test_corrupt_file_is_rejected(tmp_path, image_file):
+    """Test that a truncated cache file raises a ValueError."""
+    cache = TextureCache(folder=str(tmp_path / "cache"))
+    cache.load_image(image_file)
+    path = cache.cache_path(image_file, False, (255, 255, 255))
+    with open(path, "r+b") as file:
+        file.truncate(100)
+    with pytest.raises(ValueError):
+        cache.load_image(image_file)
@@ -0,0 +1,129 @@
+import itertools
+import pytest
+from typing_trainer.trainer_engine import TrainerEngine, TrainerListener
+
+
+class RecordingListener(TrainerListener):
+    """A listener that records the events it receives."""
+
+    def __init__(self) -> None:
+        self.events = []
+
+    def on_char_state(self, position, state, typed_char):
+        self.events.append(("char", position, state, typed_char))
+
+    def on_caret_moved(self, position):
+        self.events.append(("caret", position))
+
+    def on_text_appended(self, text):
+        self.events.append(("appended", text))
+
+    def on_text_trimmed(self, position):
+        self.events.append(("trimmed", position))
+
+    def on_segment_flushed(self, session_stats):
+        self.events.append(("flushed", session_stats))
+
+    def on_session_completed(self, session_stats):
+        self.events.append(("completed", session_stats))
+
+
+@pytest.fixture
+def listener():
+    return RecordingListener()
+
+
+def _type(engine, text, start_ns=0, interval_ns=200_000_000):
+    """Types a string with a fixed interval between keystrokes."""
+    for i, char in enumerate(text):
+        engine.type_char(char, clock_ns=start_ns + (i + 1) * interval_ns)
+
+
+def test_completes_session(listener):
+    """Test a full session with one mistake and the resulting stats."""
+    engine = TrainerEngine(["cat", "dog"], listener=listener)
+    engine.start(clock_ns=0)
+    _type(engine, "cat dxg")
+    assert engine.completed
+    stats = listener.events[-1][1]
+    assert listener.events[-1][0] == "completed"
+    assert stats.chars_typed_total == 7
+    assert stats.chars_typed_correctly == 6
+    assert stats.word_mistype_counts == {"dog": 1}
+    assert stats.char_confusion_matrix.get("o", "x") == 1
+    assert stats.duration_seconds == pytest.approx(1.4)
+    assert stats.accuracy == pytest.approx(6 / 7)
+    assert engine.type_char("x") is None
+
+
+def test_live_metrics_before_completion(listener):
+    """Test that the metrics shown while typing count every keystroke so far."""
+    clock_ns = [0]
+    engine = TrainerEngine(["cat", "dog"], listener=listener, clock=lambda: clock_ns[0])
+    engine.start(clock_ns=0)
+    _type(engine, "cxt d")
+    clock_ns[0] = 3_000_000_000
+    engine.update_metrics()
+    stats = engine.session_stats
+    assert not engine.completed
+    assert stats.chars_typed_total == 5
+    assert stats.chars_typed_correctly == 4
+    assert stats.accuracy == pytest.approx(4 / 5)
+    assert stats.wpm == pytest.approx(4 * 12 / 3.0)
+
+def test_backspace(listener):
+    """Test that backspace resets the character and moves back across words."""
+    engine = TrainerEngine(["ab", "cd"], listener=listener)
+    engine.start(clock_ns=0)
+    assert not engine.backspace()
+    _type(engine, "ab ")
+    assert engine.word_index == 1
+    assert engine.backspace()
+    assert engine.word_index == 0
+    assert listener.events[-2:] == [
+        ("char", TrainerEngine.PADDING_SIZE + 2, TrainerEngine.UNMATCHED, None),
+        ("caret", TrainerEngine.PADDING_SIZE + 2),
+    ]
+
+
+def test_endless_session_stays_bounded(listener):
+    """Test that an endless session streams, flushes and trims its text."""
+    words = itertools.cycle(["alpha", "beta", "gamma", "delta"])
+    chunks = iter(lambda: [next(words) for _ in range(10)], None)
+    engine = TrainerEngine(next(chunks), listener=listener, word_chunks=chunks)
+    engine.start(clock_ns=0)
+    clock_ns = 0
+    for _ in range(20_000):
+        clock_ns += 100_000_000
+        engine.type_char(engine.expected_char(engine.position), clock_ns=clock_ns)
+        assert engine.length - engine.position > TrainerEngine.REFILL_CHARS - len("alpha ")
+    flushed = [event[1] for event in listener.events if event[0] == "flushed"]
+    assert len(flushed) >= 3
+    assert all(stats.accuracy == 1.0 for stats in flushed)
+    assert flushed[0].wpm == pytest.approx(120.0, rel=0.05)
+    assert any(event[0] == "trimmed" for event in listener.events)
+    assert len(engine.text) < 2000
+    assert len(engine.words_list) < 4 * TrainerEngine.KEEP_TYPED_WORDS
+    assert engine.keystroke_timer.count < 2000
+
+
+def test_endless_session_totals(listener):
+    """Test that the flushed segments of an endless session add up to one session."""
+    words = itertools.cycle(["alpha", "beta", "gamma", "delta"])
+    chunks = iter(lambda: [next(words) for _ in range(10)], None)
+    engine = TrainerEngine(next(chunks), listener=listener, word_chunks=chunks)
+    engine.start(clock_ns=0)
+    for i in range(3000):
+        char = engine.expected_char(engine.position)
+        engine.type_char("x" if i % 100 == 0 else char, clock_ns=(i + 1) * 100_000_000)
+    engine.update_metrics(engine.keystroke_timer.last_keystroke_seconds())
+    flushed = [event[1] for event in listener.events if event[0] == "flushed"]
+    assert len(flushed) >= 2
+    totals = engine.session_totals()
+    assert totals.chars_typed_total == 3000
+    assert totals.chars_typed_correctly == 2970
+    assert len(totals.char_confusion_matrix) == 3000
+    assert totals.duration_seconds == pytest.approx(300.0)
+    assert totals.wpm == pytest.approx(2970 * 12 / 300.0)
+    assert totals.session_start_time == flushed[0].session_start_time
+    assert sum(totals.word_mistype_counts.values()) == 30
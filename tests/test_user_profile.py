@@ -0,0 +1,24 @@
+from utils.colors import SHIP_COLORS
+from utils.save_manager import SaveManager
+from utils.user_profile import UserProfile
+
+
+def test_ship_color_is_saved_with_the_profile(tmp_path, monkeypatch):
+    """Test that a changed ship color is loaded back into a new profile instance."""
+    monkeypatch.setattr(SaveManager, "SAVE_FOLDER", str(tmp_path))
+    profile = UserProfile("pilot", "Pilot")
+    SaveManager(profile).load_user_profile()
+    assert profile.ship_color == SHIP_COLORS[0]
+    profile.ship_color = profile.next_ship_color()
+    SaveManager(profile).save_user_profile()
+    reloaded = UserProfile("pilot", "Pilot")
+    SaveManager(reloaded).load_user_profile()
+    assert reloaded.ship_color == SHIP_COLORS[1]
+
+
+def test_ship_colors_cycle():
+    """Test that the next ship color wraps around the palette."""
+    profile = UserProfile("pilot", "Pilot", ship_color=SHIP_COLORS[-1])
+    assert profile.next_ship_color() == SHIP_COLORS[0]
+    profile.ship_color = (1, 2, 3)
+    assert profile.next_ship_color() == SHIP_COLORS[0]
@@ -1,6 +1,8 @@
 import pytest
+import numpy as np
 from collections import defaultdict
-from utils.word_manager import WordManager
+from utils.word_manager import WordManager, calculate_bigram_weights
+from typing_trainer.bigram_stats import BigramStats
 
 @pytest.fixture
 def temp_word_file(tmp_path):
@@ -45,3 +47,55 @@ def test_generate_word(temp_word_file):
     word = word_manager.generate_word(min_character_count=5, max_character_count=6)
     assert 5 <= len(word) <= 6
     assert word in ["apple", "banana", "cherry"]
+
+def test_calculate_bigram_scores(temp_word_file):
+    """Test that the vectorized bigram scores match a per-word computation."""
+    word_manager = WordManager(file_path=temp_word_file)
+    bigram_weights = np.arange(BigramStats.SIZE * BigramStats.SIZE, dtype=float)
+    scores = word_manager.calculate_bigram_scores(bigram_weights)
+    for word, score in zip(word_manager.word_list, scores):
+        ids = [
+            BigramStats.CHAR_INDEX[a] * BigramStats.SIZE + BigramStats.CHAR_INDEX[b]
+            for a, b in zip(word, word[1:])
+        ]
+        assert score == pytest.approx(np.mean(bigram_weights[ids]))
+
+def test_weighted_sample_favors_slow_bigrams(temp_word_file):
+    """Test that a very slow bigram pulls its word to the top of the sample."""
+    word_manager = WordManager(file_path=temp_word_file)
+    word_manager.WEIGHT_RANDOM = 0.0
+    bigram_stats = BigramStats()
+    for a, b in zip("abcdefghijklmnopqrstuvwxy", "bcdefghijklmnopqrstuvwxyz"):
+        for _ in range(5):
+            bigram_stats.add(a, b, 0.1)
+    for _ in range(5):
+        bigram_stats.add("r", "y", 3.0)
+    sample = word_manager.get_weighted_sample(
+        1,
+        defaultdict(lambda: 1.0),
+        defaultdict(float),
+        bigram_weights=calculate_bigram_weights(bigram_stats)
+    )
+    assert sample == ["cherry"]
+
+def test_stream_word_chunks_follows_candidate_pool(temp_word_file):
+    """Test that streamed chunks come from the current pool, which can be swapped."""
+    word_manager = WordManager(file_path=temp_word_file)
+    pool = ["apple", "banana"]
+    chunks = word_manager.stream_word_chunks(4, candidates=lambda: pool)
+    first = next(chunks)
+    assert len(first) == 4
+    assert set(first) <= {"apple", "banana"}
+    pool = ["cherry", "date", "elderberry"]
+    second = next(chunks)
+    assert len(second) == 4
+    assert set(second) <= {"cherry", "date", "elderberry"}
+
+def test_stream_word_chunks_without_pool(temp_word_file):
+    """Test that chunks are sampled randomly within the length limits without a pool."""
+    word_manager = WordManager(file_path=temp_word_file)
+    chunks = word_manager.stream_word_chunks(10, min_character_count=5, max_character_count=6)
+    for _ in range(3):
+        chunk = next(chunks)
+        assert len(chunk) == 10
+        assert all(5 <= len(word) <= 6 for word in chunk)
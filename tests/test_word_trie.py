@@ -0,0 +1,101 @@
+import pytest
+from space_shooter.word_trie import WordTrie
+
+
+@pytest.fixture
+def trie():
+    """Fixture for a trie with a few overlapping words."""
+    trie = WordTrie()
+    for word in ["cat", "cats", "car", "dog"]:
+        trie.insert(word, word)
+    return trie
+
+
+def test_advance_reports_only_changed_items(trie):
+    """Test that advancing the cursor returns the items that matched further or stopped matching."""
+    advanced, dropped = trie.advance("c")
+    assert advanced == ["cat", "cats", "car"]
+    # "dog" had no matched character, so its state does not change
+    assert dropped == []
+    advanced, dropped = trie.advance("a")
+    assert advanced == ["cat", "cats", "car"]
+    assert dropped == []
+    advanced, dropped = trie.advance("t")
+    assert advanced == ["cat", "cats"]
+    assert dropped == ["car"]
+    assert trie.depth == 3
+    assert trie.prefix == "cat"
+
+
+def test_mismatch_leaves_no_matches(trie):
+    """Test that a character that matches nothing drops every matching item."""
+    trie.advance("d")
+    advanced, dropped = trie.advance("x")
+    assert advanced == []
+    assert dropped == ["dog"]
+    assert not trie.has_matches()
+    assert trie.reset() == []
+    assert trie.has_matches()
+    assert trie.depth == 0
+
+
+def test_reset_returns_matching_items(trie):
+    """Test that resetting the cursor returns the items that were matching the input."""
+    trie.advance("c")
+    trie.advance("a")
+    assert trie.reset() == ["cat", "cats", "car"]
+    assert trie.reset() == []
+
+
+def test_remove_prunes_nodes(trie):
+    """Test that removed items are no longer reported and empty branches are pruned."""
+    trie.remove("dog", "dog")
+    assert "d" not in trie.root.children
+    assert len(trie) == 3
+    trie.remove("cats", "cats")
+    trie.remove("cats", "cats")
+    assert len(trie) == 2
+    assert "s" not in trie.root.children["c"].children["a"].children["t"].children
+    trie.advance("c")
+    trie.advance("a")
+    advanced, dropped = trie.advance("t")
+    assert advanced == ["cat"]
+    assert dropped == ["car"]
+
+
+def test_insert_matching_current_input(trie):
+    """Test that a word inserted mid-input is reported as a match and followed by the cursor."""
+    trie.advance("c")
+    trie.advance("a")
+    assert trie.insert("cab", "cab")
+    assert not trie.insert("bee", "bee")
+    advanced, dropped = trie.advance("b")
+    assert advanced == ["cab"]
+    assert dropped == ["cat", "cats", "car"]
+
+
+def test_cursor_survives_pruning():
+    """Test that the cursor follows a prefix whose nodes were pruned and created again."""
+    trie = WordTrie()
+    trie.insert("ship", 1)
+    trie.advance("s")
+    trie.advance("h")
+    trie.remove("ship", 1)
+    assert not trie.has_matches()
+    assert trie.insert("shot", 2)
+    assert trie.has_matches()
+    advanced, dropped = trie.advance("o")
+    assert advanced == [2]
+    assert dropped == []
+
+
+def test_duplicate_words():
+    """Test that several items can share a word."""
+    trie = WordTrie()
+    trie.insert("rock", 1)
+    trie.insert("rock", 2)
+    for char in "rock":
+        advanced, _ = trie.advance(char)
+    assert advanced == [1, 2]
+    trie.remove("rock", 1)
+    assert trie.reset() == [2]
@@ -8,13 +8,14 @@ import arcade
 from space_shooter.views import SSDifficultySelectionView
 from typing_trainer.trainer_views import ModeSelectionView
 from utils.menu_view import MenuView
-from utils.resources import USER_PROFILE_SPRITE
+from utils.resources import USER_PROFILE_SPRITE, spaceship_sprite
 from arcade.gui import (
     UIFlatButton, UIImage, UIOnClickEvent, UIAnchorLayout
 )
 from utils.button_styles import transparent_button_style
 from utils.user_profile import UserProfile
-from utils.resources import MAIN_MENU_MUSIC
+from utils.save_manager import SaveManager
+from utils.resources import MAIN_MENU_MUSIC, preload_game_assets
 from utils.music_manager import MusicManager
 from utils import global_state
 
@@ -74,7 +75,7 @@ class MainMenuView(MenuView):
             ]
         )
 
-        MusicManager.play_music(MAIN_MENU_MUSIC)
+        MusicManager.play_music(MAIN_MENU_MUSIC.get())
 
         self._initialize_user_profile()
         
@@ -88,7 +89,7 @@ class MainMenuView(MenuView):
             UserProfile(name="user_3", display_name="User 3")
         ]
         self.user_index = 0
-        global_state.current_user_profile = self.user_profiles[self.user_index]
+        self._select_user_profile(self.user_index)
         IMAGE_SIZE = 50
         user_profile_button = UIFlatButton(
             text=f"{global_state.current_user_profile.display_name}",
@@ -99,7 +100,7 @@ class MainMenuView(MenuView):
         user_profile_button.place_text(anchor_x="center", anchor_y="bottom")
         user_profile_button.add(
             child=UIImage(
-                texture=USER_PROFILE_SPRITE,
+                texture=USER_PROFILE_SPRITE.get(),
                 width=IMAGE_SIZE,
                 height=IMAGE_SIZE
             ),
@@ -114,8 +115,38 @@ class MainMenuView(MenuView):
             Cycle through the user profiles.
             """
             self.user_index = (self.user_index + 1) % len(self.user_profiles)
-            global_state.current_user_profile = self.user_profiles[self.user_index]
+            self._select_user_profile(self.user_index)
             user_profile_button.text = f"{global_state.current_user_profile.display_name}"
+            ship_image.texture = spaceship_sprite(global_state.current_user_profile.ship_color).get()
+
+        ship_color_button = UIFlatButton(
+            text="Ship",
+            height=IMAGE_SIZE + 50,
+            width=100,
+            style=transparent_button_style
+        )
+        ship_color_button.place_text(anchor_x="center", anchor_y="bottom")
+        ship_image = UIImage(
+            texture=spaceship_sprite(global_state.current_user_profile.ship_color).get(),
+            width=IMAGE_SIZE,
+            height=IMAGE_SIZE
+        )
+        ship_color_button.add(
+            child=ship_image,
+            anchor_x="center",
+            anchor_y="top",
+            align_y=-5
+        )
+
+        @ship_color_button.event("on_click")
+        def _(event: UIOnClickEvent) -> None:
+            """
+            Cycle through the ship colors of the current user profile.
+            """
+            user_profile = global_state.current_user_profile
+            user_profile.ship_color = user_profile.next_ship_color()
+            SaveManager(user_profile).save_user_profile()
+            ship_image.texture = spaceship_sprite(user_profile.ship_color).get()
 
         user_profile_anchor = UIAnchorLayout()
         user_profile_anchor.add(
@@ -124,15 +155,30 @@ class MainMenuView(MenuView):
             anchor_y="bottom",
             align_y=5
         )
+        user_profile_anchor.add(
+            ship_color_button,
+            anchor_x="center",
+            anchor_y="bottom",
+            align_x=110,
+            align_y=5
+        )
         self.ui.add(user_profile_anchor)
 
+    def _select_user_profile(self, user_index: int) -> None:
+        """
+        Make a user profile the current one, with its saved settings.
+        """
+        user_profile = self.user_profiles[user_index]
+        SaveManager(user_profile).load_user_profile()
+        global_state.current_user_profile = user_profile
+
     def on_show_view(self) -> None:
         """
         Handle show view.
         """
         super().on_show_view()
-        if not MusicManager.is_music_playing_same(MAIN_MENU_MUSIC):
-            MusicManager.play_music(MAIN_MENU_MUSIC)
+        if not MusicManager.is_music_playing_same(MAIN_MENU_MUSIC.get()):
+            MusicManager.play_music(MAIN_MENU_MUSIC.get())
 
     def _start_game(self) -> None:
         """
@@ -170,10 +216,13 @@ def main() -> None:
     """
     Main function
     """
+    global_state.record_input = "--record" in sys.argv[1:]
     load_fonts()
     window = arcade.Window(1280, 720, "TypeSurge")
     main_menu_view = MainMenuView()
     window.show_view(main_menu_view)
+    # Load the games' assets while the player is in the menus
+    preload_game_assets()
     arcade.run()
 
 
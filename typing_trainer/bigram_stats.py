@@ -0,0 +1,116 @@
+import string
+import numpy as np
+
+
+class BigramStats:
+    """
+    Mergeable accumulator for transition (bigram) flight times.
+
+    Stores the count, mean and sum of squared deviations (Welford) for every
+    (previous_char, char) pair of a fixed alphabet as dense matrices, so
+    merging and lookups are plain array operations.
+    """
+
+    ALPHABET = string.ascii_lowercase + " "
+    CHAR_INDEX = {c: i for i, c in enumerate(ALPHABET)}
+    SIZE = len(ALPHABET)
+    # Alphabet index of every ASCII code point (-1 outside the alphabet)
+    ASCII_INDEX = np.full(128, -1, dtype=np.int64)
+    ASCII_INDEX[[ord(c) for c in ALPHABET]] = np.arange(SIZE)
+
+    def __init__(self) -> None:
+        """
+        Initializer
+        """
+        self.count = np.zeros((self.SIZE, self.SIZE), dtype=np.int64)
+        self.mean = np.zeros((self.SIZE, self.SIZE), dtype=np.float64)
+        self.m2 = np.zeros((self.SIZE, self.SIZE), dtype=np.float64)
+
+    def __len__(self) -> int:
+        """
+        Returns the number of recorded transitions
+        """
+        return int(self.count.sum())
+
+    def add(self, previous_char: str, char: str, flight_time: float) -> None:
+        """
+        Records a single transition. Characters outside the alphabet are ignored.
+        """
+        i, j = self.CHAR_INDEX.get(previous_char), self.CHAR_INDEX.get(char)
+        if i is None or j is None:
+            return
+        self.count[i, j] += 1
+        delta = flight_time - self.mean[i, j]
+        self.mean[i, j] += delta / self.count[i, j]
+        self.m2[i, j] += delta * (flight_time - self.mean[i, j])
+
+    @classmethod
+    def indexes_of(cls, chars: list[str | None]) -> np.ndarray:
+        """
+        Returns the alphabet index of each character (-1 outside the alphabet),
+        looking the code points up in one array operation
+        """
+        text = "".join(["\0" if c is None else c for c in chars])
+        if len(text) != len(chars):
+            # Some "characters" are longer strings (e.g. pasted text)
+            return np.array([cls.CHAR_INDEX.get(c, -1) for c in chars], dtype=np.int64)
+        codes = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+        return np.where(codes < 128, cls.ASCII_INDEX[np.minimum(codes, 127)], -1)
+
+    def add_batch(self, previous_chars: list[str | None], chars: list[str], flight_times: np.ndarray) -> None:
+        """
+        Records transitions, aligned with `flight_times`, in one vectorized
+        pass. Characters outside the alphabet are ignored.
+        """
+        if not chars:
+            return
+        i, j = self.indexes_of(previous_chars), self.indexes_of(chars)
+        valid = (i >= 0) & (j >= 0)
+        cells = (i * self.SIZE + j)[valid]
+        flight_times = np.asarray(flight_times, dtype=np.float64)[valid]
+        cell_count = self.SIZE * self.SIZE
+        batch = BigramStats()
+        count = np.bincount(cells, minlength=cell_count)
+        mean = np.bincount(cells, weights=flight_times, minlength=cell_count) / np.maximum(count, 1)
+        batch.count = count.reshape(self.SIZE, self.SIZE)
+        batch.mean = mean.reshape(self.SIZE, self.SIZE)
+        batch.m2 = np.bincount(
+            cells, weights=(flight_times - mean[cells])**2, minlength=cell_count
+        ).reshape(self.SIZE, self.SIZE)
+        self.merge(batch)
+
+    def merge(self, other: "BigramStats") -> None:
+        """
+        Merges another accumulator into this one (in place)
+        """
+        total = self.count + other.count
+        safe_total = np.maximum(total, 1)
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / safe_total
+        self.m2 += other.m2 + delta**2 * self.count * other.count / safe_total
+        self.count = total
+
+    def to_rows(self) -> list[tuple[str, str, int, float, float]]:
+        """
+        Returns the non-empty cells as (previous_char, char, count, mean, m2) rows
+        """
+        return [
+            (self.ALPHABET[i], self.ALPHABET[j], int(self.count[i, j]), float(self.mean[i, j]), float(self.m2[i, j]))
+            for i, j in zip(*np.nonzero(self.count))
+        ]
+
+    @classmethod
+    def from_rows(cls, rows: list[tuple[str, str, int, float, float]]) -> "BigramStats":
+        """
+        Rebuilds the accumulator from the output of `to_rows`
+        """
+        stats = cls()
+        for previous_char, char, count, mean, m2 in rows:
+            i, j = cls.CHAR_INDEX.get(previous_char), cls.CHAR_INDEX.get(char)
+            if i is None or j is None:
+                continue
+            stats.count[i, j] = count
+            stats.mean[i, j] = mean
+            stats.m2[i, j] = m2
+        return stats
+
@@ -0,0 +1,109 @@
+import numpy as np
+from typing_trainer.bigram_stats import BigramStats
+
+
+class ConfusionMatrix:
+    """
+    Counts of typed characters per expected character.
+
+    The counts are a dense matrix over the fixed alphabet of BigramStats, so
+    the matrices of many sessions are summed with one array reduction. Typed
+    characters outside the alphabet (capitals, digits, punctuation) are all
+    counted in a last "other" column, so they still count as mistakes.
+    """
+
+    ALPHABET = BigramStats.ALPHABET
+    CHAR_INDEX = BigramStats.CHAR_INDEX
+    # Row and column of the characters outside the alphabet
+    OTHER = len(ALPHABET)
+    OTHER_KEY = "other"
+    SIZE = len(ALPHABET) + 1
+
+    def __init__(self, counts: np.ndarray | None = None) -> None:
+        """
+        Initializer
+        """
+        self.counts = np.zeros((self.SIZE, self.SIZE), dtype=np.int64) if counts is None else counts
+
+    def __len__(self) -> int:
+        """
+        Returns the number of recorded keystrokes
+        """
+        return int(self.counts.sum())
+
+    @classmethod
+    def index_of(cls, char: str) -> int:
+        """
+        Returns the row/column of a character
+        """
+        return cls.CHAR_INDEX.get(char, cls.OTHER)
+
+    def add(self, expected_char: str, typed_char: str, count: int = 1) -> None:
+        """
+        Records a typed character
+        """
+        self.counts[self.index_of(expected_char), self.index_of(typed_char)] += count
+
+    def add_batch(self, expected_chars: list[str], typed_chars: list[str]) -> None:
+        """
+        Records typed characters, aligned with their expected ones, in one pass
+        """
+        expected = BigramStats.indexes_of(expected_chars)
+        typed = BigramStats.indexes_of(typed_chars)
+        cells = np.where(expected < 0, self.OTHER, expected) * self.SIZE + np.where(typed < 0, self.OTHER, typed)
+        self.counts += np.bincount(cells, minlength=self.SIZE * self.SIZE).reshape(self.SIZE, self.SIZE)
+
+    def get(self, expected_char: str, typed_char: str) -> int:
+        """
+        Returns the number of times a character was typed for an expected one
+        """
+        return int(self.counts[self.index_of(expected_char), self.index_of(typed_char)])
+
+    def count_total(self) -> np.ndarray:
+        """
+        Returns the number of keystrokes per expected character of the alphabet
+        """
+        return self.counts[:self.OTHER].sum(axis=1)
+
+    def count_correct(self) -> np.ndarray:
+        """
+        Returns the number of correct keystrokes per expected character of the alphabet
+        """
+        return np.diagonal(self.counts)[:self.OTHER].copy()
+
+    def copy(self) -> "ConfusionMatrix":
+        return ConfusionMatrix(self.counts.copy())
+
+    @classmethod
+    def sum_all(cls, matrices: list["ConfusionMatrix"]) -> "ConfusionMatrix":
+        """
+        Returns the sum of the given matrices
+        """
+        if not matrices:
+            return cls()
+        return cls(np.stack([matrix.counts for matrix in matrices]).sum(axis=0))
+
+    def _key(self, index: int) -> str:
+        return self.ALPHABET[index] if index < self.OTHER else self.OTHER_KEY
+
+    def to_dict(self) -> dict[str, dict[str, int]]:
+        """
+        Returns the non-empty cells as {expected_char: {typed_char: count}}
+        """
+        result: dict[str, dict[str, int]] = {}
+        for i, j in zip(*np.nonzero(self.counts)):
+            result.setdefault(self._key(i), {})[self._key(j)] = int(self.counts[i, j])
+        return result
+
+    @classmethod
+    def from_dict(cls, data: dict[str, dict[str, int]]) -> "ConfusionMatrix":
+        """
+        Rebuilds the matrix from the output of `to_dict` (or from the nested
+        dicts of older saves, whose characters outside the alphabet are
+        counted as "other")
+        """
+        matrix = cls()
+        for expected_char, counts in data.items():
+            for typed_char, count in counts.items():
+                matrix.counts[cls.index_of(expected_char), cls.index_of(typed_char)] += count
+        return matrix
@@ -0,0 +1,276 @@
+import bisect
+import numpy as np
+
+
+class KeyTimingStats:
+    """
+    Mergeable online accumulators for per-key flight times.
+
+    Each key gets one row holding the count, mean and sum of squared
+    deviations (Welford), plus a fixed log-bucket histogram that is used
+    as a quantile sketch. Merging two instances is exact for the moments
+    and for the histogram, so aggregating many sessions costs O(alphabet).
+    """
+
+    BUCKET_COUNT = 64
+    MIN_TIME_SECONDS = 0.01
+    MAX_TIME_SECONDS = 10.0
+    BUCKET_EDGES = np.geomspace(MIN_TIME_SECONDS, MAX_TIME_SECONDS, BUCKET_COUNT + 1)
+    # Plain-float copy of the edges, for the per-keystroke path in `add`
+    _BUCKET_EDGE_LIST = BUCKET_EDGES.tolist()
+
+    def __init__(self) -> None:
+        """
+        Initializer
+        """
+        self.keys: list[str] = []
+        self.key_index: dict[str, int] = {}
+        self.count = np.zeros(0, dtype=np.int64)
+        self.mean = np.zeros(0, dtype=np.float64)
+        self.m2 = np.zeros(0, dtype=np.float64)
+        self.histogram = np.zeros((0, self.BUCKET_COUNT), dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.key_index
+
+    def _get_or_add_row(self, key: str) -> int:
+        """
+        Returns the row index for the key, growing the arrays if the key is new
+        """
+        row = self.key_index.get(key)
+        if row is None:
+            self._add_rows([key])
+            row = self.key_index[key]
+        return row
+
+    def _add_rows(self, keys: list[str]) -> None:
+        """
+        Appends empty rows for new keys, growing the arrays once
+        """
+        for key in keys:
+            self.key_index[key] = len(self.keys)
+            self.keys.append(key)
+        n = len(keys)
+        self.count = np.concatenate([self.count, np.zeros(n, dtype=np.int64)])
+        self.mean = np.concatenate([self.mean, np.zeros(n, dtype=np.float64)])
+        self.m2 = np.concatenate([self.m2, np.zeros(n, dtype=np.float64)])
+        self.histogram = np.concatenate(
+            [self.histogram, np.zeros((n, self.BUCKET_COUNT), dtype=np.int64)]
+        )
+
+    @classmethod
+    def bucket_of(cls, values: np.ndarray | float) -> np.ndarray:
+        """
+        Returns the histogram bucket(s) of the given flight time(s).
+        Values outside the sketch range are clamped to the first/last bucket.
+        """
+        buckets = np.searchsorted(cls.BUCKET_EDGES, values, side="right") - 1
+        return np.clip(buckets, 0, cls.BUCKET_COUNT - 1)
+
+    def add(self, key: str, value: float) -> None:
+        """
+        Adds a single flight time (in seconds) for the given key
+        """
+        row = self._get_or_add_row(key)
+        self.count[row] += 1
+        delta = value - self.mean[row]
+        self.mean[row] += delta / self.count[row]
+        self.m2[row] += delta * (value - self.mean[row])
+        bucket = bisect.bisect_right(self._BUCKET_EDGE_LIST, value) - 1
+        self.histogram[row, min(max(bucket, 0), self.BUCKET_COUNT - 1)] += 1
+
+    def add_batch(self, keys: list[str], values: np.ndarray) -> None:
+        """
+        Adds flight times (in seconds) for the given keys, aligned with
+        `values`. The moments and histograms of the batch are binned per row in
+        one vectorized pass and merged in.
+        """
+        if not keys:
+            return
+        new_keys = [key for key in dict.fromkeys(keys) if key not in self.key_index]
+        if new_keys:
+            self._add_rows(new_keys)
+        rows = np.fromiter(map(self.key_index.__getitem__, keys), dtype=np.int64, count=len(keys))
+        values = np.asarray(values, dtype=np.float64)
+        size = len(self.keys)
+        count = np.bincount(rows, minlength=size)
+        mean = np.bincount(rows, weights=values, minlength=size) / np.maximum(count, 1)
+        m2 = np.bincount(rows, weights=(values - mean[rows])**2, minlength=size)
+        histogram = np.bincount(
+            rows * self.BUCKET_COUNT + self.bucket_of(values), minlength=size * self.BUCKET_COUNT
+        ).reshape(size, self.BUCKET_COUNT)
+        self._merge_rows(slice(None), count, mean, m2, histogram)
+
+    def merge(self, other: "KeyTimingStats") -> None:
+        """
+        Merges another accumulator into this one (in place)
+        using the parallel variant of Welford's algorithm.
+        """
+        if len(other) == 0:
+            return
+        new_keys = [key for key in other.keys if key not in self.key_index]
+        if new_keys:
+            self._add_rows(new_keys)
+        rows = np.fromiter(map(self.key_index.__getitem__, other.keys), dtype=np.int64, count=len(other))
+        self._merge_rows(rows, other.count, other.mean, other.m2, other.histogram)
+
+    def _merge_rows(
+        self,
+        rows: np.ndarray | slice,
+        count: np.ndarray,
+        mean: np.ndarray,
+        m2: np.ndarray,
+        histogram: np.ndarray
+    ) -> None:
+        """
+        Merges the moments and histograms of other accumulators into the given rows
+        """
+        count_a = self.count[rows]
+        total = count_a + count
+        safe_total = np.maximum(total, 1)
+        delta = mean - self.mean[rows]
+        self.mean[rows] += delta * count / safe_total
+        self.m2[rows] += m2 + delta**2 * count_a * count / safe_total
+        self.count[rows] = total
+        self.histogram[rows] += histogram
+
+    @classmethod
+    def merge_all(cls, stats_list: list["KeyTimingStats"]) -> "KeyTimingStats":
+        """
+        Returns a new accumulator containing all of the given accumulators.
+        The rows of all the inputs are stacked and reduced per key in one pass,
+        and the keys of the result are sorted.
+        """
+        stats_list = [stats for stats in stats_list if len(stats) > 0]
+        if not stats_list:
+            return cls()
+        keys = np.array([key for stats in stats_list for key in stats.keys])
+        count = np.concatenate([stats.count for stats in stats_list])
+        mean = np.concatenate([stats.mean for stats in stats_list])
+        m2 = np.concatenate([stats.m2 for stats in stats_list])
+        histogram = np.vstack([stats.histogram for stats in stats_list])
+
+        unique_keys, index = np.unique(keys, return_inverse=True)
+        total = np.bincount(index, weights=count).astype(np.int64)
+        merged_mean = np.bincount(index, weights=count * mean) / np.maximum(total, 1)
+        merged_m2 = np.bincount(
+            index,
+            weights=m2 + count * (mean - merged_mean[index])**2
+        )
+        order = np.argsort(index, kind="stable")
+        starts = np.flatnonzero(np.r_[True, np.diff(index[order]) != 0])
+        merged_histogram = np.add.reduceat(histogram[order], starts, axis=0)
+
+        return cls.from_arrays(
+            unique_keys.tolist(), total, merged_mean, merged_m2, merged_histogram
+        )
+
+    @classmethod
+    def from_arrays(
+        cls,
+        keys: list[str],
+        count: np.ndarray,
+        mean: np.ndarray,
+        m2: np.ndarray,
+        histogram: np.ndarray
+    ) -> "KeyTimingStats":
+        """
+        Builds the accumulator from per-key arrays aligned with `keys`
+        """
+        stats = cls()
+        stats.keys = list(keys)
+        stats.key_index = {key: row for row, key in enumerate(stats.keys)}
+        stats.count = np.asarray(count, dtype=np.int64)
+        stats.mean = np.asarray(mean, dtype=np.float64)
+        stats.m2 = np.asarray(m2, dtype=np.float64)
+        stats.histogram = np.asarray(histogram, dtype=np.int64)
+        return stats
+
+    @classmethod
+    def from_char_times(cls, char_times: dict[str, list]) -> "KeyTimingStats":
+        """
+        Builds the accumulator from raw per-key flight time lists.
+        Used for sessions saved before the accumulators existed.
+        """
+        stats = cls()
+        for key, times in char_times.items():
+            if not times:
+                continue
+            values = np.asarray(times, dtype=np.float64)
+            row = stats._get_or_add_row(key)
+            stats.count[row] = values.size
+            stats.mean[row] = values.mean()
+            stats.m2[row] = ((values - stats.mean[row])**2).sum()
+            stats.histogram[row] = np.bincount(
+                cls.bucket_of(values), minlength=cls.BUCKET_COUNT
+            )
+        return stats
+
+    def variance(self) -> np.ndarray:
+        """
+        Returns the sample variance per key (0 for keys with fewer than 2 samples)
+        """
+        return np.where(self.count > 1, self.m2 / np.maximum(self.count - 1, 1), 0.0)
+
+    def quantiles(self, qs: list[float]) -> np.ndarray:
+        """
+        Returns an array of shape (keys, len(qs)) with the estimated quantiles.
+        Values are interpolated geometrically within the histogram buckets.
+        Keys without samples get NaN.
+        """
+        result = np.full((len(self), len(qs)), np.nan)
+        if len(self) == 0:
+            return result
+        cumulative = np.cumsum(self.histogram, axis=1)
+        for j, q in enumerate(qs):
+            targets = q * self.count
+            buckets = np.minimum(
+                (cumulative < targets[:, None]).sum(axis=1),
+                self.BUCKET_COUNT - 1
+            )
+            rows = np.arange(len(self))
+            below = np.where(buckets > 0, cumulative[rows, buckets - 1], 0)
+            in_bucket = np.maximum(self.histogram[rows, buckets], 1)
+            fraction = np.clip((targets - below) / in_bucket, 0.0, 1.0)
+            low, high = self.BUCKET_EDGES[buckets], self.BUCKET_EDGES[buckets + 1]
+            result[:, j] = np.where(
+                self.count > 0,
+                low * (high / low)**fraction,
+                np.nan
+            )
+        return result
+
+    def to_dict(self) -> dict:
+        """
+        Returns a JSON-serializable representation
+        """
+        return {
+            key: {
+                "count": int(self.count[row]),
+                "mean": float(self.mean[row]),
+                "m2": float(self.m2[row]),
+                "histogram": {
+                    str(bucket): int(self.histogram[row, bucket])
+                    for bucket in np.flatnonzero(self.histogram[row])
+                }
+            }
+            for key, row in self.key_index.items()
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "KeyTimingStats":
+        """
+        Rebuilds the accumulator from the output of `to_dict`
+        """
+        stats = cls()
+        for key, values in data.items():
+            row = stats._get_or_add_row(key)
+            stats.count[row] = values["count"]
+            stats.mean[row] = values["mean"]
+            stats.m2[row] = values["m2"]
+            for bucket, n in values["histogram"].items():
+                stats.histogram[row, int(bucket)] = n
+        return stats
@@ -0,0 +1,128 @@
+import time
+from typing import Callable
+import numpy as np
+
+
+class KeystrokeTimer:
+    """
+    Records keystroke timestamps on a monotonic, high-resolution clock.
+
+    Timestamps are integer nanoseconds of *active* time since `start`, i.e. with
+    the paused intervals removed, appended to a plain list (recording a
+    keystroke does no numpy scalar work). Flight times and the session
+    duration are derived from that buffer.
+    """
+
+    NS_PER_SECOND = 1_000_000_000
+
+    def __init__(self, clock: Callable[[], int] = time.perf_counter_ns) -> None:
+        """
+        Initializer
+        """
+        self.clock = clock
+        self.timestamps: list[int] = []
+        self.start_ns: int | None = None
+        self.paused_ns = 0
+        self.pause_start_ns: int | None = None
+        self.pause_intervals: list[tuple[int, int]] = []
+
+    @property
+    def count(self) -> int:
+        """
+        The number of keystrokes in the buffer
+        """
+        return len(self.timestamps)
+
+    @property
+    def is_paused(self) -> bool:
+        return self.pause_start_ns is not None
+
+    def start(self, clock_ns: int | None = None) -> None:
+        """
+        Starts (or restarts) the timer and clears the buffer
+        """
+        self.start_ns = self.clock() if clock_ns is None else clock_ns
+        self.timestamps = []
+        self.paused_ns = 0
+        self.pause_start_ns = None
+        self.pause_intervals.clear()
+
+    def flush(self) -> None:
+        """
+        Starts a new segment at the latest keystroke: only that keystroke is kept
+        in the buffer (so the next flight time can still be measured) and times
+        are measured from it. Used to bound the buffer of endless sessions.
+        """
+        if not self.timestamps:
+            return
+        self.start_ns += self.timestamps[-1]
+        self.timestamps = [0]
+        self.pause_intervals.clear()
+
+    def pause(self, clock_ns: int | None = None) -> None:
+        """
+        Marks the start of a paused interval
+        """
+        if not self.is_paused:
+            self.pause_start_ns = self.clock() if clock_ns is None else clock_ns
+
+    def resume(self, clock_ns: int | None = None) -> None:
+        """
+        Marks the end of a paused interval. Paused time is excluded from all timings.
+        """
+        if self.pause_start_ns is not None:
+            end_ns = self.clock() if clock_ns is None else clock_ns
+            self.pause_intervals.append((self.pause_start_ns, end_ns))
+            self.paused_ns += end_ns - self.pause_start_ns
+            self.pause_start_ns = None
+
+    def active_ns(self, clock_ns: int | None = None) -> int:
+        """
+        Converts a clock reading (default: now) to active nanoseconds since start
+        """
+        if self.start_ns is None:
+            self.start(clock_ns)
+        if clock_ns is None:
+            clock_ns = self.clock()
+        if self.pause_start_ns is not None:
+            clock_ns = min(clock_ns, self.pause_start_ns)
+        return clock_ns - self.start_ns - self.paused_ns
+
+    def record(self, clock_ns: int | None = None) -> int:
+        """
+        Records a keystroke and returns its index in the buffer
+        """
+        if clock_ns is None or self.start_ns is None or self.pause_start_ns is not None:
+            self.timestamps.append(self.active_ns(clock_ns))
+        else:
+            self.timestamps.append(clock_ns - self.start_ns - self.paused_ns)
+        return len(self.timestamps) - 1
+
+    def flight_time(self, index: int) -> float | None:
+        """
+        Returns the time (in seconds) between a keystroke and the previous one.
+        The first keystroke has no flight time.
+        """
+        if index <= 0 or index >= len(self.timestamps):
+            return None
+        return (self.timestamps[index] - self.timestamps[index - 1]) / self.NS_PER_SECOND
+
+    def flight_times(self) -> np.ndarray:
+        """
+        Returns all the flight times (in seconds)
+        """
+        return np.diff(np.array(self.timestamps, dtype=np.int64)) / self.NS_PER_SECOND
+
+    def elapsed_seconds(self, clock_ns: int | None = None) -> float:
+        """
+        Returns the active time since start (in seconds)
+        """
+        return self.active_ns(clock_ns) / self.NS_PER_SECOND
+
+    def last_keystroke_seconds(self) -> float:
+        """
+        Returns the active time of the latest keystroke (in seconds)
+        """
+        if not self.timestamps:
+            return 0.0
+        return self.timestamps[-1] / self.NS_PER_SECOND
@@ -0,0 +1,118 @@
+import copy
+import random
+from collections import defaultdict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+import numpy as np
+from utils.word_manager import WordManager, calculate_char_weights, calculate_word_weights
+from typing_trainer.session_stats import SessionStats, SessionStatsList
+
+
+class AdaptiveRetargeter:
+    """
+    Keeps the pool of candidate words of an endless session targeted at the
+    user's current weaknesses.
+
+    Scoring the whole word list takes a noticeable fraction of a second, so the
+    pool is rebuilt on a background worker from a snapshot of the in-session
+    statistics, while the view keeps drawing chunks from the previous pool.
+    The worker draws its noise from its own random generator, never from the
+    global one used on the UI thread.
+    """
+
+    POOL_SIZE = 200
+    RECENT_SEGMENTS = 5
+
+    def __init__(
+        self,
+        word_manager: WordManager,
+        initial_pool: list[str],
+        stored_word_mistype_counts: dict[str, int],
+        bigram_weights: np.ndarray | None,
+        min_character_count: int,
+        max_character_count: int,
+        seed: int | None = None
+    ) -> None:
+        """
+        Initializer
+        """
+        self.word_manager = word_manager
+        self.pool = initial_pool
+        self.stored_word_mistype_counts = stored_word_mistype_counts
+        self.bigram_weights = bigram_weights
+        self.min_character_count = min_character_count
+        self.max_character_count = max_character_count
+        self.rng = random.Random(seed)
+        # Flushed segments of the current session, most recent last
+        self.recent_segments: deque[SessionStats] = deque(maxlen=self.RECENT_SEGMENTS)
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="retargeting")
+        self.pending: Future | None = None
+        self.retarget_count = 0
+
+    def candidates(self) -> list[str]:
+        """
+        Returns the current pool of candidate words
+        """
+        return self.pool
+
+    def add_segment(self, session_stats: SessionStats) -> None:
+        """
+        Registers a flushed segment of the session
+        """
+        self.recent_segments.append(session_stats)
+
+    def request_retarget(self, live_stats: SessionStats) -> bool:
+        """
+        Schedules a rebuild of the pool from the recent segments and a snapshot of
+        the live stats. Returns False if a rebuild is still running.
+        """
+        if self.pending is not None and not self.pending.done():
+            return False
+        segments = SessionStatsList(list(self.recent_segments) + [self._snapshot(live_stats)])
+        self.pending = self.executor.submit(self._retarget, segments)
+        return True
+
+    def _snapshot(self, session_stats: SessionStats) -> SessionStats:
+        """
+        Copies the parts of the live stats used for targeting, so that the worker
+        never reads structures that the view is mutating
+        """
+        snapshot = SessionStats()
+        snapshot.char_confusion_matrix = session_stats.char_confusion_matrix.copy()
+        snapshot.word_mistype_counts.update(session_stats.word_mistype_counts)
+        snapshot.char_timing = copy.deepcopy(session_stats.char_timing)
+        return snapshot
+
+    def _build_pool(self, segments: SessionStatsList) -> list[str]:
+        """
+        Scores the word list against the given segments (runs on the worker)
+        """
+        char_weights = calculate_char_weights(segments.compute_aggregate_char_metrics(), rng=self.rng)
+        word_mistype_counts = defaultdict(int, self.stored_word_mistype_counts)
+        for session_stats in segments:
+            for word, count in session_stats.word_mistype_counts.items():
+                word_mistype_counts[word] += count
+        return self.word_manager.get_weighted_sample(
+            num_words=self.POOL_SIZE,
+            char_weights=char_weights,
+            word_weights=calculate_word_weights(word_mistype_counts),
+            bigram_weights=self.bigram_weights,
+            min_character_count=self.min_character_count,
+            max_character_count=self.max_character_count,
+            rng=self.rng
+        )
+
+    def _retarget(self, segments: SessionStatsList) -> None:
+        """
+        Builds a new pool and swaps it in (a single reference assignment, so the
+        view never sees a partially built pool)
+        """
+        pool = self._build_pool(segments)
+        if pool:
+            self.pool = pool
+            self.retarget_count += 1
+
+    def shutdown(self) -> None:
+        """
+        Stops the worker without waiting for a running rebuild
+        """
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,232 @@
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+import numpy as np
+import pandas as pd
+from typing_trainer.key_timing import KeyTimingStats
+from typing_trainer.confusion_matrix import ConfusionMatrix
+from typing_trainer.session_stats import SessionStats, build_char_metrics, char_metrics_to_dataframe
+
+
+@dataclass(frozen=True)
+class WindowDefinition:
+    """
+    Defines a rolling window over the session history.
+    A session stays in the window while all of the given limits hold.
+    """
+    name: str
+    max_sessions: int | None = None
+    max_age: timedelta | None = None
+    max_keystrokes: int | None = None
+
+
+@dataclass
+class SessionAggregate:
+    """
+    Compact per-char aggregate of a single session.
+    All the index arrays point into the alphabet of the owning RollingWindowStore.
+    """
+    session_start_time: datetime
+    keystrokes: int
+    char_indexes: np.ndarray
+    count_total: np.ndarray
+    count_correct: np.ndarray
+    timing_indexes: np.ndarray
+    timing_count: np.ndarray
+    timing_sum: np.ndarray
+    timing_sum_squares: np.ndarray
+    timing_histogram: np.ndarray
+
+
+class RollingWindow:
+    """
+    Running per-char sums over the sessions currently inside a window.
+    """
+
+    def __init__(self, definition: WindowDefinition, size: int) -> None:
+        """
+        Initializer
+        """
+        self.definition = definition
+        self.sessions: deque[SessionAggregate] = deque()
+        self.keystrokes = 0
+        self.count_total = np.zeros(size, dtype=np.int64)
+        self.count_correct = np.zeros(size, dtype=np.int64)
+        self.timing_count = np.zeros(size, dtype=np.int64)
+        self.timing_sum = np.zeros(size, dtype=np.float64)
+        self.timing_sum_squares = np.zeros(size, dtype=np.float64)
+        self.timing_histogram = np.zeros((size, KeyTimingStats.BUCKET_COUNT), dtype=np.int64)
+
+    def grow(self, size: int) -> None:
+        """
+        Grows the per-char arrays to the new alphabet size
+        """
+        extra = size - len(self.count_total)
+        if extra <= 0:
+            return
+        self.count_total = np.pad(self.count_total, (0, extra))
+        self.count_correct = np.pad(self.count_correct, (0, extra))
+        self.timing_count = np.pad(self.timing_count, (0, extra))
+        self.timing_sum = np.pad(self.timing_sum, (0, extra))
+        self.timing_sum_squares = np.pad(self.timing_sum_squares, (0, extra))
+        self.timing_histogram = np.pad(self.timing_histogram, ((0, extra), (0, 0)))
+
+    def _apply(self, aggregate: SessionAggregate, sign: int) -> None:
+        """
+        Adds (sign=1) or subtracts (sign=-1) a session aggregate from the running sums
+        """
+        self.keystrokes += sign * aggregate.keystrokes
+        self.count_total[aggregate.char_indexes] += sign * aggregate.count_total
+        self.count_correct[aggregate.char_indexes] += sign * aggregate.count_correct
+        self.timing_count[aggregate.timing_indexes] += sign * aggregate.timing_count
+        self.timing_sum[aggregate.timing_indexes] += sign * aggregate.timing_sum
+        self.timing_sum_squares[aggregate.timing_indexes] += sign * aggregate.timing_sum_squares
+        self.timing_histogram[aggregate.timing_indexes] += sign * aggregate.timing_histogram
+
+    def add(self, aggregate: SessionAggregate) -> None:
+        """
+        Adds the newest session and expires the sessions that slid out of the window
+        """
+        self.sessions.append(aggregate)
+        self._apply(aggregate, 1)
+        self.expire(aggregate.session_start_time)
+
+    def expire(self, now: datetime) -> None:
+        """
+        Subtracts the oldest sessions while they fall outside of the window
+        """
+        definition = self.definition
+        while self.sessions:
+            oldest = self.sessions[0]
+            expired = (
+                (definition.max_sessions is not None and len(self.sessions) > definition.max_sessions)
+                or (definition.max_age is not None and oldest.session_start_time < now - definition.max_age)
+                or (
+                    definition.max_keystrokes is not None
+                    and self.keystrokes - oldest.keystrokes >= definition.max_keystrokes
+                )
+            )
+            if not expired:
+                break
+            self.sessions.popleft()
+            self._apply(oldest, -1)
+
+
+class RollingWindowStore:
+    """
+    Maintains per-char aggregates for several rolling windows at once.
+
+    New sessions are added to every window and expired sessions are subtracted
+    as the windows slide, so any window can be queried in O(alphabet) without
+    rescanning the session history.
+    """
+
+    DEFAULT_WINDOWS = (
+        WindowDefinition("last_20_sessions", max_sessions=20),
+        WindowDefinition("last_7_days", max_age=timedelta(days=7)),
+        WindowDefinition("last_500_keystrokes", max_keystrokes=500),
+    )
+
+    def __init__(self, windows: tuple[WindowDefinition, ...] = DEFAULT_WINDOWS) -> None:
+        """
+        Initializer
+        """
+        self.alphabet: list[str] = []
+        self.char_index: dict[str, int] = {}
+        self.windows = {
+            definition.name: RollingWindow(definition, 0) for definition in windows
+        }
+
+    def _get_indexes(self, chars: list[str]) -> np.ndarray:
+        """
+        Returns the alphabet indexes for the chars, growing the alphabet if needed
+        """
+        size = len(self.alphabet)
+        for char in chars:
+            if char not in self.char_index:
+                self.char_index[char] = len(self.alphabet)
+                self.alphabet.append(char)
+        if len(self.alphabet) > size:
+            for window in self.windows.values():
+                window.grow(len(self.alphabet))
+        return np.array([self.char_index[char] for char in chars], dtype=np.int64)
+
+    def _aggregate(self, session_stats: SessionStats) -> SessionAggregate:
+        """
+        Reduces a session to a compact per-char aggregate
+        """
+        count_total = session_stats.char_confusion_matrix.count_total()
+        present = np.flatnonzero(count_total)
+        chars = [ConfusionMatrix.ALPHABET[i] for i in present]
+        char_timing = session_stats.char_timing
+        return SessionAggregate(
+            session_start_time=_as_datetime(session_stats.session_start_time),
+            keystrokes=session_stats.chars_typed_total,
+            char_indexes=self._get_indexes(chars),
+            count_total=count_total[present],
+            count_correct=session_stats.char_confusion_matrix.count_correct()[present],
+            timing_indexes=self._get_indexes(char_timing.keys),
+            timing_count=char_timing.count.copy(),
+            timing_sum=char_timing.count * char_timing.mean,
+            timing_sum_squares=char_timing.m2 + char_timing.count * char_timing.mean**2,
+            timing_histogram=char_timing.histogram.copy()
+        )
+
+    def add(self, session_stats: SessionStats) -> None:
+        """
+        Adds a session to all the windows. Sessions must be added in chronological order.
+        """
+        aggregate = self._aggregate(session_stats)
+        for window in self.windows.values():
+            window.add(aggregate)
+
+    def history_is_sufficient(self, session_count: int, keystrokes: int, oldest_time: datetime) -> bool:
+        """
+        Checks whether a history of the given size (read newest first) already
+        covers every window, so that older sessions can be skipped when loading.
+        """
+        now = datetime.now()
+        for window in self.windows.values():
+            definition = window.definition
+            if not (
+                (definition.max_sessions is not None and session_count >= definition.max_sessions)
+                or (definition.max_age is not None and _as_datetime(oldest_time) < now - definition.max_age)
+                or (definition.max_keystrokes is not None and keystrokes >= definition.max_keystrokes)
+            ):
+                return False
+        return True
+
+    def compute_char_metrics_array(self, window_name: str, now: datetime | None = None) -> np.ndarray:
+        """
+        Returns a structured array (CHAR_METRICS_DTYPE) with the metrics of the given window
+        """
+        window = self.windows[window_name]
+        window.expire(now or datetime.now())
+        count = window.timing_count
+        safe_count = np.maximum(count, 1)
+        mean = window.timing_sum / safe_count
+        m2 = np.maximum(window.timing_sum_squares - window.timing_sum * mean, 0.0)
+        char_timing = KeyTimingStats.from_arrays(
+            self.alphabet, count, mean, m2, window.timing_histogram
+        )
+        return build_char_metrics(
+            np.array(self.alphabet, dtype=str),
+            window.count_total,
+            window.count_correct,
+            char_timing
+        )
+
+    def compute_aggregate_char_metrics(self, window_name: str, now: datetime | None = None) -> pd.DataFrame:
+        """
+        Returns a pandas dataframe with the metrics of the given window
+        """
+        return char_metrics_to_dataframe(self.compute_char_metrics_array(window_name, now))
+
+
+def _as_datetime(value: datetime | str) -> datetime:
+    """
+    Session start times loaded from the database are strings
+    """
+    if isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(value)
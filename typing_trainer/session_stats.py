@@ -5,6 +5,71 @@ from typing import Any, Iterable, SupportsIndex
 from collections import UserList
 import pandas as pd
 import numpy as np
+from typing_trainer.key_timing import KeyTimingStats
+from typing_trainer.bigram_stats import BigramStats
+from typing_trainer.confusion_matrix import ConfusionMatrix
+
+
+CHAR_METRICS_DTYPE = np.dtype([
+    ("char", "U8"),
+    ("count_total", np.int64),
+    ("count_correct", np.int64),
+    ("accuracy", np.float64),
+    ("mean_flight_time", np.float64),
+    ("p50_flight_time", np.float64),
+    ("p90_flight_time", np.float64),
+    ("p99_flight_time", np.float64),
+    ("char_wpm", np.float64),
+])
+# The expected characters of the rows of a ConfusionMatrix
+CONFUSION_ALPHABET = np.array(list(ConfusionMatrix.ALPHABET), dtype=str)
+
+
+def build_char_metrics(
+    chars: np.ndarray,
+    count_total: np.ndarray,
+    count_correct: np.ndarray,
+    char_timing: KeyTimingStats
+) -> np.ndarray:
+    """
+    Builds a structured array (CHAR_METRICS_DTYPE) for the given per-char counts.
+    Characters with no typed occurrences are dropped, and characters without
+    timing data get the default flight time of 10 seconds.
+    """
+    n = len(chars)
+    mean_flight_time = np.full(n, 10.0)
+    quantiles = np.full((n, 3), np.nan)
+    if len(char_timing) > 0:
+        timing_keys = np.asarray(char_timing.keys, dtype=str)
+        order = np.argsort(timing_keys)
+        positions = np.minimum(np.searchsorted(timing_keys[order], chars), len(timing_keys) - 1)
+        rows = order[positions]
+        has_timing = (timing_keys[rows] == chars) & (char_timing.count[rows] > 0)
+        mean_flight_time[has_timing] = char_timing.mean[rows[has_timing]]
+        quantiles[has_timing] = char_timing.quantiles([0.5, 0.9, 0.99])[rows[has_timing]]
+
+    present = count_total > 0
+    metrics = np.zeros(int(present.sum()), dtype=CHAR_METRICS_DTYPE)
+    metrics["char"] = chars[present]
+    metrics["count_total"] = count_total[present]
+    metrics["count_correct"] = count_correct[present]
+    metrics["accuracy"] = count_correct[present] / count_total[present]
+    metrics["mean_flight_time"] = mean_flight_time[present]
+    metrics["p50_flight_time"] = quantiles[present, 0]
+    metrics["p90_flight_time"] = quantiles[present, 1]
+    metrics["p99_flight_time"] = quantiles[present, 2]
+    metrics["char_wpm"] = 12 / mean_flight_time[present]
+    return metrics
+
+
+def char_metrics_to_dataframe(metrics: np.ndarray) -> pd.DataFrame:
+    """
+    Returns a pandas dataframe view of a CHAR_METRICS_DTYPE array, indexed by char
+    """
+    metrics_df = pd.DataFrame(metrics)
+    if metrics_df.shape[0] > 0:
+        metrics_df.set_index("char", inplace=True)
+    return metrics_df
 
 
 @dataclass
@@ -13,10 +78,9 @@ class SessionStats:
     Statistics for a single AI trainer session.
     """
     session_start_time: datetime = field(default_factory=datetime.now)
-    char_confusion_matrix: defaultdict[str, defaultdict[str, int]] = field(
-        default_factory=lambda: defaultdict(lambda: defaultdict(int))
-    )
-    char_times: defaultdict[str, list] = field(default_factory=lambda: defaultdict(list))
+    char_confusion_matrix: ConfusionMatrix = field(default_factory=ConfusionMatrix)
+    char_timing: KeyTimingStats = field(default_factory=KeyTimingStats)
+    bigram_timing: BigramStats = field(default_factory=BigramStats)
     wpm: float = 0.0
     word_mistype_counts: defaultdict[str, int] = field(default_factory=lambda: defaultdict(int))
     chars_typed_correctly: int = 0
@@ -24,6 +88,53 @@ class SessionStats:
     accuracy: float = 0.0
     duration_seconds: float = 0.0
 
+    def update_rates(self) -> None:
+        """
+        Updates the WPM and accuracy from the counts and the duration
+        """
+        if self.duration_seconds >= 2:
+            self.wpm = self.chars_typed_correctly * 12 / self.duration_seconds
+        if self.chars_typed_total > 0:
+            self.accuracy = self.chars_typed_correctly / self.chars_typed_total
+
+    def merge(self, other: "SessionStats") -> None:
+        """
+        Adds the stats of a later segment of the same session (in place)
+        """
+        self.char_confusion_matrix.counts += other.char_confusion_matrix.counts
+        self.char_timing.merge(other.char_timing)
+        self.bigram_timing.merge(other.bigram_timing)
+        for word, count in other.word_mistype_counts.items():
+            self.word_mistype_counts[word] += count
+        self.chars_typed_correctly += other.chars_typed_correctly
+        self.chars_typed_total += other.chars_typed_total
+        self.duration_seconds += other.duration_seconds
+        self.update_rates()
+
+
+def summarize_session_stats(session_stats: SessionStats) -> dict[str, Any]:
+    """
+    Returns a JSON-serializable summary of a session, used to check that a
+    replayed session reproduces the recorded one
+    """
+    return dict(
+        chars_typed_total=session_stats.chars_typed_total,
+        chars_typed_correctly=session_stats.chars_typed_correctly,
+        accuracy=session_stats.accuracy,
+        wpm=session_stats.wpm,
+        duration_seconds=session_stats.duration_seconds,
+        word_mistype_counts=dict(session_stats.word_mistype_counts),
+        char_confusion_matrix=session_stats.char_confusion_matrix.to_dict(),
+        char_timing={
+            key: [int(count), float(mean)]
+            for key, count, mean in zip(
+                session_stats.char_timing.keys,
+                session_stats.char_timing.count,
+                session_stats.char_timing.mean
+            )
+        }
+    )
+
 
 class SessionStatsList(UserList):
     """
@@ -56,48 +167,40 @@ class SessionStatsList(UserList):
             self._check_type(value)
         self.data[key] = value
 
-    def collect_char_times(self) -> dict[str, list]:
-        result = defaultdict(list)
-        for stats in self.data:
-            for char, times in stats.char_times.items():
-                result[char].extend(times)
-        return result
-    
-    def compute_overall_confusion_matrix(self) -> defaultdict[str, defaultdict[str, int]]:
+    def compute_overall_confusion_matrix(self) -> ConfusionMatrix:
         """
         Aggregates all of the session-level confusion matrices.
         
         Returns an overall confusion matrix corresponding to all of the sessions 
         present in the list
         """
-        overall_confusion_matrix = defaultdict(lambda: defaultdict(int))
-        for session in self.data:
-            for char, counts in session.char_confusion_matrix.items():
-                for typed_char, count in counts.items():
-                    overall_confusion_matrix[char][typed_char] += count
-        return overall_confusion_matrix
+        return ConfusionMatrix.sum_all([session.char_confusion_matrix for session in self.data])
     
+    def merge_char_timing(self) -> KeyTimingStats:
+        """
+        Merges the per-key timing accumulators of all the sessions in the list
+        """
+        return KeyTimingStats.merge_all([stats.char_timing for stats in self.data])
+
+    def compute_char_metrics_array(self) -> np.ndarray:
+        """
+        Returns a structured array (CHAR_METRICS_DTYPE) with aggregated metrics
+        from all the sessions in the list, one row per expected character.
+
+        The fixed-shape confusion matrices of the sessions are summed in one
+        reduction, and the timing accumulators are merged in one vectorized pass.
+        """
+        confusion_matrix = self.compute_overall_confusion_matrix()
+        return build_char_metrics(
+            CONFUSION_ALPHABET,
+            confusion_matrix.count_total(),
+            confusion_matrix.count_correct(),
+            self.merge_char_timing()
+        )
+
     def compute_aggregate_char_metrics(self) -> pd.DataFrame:
         """
         Returns a pandas dataframe with aggregated metrics 
-        from all the sessions in the list
+        from all the sessions in the list (a view of `compute_char_metrics_array`)
         """
-        metrics_list = []
-        confusion_matrix = self.compute_overall_confusion_matrix()
-        char_times = self.collect_char_times()
-        for char, counts in confusion_matrix.items():
-            count_correct, count_total = counts[char], sum(counts.values())
-            mean_flight_time = np.mean(char_times[char]) if char_times[char] else 10.0
-            data = {
-                "char": char,
-                "count_total": count_total,
-                "count_correct": count_correct,
-                "accuracy": count_correct / count_total,
-                "mean_flight_time": mean_flight_time,
-                "char_wpm": 12 / mean_flight_time
-            }
-            metrics_list.append(data)
-        metrics_df = pd.DataFrame(metrics_list)
-        if metrics_df.shape[0] > 0:
-            metrics_df.set_index("char", inplace=True)
-        return metrics_df
+        return char_metrics_to_dataframe(self.compute_char_metrics_array())
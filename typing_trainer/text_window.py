@@ -0,0 +1,227 @@
+from typing import Any, Callable
+import numpy as np
+import pyglet
+from pyglet.text.document import FormattedDocument
+from pyglet.text.layout import IncrementalTextLayout
+from typing_trainer.trainer_engine import TrainerEngine
+
+
+class GlyphAdvanceTable:
+    """
+    Cached horizontal advances (in pixels) of single characters for one font
+    """
+
+    def __init__(self, measure: Callable[[str], float]) -> None:
+        """
+        Initializer
+        """
+        self.measure = measure
+        self.cache: dict[str, float] = {}
+
+    @classmethod
+    def for_font(cls, font_name: str, font_size: float) -> "GlyphAdvanceTable":
+        """
+        Creates a table that measures glyphs of the given pyglet font
+        """
+        font = pyglet.font.load(font_name, font_size)
+        return cls(lambda char: font.get_glyphs(char)[0].advance)
+
+    def advance(self, char: str) -> float:
+        """
+        Returns the advance of a single character
+        """
+        advance = self.cache.get(char)
+        if advance is None:
+            advance = self.cache[char] = float(self.measure(char))
+        return advance
+
+    def advances(self, text: str) -> np.ndarray:
+        """
+        Returns the advances of all the characters of a string
+        """
+        return np.array([self.advance(char) for char in text], dtype=np.float64)
+
+
+class TextWindow:
+    """
+    Keeps only the span of the session text around the caret in a pyglet document.
+
+    The full text and the per-character states live in plain Python structures,
+    while the document holds the characters in [start, end). When the caret gets
+    within `MARGIN` characters of either edge of the window, the window is
+    re-centered by rebuilding the document. A rebuild costs O(window) but only
+    happens once every `SHIFT` characters, so the per-keystroke cost does not
+    depend on the length of the session.
+
+    With an advance table, the window also keeps a prefix sum of the glyph
+    advances of the document, so the x-position of the caret is an array lookup.
+
+    Positions are absolute: text can be appended at the end and typed text can be
+    trimmed from the start (see `trim`) without shifting any position.
+    """
+
+    UNMATCHED = TrainerEngine.UNMATCHED
+    CORRECT = TrainerEngine.CORRECT
+    INCORRECT = TrainerEngine.INCORRECT
+    MARGIN = 48
+    SHIFT = 48
+
+    def __init__(
+        self,
+        document: FormattedDocument,
+        layout: IncrementalTextLayout | None,
+        text: str,
+        base_attributes: dict[str, Any],
+        state_colors: dict[int, tuple[int, int, int, int]],
+        advance_table: GlyphAdvanceTable | None = None
+    ) -> None:
+        """
+        Initializer
+        """
+        self.document = document
+        self.layout = layout
+        self.text = text
+        self.base_attributes = base_attributes
+        self.state_colors = state_colors
+        self.states = bytearray(len(text))
+        self.display_chars: dict[int, str] = {}
+        self.advance_table = advance_table
+        self.start = 0
+        self.end = 0
+        self.position = 0
+        # Number of characters trimmed from the start of the text
+        self.base = 0
+        # x-position of the start of the document, relative to the start of the text
+        self.origin_x = 0.0
+        # Prefix sums of the glyph advances of the document
+        self.offsets = np.zeros(1, dtype=np.float64)
+
+    @property
+    def length(self) -> int:
+        """
+        The absolute position of the end of the text
+        """
+        return self.base + len(self.text)
+
+    def expected_char(self, position: int) -> str:
+        """
+        Returns the character of the text at an absolute position
+        """
+        return self.text[position - self.base]
+
+    def append_text(self, text: str) -> None:
+        """
+        Appends text at the end. The document is only updated on the next shift.
+        """
+        self.text += text
+        self.states.extend(bytes(len(text)))
+
+    def trim(self, position: int) -> None:
+        """
+        Drops the text before an absolute position (which must not be inside the window)
+        """
+        position = min(position, self.start)
+        if position <= self.base:
+            return
+        count = position - self.base
+        self.text = self.text[count:]
+        del self.states[:count]
+        self.display_chars = {i: c for i, c in self.display_chars.items() if i >= position}
+        self.base = position
+
+    @property
+    def document_position(self) -> int:
+        """
+        The caret position relative to the start of the document
+        """
+        return self.position - self.start
+
+    @property
+    def caret_x(self) -> float:
+        """
+        The x-position of the caret, relative to the start of the text
+        """
+        return self.origin_x + self.offsets[self.document_position]
+
+    def _display_text(self, start: int, end: int) -> str:
+        """
+        Returns the displayed characters for a span of the text
+        """
+        return "".join(
+            self.display_chars.get(i, self.text[i - self.base]) for i in range(start, end)
+        )
+
+    def move_caret(self, position: int) -> bool:
+        """
+        Moves the caret to the given text position, shifting the window if needed.
+        Returns True if the document was rebuilt.
+        """
+        self.position = position
+        near_start = position - self.start < self.MARGIN and self.start > 0
+        near_end = self.end - position < self.MARGIN and self.end < self.length
+        if self.end == 0 or near_start or near_end or not self.start <= position <= self.end:
+            self._rebuild()
+            return True
+        return False
+
+    def set_char(self, position: int, state: int, display_char: str | None = None) -> None:
+        """
+        Updates the state (and optionally the displayed character) at a text position
+        """
+        self.states[position - self.base] = state
+        expected_char = self.expected_char(position)
+        if display_char is None or display_char == expected_char:
+            self.display_chars.pop(position, None)
+            display_char = expected_char
+        else:
+            self.display_chars[position] = display_char
+        if not self.start <= position < self.end:
+            return
+        i = position - self.start
+        previous_char = self.document.text[i]
+        if previous_char != display_char:
+            self.document.delete_text(i, i + 1)
+            self.document.insert_text(i, display_char)
+            if self.advance_table is not None:
+                delta = self.advance_table.advance(display_char) - self.advance_table.advance(previous_char)
+                self.offsets[i + 1:] += delta
+        self.document.set_style(i, i + 1, attributes=dict(color=self.state_colors[state]))
+
+    def _rebuild(self) -> None:
+        """
+        Re-centers the window around the caret and rebuilds the document
+        """
+        previous_start = self.start
+        self.start = max(self.base, self.position - self.MARGIN - self.SHIFT)
+        self.end = min(self.length, self.position + self.MARGIN + self.SHIFT)
+        window_text = self._display_text(self.start, self.end)
+        if self.advance_table is not None:
+            if self.start >= previous_start:
+                self.origin_x += self.advance_table.advances(
+                    self._display_text(previous_start, self.start)
+                ).sum()
+            else:
+                self.origin_x -= self.advance_table.advances(
+                    self._display_text(self.start, previous_start)
+                ).sum()
+            self.offsets = np.concatenate([[0.0], np.cumsum(self.advance_table.advances(window_text))])
+        if self.layout is not None:
+            self.layout.begin_update()
+        self.document.text = window_text
+        self.document.set_style(
+            0,
+            len(window_text),
+            attributes=dict(self.base_attributes, color=self.state_colors[self.UNMATCHED])
+        )
+        states = self.states[self.start - self.base:self.end - self.base]
+        run_start = 0
+        for i in range(1, len(window_text) + 1):
+            state = states[run_start]
+            if i == len(window_text) or states[i] != state:
+                if state != self.UNMATCHED:
+                    self.document.set_style(
+                        run_start, i, attributes=dict(color=self.state_colors[state])
+                    )
+                run_start = i
+        if self.layout is not None:
+            self.layout.end_update()
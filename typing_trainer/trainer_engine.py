@@ -0,0 +1,353 @@
+import time
+from typing import Callable, Iterator
+import numpy as np
+from typing_trainer.keystroke_timer import KeystrokeTimer
+from typing_trainer.session_stats import SessionStats, summarize_session_stats
+from utils.input_log import InputLog, InputRecorder
+
+
+class TrainerListener:
+    """
+    Receives the state changes of a TrainerEngine. All the methods are no-ops,
+    so a listener only overrides what it renders.
+    """
+
+    def on_char_state(self, position: int, state: int, typed_char: str | None) -> None:
+        """
+        Called when the state of the character at a text position changes
+        """
+
+    def on_caret_moved(self, position: int) -> None:
+        """
+        Called when the caret moves to a new text position
+        """
+
+    def on_text_appended(self, text: str) -> None:
+        """
+        Called when streamed text is appended at the end (endless sessions)
+        """
+
+    def on_text_trimmed(self, position: int) -> None:
+        """
+        Called when the typed text before a position is dropped (endless sessions)
+        """
+
+    def on_segment_flushed(self, session_stats: SessionStats) -> None:
+        """
+        Called when the stats of a segment of an endless session are complete
+        """
+
+    def on_session_completed(self, session_stats: SessionStats) -> None:
+        """
+        Called when the last character of the text has been typed
+        """
+
+
+class TrainerEngine:
+    """
+    The typing trainer's logic, without any rendering, sound or windowing.
+
+    The engine consumes timestamped key events (`type_char`, `backspace`), keeps
+    the caret, the word index and the session statistics, and reports every
+    state change to its listener. Text positions are absolute: the text starts
+    with `PADDING_SIZE` spaces, and in endless sessions text is appended at the
+    end and trimmed from the start without shifting any position.
+
+    Keystrokes are buffered in plain lists and folded into the session's numpy
+    accumulators in batches, at points that a replay reproduces (every
+    RETARGET_EVERY_WORDS words of an endless session, segment flushes, pauses,
+    completion), so that replayed stats match the recorded ones exactly.
+    """
+
+    UNMATCHED = 0
+    CORRECT = 1
+    INCORRECT = 2
+    PADDING_SIZE = 150
+    # Endless sessions
+    REFILL_CHARS = 384
+    RETARGET_EVERY_WORDS = 25
+    FLUSH_EVERY_WORDS = 100
+    KEEP_TYPED_WORDS = 50
+
+    def __init__(
+        self,
+        words_list: list[str],
+        listener: TrainerListener | None = None,
+        word_chunks: Iterator[list[str]] | None = None,
+        retargeter=None,
+        clock: Callable[[], int] = time.perf_counter_ns,
+        recorder: InputRecorder | None = None,
+        summarize_segments: bool = False
+    ) -> None:
+        """
+        Initializer. With `word_chunks`, the session is endless: more words are
+        pulled from it as the caret approaches the end of the text. The listener
+        is not notified of the initial text, which is available as `text`.
+        With a recorder, every input event and streamed chunk is recorded, and
+        the flushed segments are summarized (as with `summarize_segments`) so
+        that replays can be checked against the recording.
+        """
+        self.listener = TrainerListener()
+        self.clock = clock
+        self.recorder = recorder
+        self.summarize_segments = summarize_segments or recorder is not None
+        # Summaries of the flushed segments, kept for the recording results
+        self.segment_summaries: list[dict] = []
+        if recorder is not None:
+            recorder.log.metadata.update(words=list(words_list), endless=word_chunks is not None)
+        self.word_chunks = word_chunks
+        self.endless = word_chunks is not None
+        self.retargeter = retargeter
+        self.words_list = list(words_list)
+        self.word_index = 0
+        # Number of words dropped from the start of words_list
+        self.words_trimmed = 0
+        # Text position of the start of each word of words_list
+        self.word_starts: list[int] = []
+        self._index_word_starts(self.PADDING_SIZE, self.words_list)
+        input_text = " ".join(self.words_list)
+        self.end_position = self.PADDING_SIZE + len(input_text)
+        if self.endless:
+            # Words are followed by a space, so that the next chunk can be appended
+            self.text = " " * self.PADDING_SIZE + input_text + " "
+        else:
+            self.text = " " * self.PADDING_SIZE + input_text + " " * self.PADDING_SIZE
+        # Number of characters trimmed from the start of the text
+        self.base = 0
+        self.position = self.PADDING_SIZE
+        self.words_since_retarget = 0
+        self.words_since_flush = 0
+        self.completed = False
+        self.session_stats = SessionStats()
+        # The flushed segments of an endless session, merged
+        self.flushed_stats: SessionStats | None = None
+        self.keystroke_timer = KeystrokeTimer(clock=clock)
+        # Keystrokes not yet folded into the accumulators, and the one typed before them
+        self.pending_typed: list[str] = []
+        self.pending_expected: list[str] = []
+        self.last_folded_char: str | None = None
+        if self.endless:
+            self._refill_text()
+        if listener is not None:
+            self.listener = listener
+
+    @property
+    def length(self) -> int:
+        """
+        The absolute position of the end of the text
+        """
+        return self.base + len(self.text)
+
+    def expected_char(self, position: int) -> str:
+        """
+        Returns the character of the text at an absolute position
+        """
+        return self.text[position - self.base]
+
+    def start(self, clock_ns: int | None = None) -> None:
+        """
+        Starts the session clock
+        """
+        clock_ns = self._record(InputLog.START, clock_ns=clock_ns)
+        self._fold_keystrokes()
+        self.keystroke_timer.start(clock_ns)
+
+    def pause(self, clock_ns: int | None = None) -> None:
+        """
+        Pauses the session clock
+        """
+        clock_ns = self._record(InputLog.PAUSE, clock_ns=clock_ns)
+        self._fold_keystrokes()
+        self.keystroke_timer.pause(clock_ns)
+
+    def resume(self, clock_ns: int | None = None) -> None:
+        """
+        Resumes the session clock
+        """
+        clock_ns = self._record(InputLog.RESUME, clock_ns=clock_ns)
+        self.keystroke_timer.resume(clock_ns)
+
+    def _record(self, kind: int, code: int = 0, payload: str = "", clock_ns: int | None = None) -> int | None:
+        """
+        Records an event if recording, and returns the clock reading it was stamped with
+        """
+        if self.recorder is None:
+            return clock_ns
+        if clock_ns is None:
+            clock_ns = self.clock()
+        self.recorder.record(kind, code, payload=payload, clock_ns=clock_ns)
+        return clock_ns
+
+    def type_char(self, char: str, clock_ns: int | None = None) -> int | None:
+        """
+        Processes a single typed character. Returns the new state of the character
+        under the caret, or None if the session is already completed.
+        """
+        if self.completed:
+            return None
+        if self.recorder is not None:
+            clock_ns = self._record(InputLog.TEXT, ord(char), clock_ns=clock_ns)
+        stats = self.session_stats
+        self.keystroke_timer.record(clock_ns)
+        position = self.position
+        correct_char = self.text[position - self.base]
+        self.pending_typed.append(char)
+        self.pending_expected.append(correct_char)
+        if char == correct_char:
+            state = self.CORRECT
+            stats.chars_typed_correctly += 1
+        else:
+            state = self.INCORRECT
+            stats.word_mistype_counts[self.words_list[self.word_index - self.words_trimmed]] += 1
+        stats.chars_typed_total += 1
+        self.listener.on_char_state(position, state, char)
+        self.position = position + 1
+        if correct_char == " ":
+            self.word_index += 1
+            if self.endless:
+                self._on_word_completed()
+        self.listener.on_caret_moved(self.position)
+        if not self.endless and self.position == self.end_position:
+            self._fold_keystrokes()
+            self.update_metrics(self.keystroke_timer.last_keystroke_seconds())
+            self.completed = True
+            self.listener.on_session_completed(stats)
+        return state
+
+    def backspace(self, clock_ns: int | None = None) -> bool:
+        """
+        Moves the caret back one character. Returns False at the start of the
+        (remaining) text.
+        """
+        self._record(InputLog.BACKSPACE, clock_ns=clock_ns)
+        if self.completed or self.position <= max(self.PADDING_SIZE, self.base):
+            return False
+        self.position -= 1
+        self.listener.on_char_state(self.position, self.UNMATCHED, None)
+        self.listener.on_caret_moved(self.position)
+        if self.text[self.position - self.base] == " ":
+            self.word_index -= 1
+        return True
+
+    def update_metrics(self, duration_seconds: float | None = None) -> None:
+        """
+        Updates the session duration (default: the active time so far), WPM and accuracy
+        """
+        stats = self.session_stats
+        if duration_seconds is None:
+            duration_seconds = self.keystroke_timer.elapsed_seconds()
+        stats.duration_seconds = duration_seconds
+        stats.update_rates()
+
+    def _fold_keystrokes(self) -> None:
+        """
+        Adds the pending keystrokes to the accumulators of the session, in one
+        batch. Their flight times are read from the keystroke timer's buffer.
+        """
+        typed = self.pending_typed
+        if not typed:
+            return
+        stats = self.session_stats
+        stats.char_confusion_matrix.add_batch(self.pending_expected, typed)
+        timestamps = self.keystroke_timer.timestamps
+        first = len(timestamps) - len(typed)
+        previous_chars = [self.last_folded_char] + typed[:-1]
+        if first == 0:
+            # The first keystroke of the session has no flight time
+            first, typed, previous_chars = 1, typed[1:], previous_chars[1:]
+        flight_times = np.diff(np.array(timestamps[first - 1:], dtype=np.int64)) / KeystrokeTimer.NS_PER_SECOND
+        stats.char_timing.add_batch(typed, flight_times)
+        stats.bigram_timing.add_batch(previous_chars, typed, flight_times)
+        self.last_folded_char = self.pending_typed[-1]
+        self.pending_typed = []
+        self.pending_expected = []
+
+    def _index_word_starts(self, position: int, words: list[str]) -> None:
+        """
+        Appends the text positions of words laid out from `position`
+        """
+        for word in words:
+            self.word_starts.append(position)
+            position += len(word) + 1
+
+    def _refill_text(self) -> None:
+        """
+        Appends chunks of streamed words until enough text is left ahead of the caret
+        """
+        while self.length - self.position < self.REFILL_CHARS:
+            chunk = next(self.word_chunks)
+            self._record(InputLog.TEXT_CHUNK, payload=" ".join(chunk))
+            self._index_word_starts(self.length, chunk)
+            self.words_list.extend(chunk)
+            text = " ".join(chunk) + " "
+            self.text += text
+            self.listener.on_text_appended(text)
+
+    def _on_word_completed(self) -> None:
+        """
+        Streams in more words, retargets and flushes the statistics periodically,
+        and trims the typed text so that memory stays bounded.
+        """
+        self.words_since_retarget += 1
+        self.words_since_flush += 1
+        self._refill_text()
+        if self.words_since_flush % self.RETARGET_EVERY_WORDS == 0:
+            self._fold_keystrokes()
+        if self.words_since_flush >= self.FLUSH_EVERY_WORDS:
+            self.flush_segment()
+        if self.retargeter is not None and self.words_since_retarget >= self.RETARGET_EVERY_WORDS:
+            if self.retargeter.request_retarget(self.session_stats):
+                self.words_since_retarget = 0
+        trim_count = self.word_index - self.words_trimmed - self.KEEP_TYPED_WORDS
+        if trim_count >= self.KEEP_TYPED_WORDS:
+            trim_position = self.word_starts[trim_count]
+            self.text = self.text[trim_position - self.base:]
+            self.base = trim_position
+            del self.word_starts[:trim_count]
+            del self.words_list[:trim_count]
+            self.words_trimmed += trim_count
+            self.listener.on_text_trimmed(trim_position)
+
+    def flush_segment(self) -> None:
+        """
+        Completes the stats typed so far as a segment and starts a new one
+        """
+        self._fold_keystrokes()
+        self.update_metrics(self.keystroke_timer.last_keystroke_seconds())
+        segment_stats = self.session_stats
+        if self.summarize_segments:
+            self.segment_summaries.append(summarize_session_stats(segment_stats))
+        if self.retargeter is not None:
+            self.retargeter.add_segment(segment_stats)
+        if self.flushed_stats is None:
+            self.flushed_stats = SessionStats(session_start_time=segment_stats.session_start_time)
+        self.flushed_stats.merge(segment_stats)
+        self.session_stats = SessionStats()
+        self.keystroke_timer.flush()
+        self.words_since_flush = 0
+        self.listener.on_segment_flushed(segment_stats)
+
+    def session_totals(self) -> SessionStats:
+        """
+        Returns the stats of the whole session so far: in endless sessions, the
+        flushed segments merged with the current one (as last measured by
+        `update_metrics`), which is what gets saved when the session ends
+        """
+        self._fold_keystrokes()
+        if self.flushed_stats is None:
+            return self.session_stats
+        totals = SessionStats(session_start_time=self.flushed_stats.session_start_time)
+        totals.merge(self.flushed_stats)
+        totals.merge(self.session_stats)
+        return totals
+
+    def recording_results(self) -> dict:
+        """
+        Returns the results that a replay of the recorded session must reproduce:
+        the summaries of all the segments, with the current one measured up to
+        its last keystroke
+        """
+        self._fold_keystrokes()
+        if not self.completed:
+            self.update_metrics(self.keystroke_timer.last_keystroke_seconds())
+        return dict(segments=self.segment_summaries + [summarize_session_stats(self.session_stats)])
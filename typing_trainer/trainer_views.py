@@ -1,24 +1,32 @@
+import random
 import arcade
 from arcade.gui import UIOnClickEvent
 import pyglet
-import time
 from pyglet.graphics import Batch
 from pyglet.text import caret
-from utils.word_manager import WordManager, calculate_char_weights, calculate_word_weights
+from utils.word_manager import (
+    WordManager, calculate_char_weights, calculate_word_weights, calculate_bigram_weights
+)
 from utils.resources import SEPIA_BACKGROUND, KEYPRESS_SOUND, ERROR_SOUND
 from utils.colors import BROWN
 from utils.menu_view import MenuView
 from utils.save_manager import SaveManager
 from utils import global_state
+from utils.input_log import InputRecorder
 from utils.resources import AI_TRAINER_MUSIC
 from utils.music_manager import MusicManager
+from utils.sound_manager import SoundManager
 from typing_trainer.session_stats import SessionStats, SessionStatsList
+from typing_trainer.text_window import TextWindow, GlyphAdvanceTable
+from typing_trainer.retargeting import AdaptiveRetargeter
+from typing_trainer.trainer_engine import TrainerEngine, TrainerListener
 from typing_trainer.stats_view import StatsView
 
 
-class TypingTrainerView(arcade.View):
+class TypingTrainerView(arcade.View, TrainerListener):
     """
-    The AI Trainer view.
+    The AI Trainer view. The typing logic lives in a TrainerEngine; the view
+    forwards key events to it and renders the state changes it reports.
     """
 
     UNMATCHED_TEXT_COLOR = BROWN[:3] + (170,)
@@ -26,59 +34,91 @@ class TypingTrainerView(arcade.View):
     INCORRECT_TEXT_COLOR = arcade.color.AUBURN
     WPM_TEXT_COLOR = arcade.color.ANTIQUE_RUBY
     FONT_NAME = "Pixelzone"
+    FONT_SIZE = 68
+    SCROLL_SPEED = 12.0
     WORD_CHARACTER_COUNT_MIN = 4
     WORD_CHARACTER_COUNT_MAX = 9
     SPACE_CHAR = '·'
-
-    def __init__(self, main_menu_view: arcade.View, words_count: int, targeted: bool = True) -> None:
+    TARGETING_WINDOW = "last_20_sessions"
+    # Endless mode
+    CHUNK_WORDS = 25
+
+    def __init__(
+        self,
+        main_menu_view: arcade.View,
+        words_count: int,
+        targeted: bool = True,
+        endless: bool = False
+    ) -> None:
         """
         Initializer
         """
         super().__init__()
-        self.background = SEPIA_BACKGROUND
+        self.background = SEPIA_BACKGROUND.get()
         self.main_menu_view = main_menu_view
         self.words_count = words_count
-        save_manager = SaveManager(global_state.current_user_profile) 
+        # Created first, as it seeds the random word sampling
+        recorder = InputRecorder(
+            "typing_trainer", metadata=dict(targeted=targeted)
+        ) if global_state.record_input else None
+        save_manager = self.save_manager = SaveManager(global_state.current_user_profile)
         self.word_manager = WordManager()
+        retargeter = None
         if targeted:
             char_weights = calculate_char_weights(
-                save_manager.get_all_session_stats().compute_aggregate_char_metrics()
+                save_manager.get_rolling_window_store().compute_aggregate_char_metrics(
+                    self.TARGETING_WINDOW
+                )
             )
             word_weights = calculate_word_weights(
                 save_manager.get_word_mistype_counts()
             )
-            self.words_list = self.word_manager.get_weighted_sample(
-                num_words=self.words_count,
+            bigram_weights = calculate_bigram_weights(
+                save_manager.get_bigram_stats()
+            )
+            words_list = self.word_manager.get_weighted_sample(
+                num_words=AdaptiveRetargeter.POOL_SIZE if endless else self.words_count,
                 char_weights=char_weights,
                 word_weights=word_weights,
+                bigram_weights=bigram_weights,
                 min_character_count=self.WORD_CHARACTER_COUNT_MIN,
                 max_character_count=self.WORD_CHARACTER_COUNT_MAX
             )
+            if endless:
+                retargeter = AdaptiveRetargeter(
+                    self.word_manager,
+                    initial_pool=words_list,
+                    stored_word_mistype_counts=save_manager.get_word_mistype_counts(),
+                    bigram_weights=bigram_weights,
+                    min_character_count=self.WORD_CHARACTER_COUNT_MIN,
+                    max_character_count=self.WORD_CHARACTER_COUNT_MAX,
+                    seed=random.getrandbits(64)
+                )
         else:
-            self.words_list = self.word_manager.get_random_sample(
+            words_list = self.word_manager.get_random_sample(
                 num_words=self.words_count,
                 min_character_count=self.WORD_CHARACTER_COUNT_MIN,
                 max_character_count=self.WORD_CHARACTER_COUNT_MAX
             )
-        # print(self.words_list)
-        self.word_index = 0
-        self.input_text = " ".join(self.words_list)
-        self.padding_size = 150
-        self.padded_text = " " * self.padding_size + self.input_text + " " * self.padding_size
-        self.session_stats = SessionStats()
-        self.pyglet_batch = Batch()
-        self.text_document = pyglet.text.document.FormattedDocument(
-            text=self.padded_text
-        )
-        self.text_document.set_style(
-            start=0, 
-            end=len(self.text_document.text),
-            attributes=dict(
-                font_name=self.FONT_NAME,
-                font_size=68,
-                color=self.UNMATCHED_TEXT_COLOR
+        word_chunks = None
+        if endless:
+            word_chunks = self.word_manager.stream_word_chunks(
+                self.CHUNK_WORDS,
+                candidates=retargeter.candidates if retargeter is not None else None,
+                min_character_count=self.WORD_CHARACTER_COUNT_MIN,
+                max_character_count=self.WORD_CHARACTER_COUNT_MAX
             )
+            words_list = next(word_chunks)
+        # print(words_list)
+        self.engine = TrainerEngine(
+            words_list,
+            listener=self,
+            word_chunks=word_chunks,
+            retargeter=retargeter,
+            recorder=recorder
         )
+        self.pyglet_batch = Batch()
+        self.text_document = pyglet.text.document.FormattedDocument()
         self.text_layout = pyglet.text.layout.IncrementalTextLayout(
             document=self.text_document,
             width=int(self.width - 50),
@@ -90,12 +130,29 @@ class TypingTrainerView(arcade.View):
             multiline=False,
             batch=self.pyglet_batch
         )
+        self.text_window = TextWindow(
+            document=self.text_document,
+            layout=self.text_layout,
+            text=self.engine.text,
+            base_attributes=dict(
+                font_name=self.FONT_NAME,
+                font_size=self.FONT_SIZE
+            ),
+            state_colors={
+                TextWindow.UNMATCHED: self.UNMATCHED_TEXT_COLOR,
+                TextWindow.CORRECT: self.CORRECT_TEXT_COLOR,
+                TextWindow.INCORRECT: self.INCORRECT_TEXT_COLOR
+            },
+            advance_table=GlyphAdvanceTable.for_font(self.FONT_NAME, self.FONT_SIZE)
+        )
         self.caret = caret.Caret(
             self.text_layout,
             color=BROWN
         )
-        self.caret.position = self.padding_size
-        self.center_text_layout()
+        self.scroll_x = self.target_scroll_x = 0.0
+        self.on_caret_moved(self.engine.position)
+        self.scroll_x = self.target_scroll_x
+        self._apply_scroll()
         self.wpm_text = arcade.Text(
             "",
             x=self.window.width//2,
@@ -106,9 +163,15 @@ class TypingTrainerView(arcade.View):
             color=self.WPM_TEXT_COLOR,
             batch=self.pyglet_batch
         )
-        MusicManager.play_music(AI_TRAINER_MUSIC) 
-        self.last_key_press_time = None
-        self.pause_start_time = None
+        MusicManager.play_music(AI_TRAINER_MUSIC.get()) 
+        self.engine.start()
+
+    @property
+    def session_stats(self) -> SessionStats:
+        """
+        The stats of the current session (segment, in endless mode)
+        """
+        return self.engine.session_stats
     
     def on_draw(self) -> None:
         """
@@ -116,88 +179,85 @@ class TypingTrainerView(arcade.View):
         """
         self.clear()
         arcade.draw_texture_rect(
-            SEPIA_BACKGROUND,
+            self.background,
             arcade.LBWH(0, 0, self.window.width, self.window.height)
         )
         self.pyglet_batch.draw()
 
-    def capture_character_input(self, input: str) -> None:
+    def on_char_state(self, position: int, state: int, typed_char: str | None) -> None:
         """
-        Capture the character input.
+        Renders the new state of a character and plays the matching sound.
         """
-        correct_char = self.padded_text[self.caret.position]
-        self.session_stats.char_confusion_matrix[correct_char][input] += 1
-        if input == correct_char:
+        if state == TextWindow.CORRECT:
             self._play_keypress_sound()
-            self.session_stats.chars_typed_correctly += 1
-            self.text_document.set_style(
-                self.caret.position,
-                self.caret.position + 1,
-                attributes=dict(
-                    color=self.CORRECT_TEXT_COLOR
-                )
-            )
-        else:
+            self.text_window.set_char(position, state)
+        elif state == TextWindow.INCORRECT:
             self._play_error_sound()
-            self.text_document.delete_text(self.caret.position, self.caret.position + 1)
-            if input == " ":
-                self.text_document.insert_text(self.caret.position, self.SPACE_CHAR)
-            else:
-                self.text_document.insert_text(self.caret.position, input)
-            self.text_document.set_style(
-                self.caret.position,
-                self.caret.position + 1,
-                attributes=dict(
-                    color=self.INCORRECT_TEXT_COLOR
-                )
+            self.text_window.set_char(
+                position,
+                state,
+                self.SPACE_CHAR if typed_char == " " else typed_char
             )
-            self.session_stats.word_mistype_counts[self.words_list[self.word_index]] += 1
-        if correct_char == " ":
-            self.word_index += 1
-        self.session_stats.chars_typed_total += 1
-        self.caret.position += 1
-        if self.caret.position == self.padding_size + len(self.input_text):
-            self._complete_game()
-        self.center_text_layout()
-
-    def capture_backspace(self) -> None:
-        """
-        Capture the backspace key.
-        """
-        if self.caret.position > self.padding_size:
-            self.caret.position -= 1
-            correct_char = self.padded_text[self.caret.position]
-            self.text_document.delete_text(self.caret.position, self.caret.position + 1)
-            self.text_document.insert_text(self.caret.position, correct_char)
-            self.text_document.set_style(
-                start=self.caret.position,
-                end=self.caret.position + 1,
-                attributes=dict(
-                    color=self.UNMATCHED_TEXT_COLOR
-                )
+        else:
+            self.text_window.set_char(position, state)
+
+    def on_caret_moved(self, position: int) -> None:
+        """
+        Moves the caret to a text position, shifting the text window if needed
+        """
+        if self.text_window.move_caret(position):
+            self._apply_scroll()
+        self.caret.position = self.text_window.document_position
+        self.target_scroll_x = self.text_window.caret_x - self.window.width / 2
+
+    def on_text_appended(self, text: str) -> None:
+        """
+        Extends the displayed text with streamed words.
+        """
+        self.text_window.append_text(text)
+
+    def on_text_trimmed(self, position: int) -> None:
+        """
+        Drops the typed text before a position.
+        """
+        self.text_window.trim(position)
+
+    def on_session_completed(self, session_stats: SessionStats) -> None:
+        """
+        Complete the game.
+        """
+        self.end_session()
+        game_completed_view = GameCompletedView(self, session_stats)
+        self.window.show_view(game_completed_view)
+
+    def end_session(self) -> None:
+        """
+        Stops the background work of the session and saves its recording
+        """
+        if self.engine.retargeter is not None:
+            self.engine.retargeter.shutdown()
+        if self.engine.recorder is not None:
+            self.engine.recorder.save(
+                global_state.current_user_profile.name, self.engine.recording_results()
             )
-            self.center_text_layout()
-            if correct_char == " ":
-                self.word_index -= 1
 
-    def center_text_layout(self) -> None:
+    def _apply_scroll(self) -> None:
+        """
+        Updates the horizontal scroll on the layout from the current scroll position.
+        Scroll positions are relative to the start of the text, so they stay valid
+        when the text window shifts.
         """
-        Updates the horizontal scroll on the layout so that the caret is in the center
-        """    
-        caret_x_pos = self.text_layout.get_point_from_position(self.caret.position)[0]
-        self.text_layout.view_x = int(caret_x_pos - (self.window.width / 2))
+        self.text_layout.view_x = int(round(self.scroll_x - self.text_window.origin_x))
 
     def on_update(self, delta_time: float) -> None:
         """
         Update the view.
         """
-        self.session_stats.duration_seconds += delta_time
-        if self.session_stats.duration_seconds >= 2:
-            self.session_stats.wpm = (
-                self.session_stats.chars_typed_correctly * 12 / self.session_stats.duration_seconds
-            )
-        if self.session_stats.chars_typed_total > 0:
-            self.session_stats.accuracy = self.session_stats.chars_typed_correctly / self.session_stats.chars_typed_total
+        if not self.engine.completed:
+            self.engine.update_metrics()
+        # Smoothly scroll the text so that the caret moves towards the center
+        self.scroll_x += (self.target_scroll_x - self.scroll_x) * min(1.0, delta_time * self.SCROLL_SPEED)
+        self._apply_scroll()
         self.wpm_text.text = f"WPM: {self.session_stats.wpm:.1f}, " + \
             f"Accuracy: {100.0 * self.session_stats.accuracy:.2f}%"
         
@@ -206,60 +266,47 @@ class TypingTrainerView(arcade.View):
         Handle key presses.
         """
         if symbol == arcade.key.ESCAPE:
-            self.pause_start_time = time.time()
-            pause_view = PauseView(self, self.session_stats)
+            self.engine.pause()
+            # Endless sessions are saved as one session, with all their segments
+            pause_view = PauseView(self, self.engine.session_totals())
             self.window.show_view(pause_view)
 
-    def _complete_game(self) -> None:
-        """
-        Complete the game.
-        """
-        game_completed_view = GameCompletedView(self, self.session_stats)
-        self.window.show_view(game_completed_view)
-
     def _play_keypress_sound(self) -> None:
         """
         Play the keypress sound.
         """
-        arcade.play_sound(KEYPRESS_SOUND, volume=0.75)
+        SoundManager.play_sound(KEYPRESS_SOUND.get(), volume=0.75)
 
     def _play_error_sound(self) -> None:
         """
         Play an error sound
         """
-        arcade.play_sound(ERROR_SOUND, volume=0.4)
+        SoundManager.play_sound(ERROR_SOUND.get(), volume=0.4)
 
     def on_text(self, text: str) -> None:
         """
         Captures unicode text input after applying modifiers.
         This works (even though it's not mentioned in arcade's documentation) 
-        because arcade probably inherits pyglet.window
-        """
-        if text not in {'\r', '\n', '\r\n'}:
-            current_time = time.time()
-            if self.last_key_press_time is not None:
-                transition_time = current_time - self.last_key_press_time
-                self.session_stats.char_times[text].append(transition_time)
-            self.last_key_press_time = current_time
-            self.capture_character_input(input=text)
+        because arcade probably inherits pyglet.window.
+        Composed (e.g. IME) input can deliver several characters at once.
+        """
+        for char in text:
+            if char not in {'\r', '\n'}:
+                self.engine.type_char(char)
             
     def on_text_motion(self, motion: int) -> None:
         """
         Identifying when the backspace key is pressed (or held pressed)
         """
         if motion == arcade.key.MOTION_BACKSPACE:
-            self.capture_backspace()
+            self.engine.backspace()
     
     def on_show_view(self) -> None:
         """
         Handle show view.
         """
         self.window.set_mouse_visible(False)
-        if self.pause_start_time is not None:
-            pause_duration = time.time() - self.pause_start_time
-            if self.last_key_press_time is not None:
-                self.last_key_press_time += pause_duration
-            self.pause_start_time = None
+        self.engine.resume()
 
     def on_hide_view(self) -> None:
         """
@@ -328,6 +375,7 @@ class PauseView(MenuView):
         Return to the main menu.
         """
         self.save_manager.save_session_stats_to_db(self.session_stats)
+        self.game_view.end_session()
         # self.save_manager.load_and_print_db()
         self.window.show_view(self.game_view.main_menu_view)
 
@@ -429,6 +477,16 @@ class ModeSelectionView(MenuView):
             """
             self.start_game(50, targeted=True)
 
+        button_endless = self.create_button(
+            "Endless Practice",
+            tooltip_text="Keeps streaming words that adapt to your typing as you go."
+        )
+        @button_endless.event("on_click")
+        def _(event: "UIOnClickEvent") -> None:
+            """
+            Start an endless, adaptive session.
+            """
+            self.start_game(0, targeted=True, endless=True)
 
         button_back = self.create_button(
             "Back",
@@ -457,14 +515,15 @@ class ModeSelectionView(MenuView):
             [
                 button_random_words,
                 button_targeted_words,
+                button_endless,
                 button_stats,
                 button_back,
             ]
         )
     
-    def start_game(self, words_count: int, targeted: bool = True) -> None:
+    def start_game(self, words_count: int, targeted: bool = True, endless: bool = False) -> None:
         """
         Start the game.
         """
-        ai_trainer_view = TypingTrainerView(self.main_menu_view, words_count, targeted)
+        ai_trainer_view = TypingTrainerView(self.main_menu_view, words_count, targeted, endless)
         self.window.show_view(ai_trainer_view)
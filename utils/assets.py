@@ -0,0 +1,126 @@
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable
+import pyglet
+
+
+def schedule_on_main_thread(callback: Callable[[], None]) -> None:
+    """
+    Runs a callback on the main thread, on the next tick of the pyglet clock
+    """
+    pyglet.clock.schedule_once(lambda delta_time: callback(), 0)
+
+
+class AssetHandle:
+    """
+    A lazily loaded asset: the loader runs on the first `get()`, from whichever
+    thread asks first, and its result is kept for every later call.
+    """
+
+    def __init__(self, name: str, loader: Callable[[], Any]) -> None:
+        """
+        Initializer
+        """
+        self.name = name
+        self.loader = loader
+        self.load_seconds: float | None = None
+        self._value: Any = None
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def get(self) -> Any:
+        """
+        Returns the asset, loading it first if needed. If another thread is
+        already loading it, waits for that load instead of loading it twice.
+        """
+        if not self._loaded:
+            with self._lock:
+                if not self._loaded:
+                    start = time.perf_counter()
+                    self._value = self.loader()
+                    self.load_seconds = time.perf_counter() - start
+                    self._loaded = True
+        return self._value
+
+    def __repr__(self) -> str:
+        return f"AssetHandle({self.name!r}, loaded={self._loaded})"
+
+
+class AssetRegistry:
+    """
+    Registry of the game's assets, as lazy handles.
+
+    Nothing is loaded when an asset is registered. Manifests name the assets
+    that a view needs, so that they can be preloaded in the background (e.g.
+    while the player is in the menus); an asset that is used before its
+    preload finishes is simply loaded on the spot.
+    """
+
+    def __init__(self, schedule: Callable[[Callable[[], None]], None] = schedule_on_main_thread) -> None:
+        """
+        Initializer
+        """
+        self.handles: dict[str, AssetHandle] = {}
+        self.manifests: dict[str, list[AssetHandle]] = {}
+        self.schedule = schedule
+        # A single worker, so that preloads run one after the other in request order
+        self._executor: ThreadPoolExecutor | None = None
+
+    def register(self, name: str, loader: Callable[[], Any]) -> AssetHandle:
+        """
+        Registers an asset and returns its handle
+        """
+        if name in self.handles:
+            raise ValueError(f"Asset '{name}' is already registered")
+        handle = self.handles[name] = AssetHandle(name, loader)
+        return handle
+
+    def add_manifest(self, manifest_name: str, handles: list[AssetHandle]) -> None:
+        """
+        Sets the assets that a view (or any other part of the game) needs
+        """
+        self.manifests[manifest_name] = list(handles)
+
+    def pending(self, manifest_name: str) -> list[str]:
+        """
+        Returns the names of the assets of a manifest that are not loaded yet
+        """
+        return [handle.name for handle in self.manifests[manifest_name] if not handle.loaded]
+
+    def load(self, manifest_name: str) -> None:
+        """
+        Loads the assets of a manifest on the calling thread
+        """
+        for handle in self.manifests[manifest_name]:
+            handle.get()
+
+    def preload(self, manifest_name: str, on_ready: Callable[[], None] | None = None) -> Future:
+        """
+        Loads the assets of a manifest on a background thread. `on_ready` then
+        runs on the main thread. If a load fails, the error is kept in the
+        returned future, and the asset is loaded (and fails) again when used.
+        """
+        if manifest_name not in self.manifests:
+            raise KeyError(f"Unknown asset manifest: '{manifest_name}'")
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="asset-preload")
+
+        def preload() -> None:
+            self.load(manifest_name)
+            if on_ready is not None:
+                self.schedule(on_ready)
+
+        return self._executor.submit(preload)
+
+    def shutdown(self) -> None:
+        """
+        Waits for the pending preloads
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
@@ -0,0 +1,174 @@
+import hashlib
+import mmap
+import os
+import struct
+import threading
+from typing import Callable
+import pyglet
+from pyglet import media
+from pyglet.media.codecs.base import AudioData, AudioFormat, StaticSource, StaticMemorySource
+
+
+class MappedPCMReader(StaticMemorySource):
+    """
+    Reads raw PCM from a shared buffer, without copying the whole buffer per
+    queued play like StaticMemorySource does
+    """
+
+    def __init__(self, buffer: memoryview, audio_format: AudioFormat) -> None:
+        """
+        Initializer
+        """
+        self._buffer = buffer
+        self._offset = 0
+        self._max_offset = len(buffer)
+        self.audio_format = audio_format
+        self._duration = len(buffer) / float(audio_format.bytes_per_second)
+
+    def seek(self, timestamp: float) -> None:
+        offset = int(timestamp * self.audio_format.bytes_per_second)
+        self._offset = min(self.audio_format.align(offset), self._max_offset)
+
+    def get_audio_data(self, num_bytes: float, compensation_time: float = 0.0) -> AudioData | None:
+        start = self._offset
+        end = min(start + int(num_bytes), self._max_offset)
+        if end <= start:
+            return None
+        self._offset = end
+        data = bytes(self._buffer[start:end])
+        return AudioData(
+            data,
+            len(data),
+            start / self.audio_format.bytes_per_second,
+            len(data) / self.audio_format.bytes_per_second
+        )
+
+
+class MappedPCMSource(StaticSource):
+    """
+    A static source over already decoded PCM (typically a memory-mapped file)
+    """
+
+    def __init__(self, buffer: memoryview, audio_format: AudioFormat) -> None:
+        """
+        Initializer
+        """
+        self._data = buffer
+        self.audio_format = audio_format
+        self._duration = len(buffer) / audio_format.bytes_per_second
+
+    def get_queue_source(self) -> MappedPCMReader:
+        return MappedPCMReader(self._data, self.audio_format)
+
+
+class CachedSound:
+    """
+    A sound effect decoded to raw PCM. Like arcade.Sound, it exposes its
+    pyglet source as `source`.
+    """
+
+    def __init__(self, file_name: str, source: MappedPCMSource) -> None:
+        """
+        Initializer
+        """
+        self.file_name = file_name
+        self.source = source
+
+
+def decode_sound(file_name: str) -> tuple[bytes, AudioFormat]:
+    """
+    Decodes a sound file to raw PCM with pyglet's decoders
+    """
+    source = media.load(file_name, streaming=True)
+    chunks = []
+    while (audio_data := source.get_audio_data(1 << 20)) is not None:
+        chunks.append(audio_data.data)
+    return b"".join(chunks), source.audio_format
+
+
+class AudioCache:
+    """
+    Disk cache of decoded sound effects.
+
+    Each file is decoded once and stored as raw PCM (after a small format
+    header) under the hash of the source file, so edited assets are decoded
+    again. Later loads memory-map the cached file instead of decoding.
+    """
+
+    CACHE_FOLDER = "cache/audio/"
+    VERSION = 1
+    HEADER = struct.Struct("<4sHHII")
+    MAGIC = b"PCM0"
+
+    def __init__(
+        self,
+        folder: str = CACHE_FOLDER,
+        decode: Callable[[str], tuple[bytes, AudioFormat]] = decode_sound
+    ) -> None:
+        """
+        Initializer
+        """
+        self.folder = folder
+        self.decode = decode
+        self.decoded_count = 0
+        # Open maps, kept alive for the buffers handed out to sources
+        self._maps: list[mmap.mmap] = []
+
+    def cache_path(self, file_name: str) -> str:
+        """
+        Returns the path of the cached PCM for a sound file
+        """
+        with open(file_name, "rb") as file:
+            digest = hashlib.sha1(file.read()).hexdigest()
+        return os.path.join(self.folder, f"{digest}_v{self.VERSION}.pcm")
+
+    def _write(self, path: str, data: bytes, audio_format: AudioFormat) -> None:
+        """
+        Writes a cache file atomically, so that a crash never leaves a partial file
+        """
+        os.makedirs(self.folder, exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, "wb") as file:
+            file.write(self.HEADER.pack(
+                self.MAGIC,
+                audio_format.channels,
+                audio_format.sample_size,
+                audio_format.sample_rate,
+                0
+            ))
+            file.write(data)
+        os.replace(temp_path, path)
+
+    def load(self, file_name: str) -> CachedSound:
+        """
+        Returns a sound effect, decoding it only if it is not cached yet
+        """
+        path = self.cache_path(file_name)
+        if not os.path.exists(path):
+            data, audio_format = self.decode(file_name)
+            self._write(path, data, audio_format)
+            self.decoded_count += 1
+        with open(path, "rb") as file:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._maps.append(mapped)
+        magic, channels, sample_size, sample_rate, _ = self.HEADER.unpack_from(mapped, 0)
+        if magic != self.MAGIC:
+            raise ValueError(f"Corrupt audio cache file: {path}")
+        audio_format = AudioFormat(channels, sample_size, sample_rate)
+        buffer = memoryview(mapped)[self.HEADER.size:]
+        return CachedSound(file_name, MappedPCMSource(buffer, audio_format))
+
+
+def warm_up_audio(on_ready: Callable[[], None] | None = None) -> threading.Thread:
+    """
+    Opens the audio device on a background thread, then runs `on_ready` on the
+    main thread (through the pyglet clock), e.g. to allocate the sound voices
+    """
+    def warm_up() -> None:
+        media.get_audio_driver()
+        if on_ready is not None:
+            pyglet.clock.schedule_once(lambda delta_time: on_ready(), 0)
+
+    thread = threading.Thread(target=warm_up, name="audio-warmup", daemon=True)
+    thread.start()
+    return thread
@@ -1,4 +1,13 @@
 BROWN = (151, 120, 97, 255)
 BROWN_DARK = (101, 70, 47, 255)
 BEIGE = (240, 226, 210, 255)
-TRANSPARENT = (0, 0, 0, 0)
\ No newline at end of file
+TRANSPARENT = (0, 0, 0, 0)
+# Spaceship tints a user profile can pick from
+SHIP_COLORS = (
+    BEIGE[:3],
+    (150, 200, 240),
+    (160, 230, 150),
+    (245, 160, 170),
+    (250, 215, 110),
+    (200, 170, 240)
+)
\ No newline at end of file
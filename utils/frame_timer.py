@@ -0,0 +1,56 @@
+import numpy as np
+
+
+def histogram_percentiles(histogram: np.ndarray, percentiles: list[float]) -> list[int]:
+    """
+    Returns the percentiles of the values counted in a histogram of 1-wide bins
+    """
+    cumulative = np.cumsum(histogram)
+    if cumulative[-1] == 0:
+        return [0] * len(percentiles)
+    return [int(np.searchsorted(cumulative, cumulative[-1] * p / 100)) for p in percentiles]
+
+
+class FrameTimer:
+    """
+    Frame time statistics: percentiles over the last frames (for a live
+    overlay), and over every frame since the start (for benchmark reports).
+
+    The recent frame times are kept in a ring buffer; all the frame times are
+    counted in a histogram of 1 µs bins, so neither grows with the run time.
+    """
+
+    MAX_MICROSECONDS = 250_000
+
+    def __init__(self, window_size: int = 240) -> None:
+        """
+        Initializer
+        """
+        self.recent = np.zeros(window_size, dtype=np.float64)
+        self.count = 0
+        self.histogram = np.zeros(self.MAX_MICROSECONDS + 1, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def add(self, seconds: float) -> None:
+        """
+        Adds the time of a frame
+        """
+        self.recent[self.count % len(self.recent)] = seconds
+        self.count += 1
+        self.histogram[min(int(seconds * 1_000_000), self.MAX_MICROSECONDS)] += 1
+
+    def recent_percentiles(self, percentiles: list[float]) -> list[float]:
+        """
+        Returns percentiles of the last frame times, in seconds
+        """
+        if self.count == 0:
+            return [0.0] * len(percentiles)
+        return [float(value) for value in np.percentile(self.recent[:self.count], percentiles)]
+
+    def percentiles(self, percentiles: list[float]) -> list[float]:
+        """
+        Returns percentiles of all the frame times, in seconds (to the µs)
+        """
+        return [value / 1_000_000 for value in histogram_percentiles(self.histogram, percentiles)]
@@ -4,6 +4,8 @@ from pyglet.media import Player
 from dataclasses import dataclass
 
 current_user_profile: UserProfile
+# Record the input of game sessions for replay (see utils/replay.py)
+record_input: bool = False
 
 @dataclass
 class CurrentMusic:
@@ -13,6 +13,25 @@ def calculate_angle_between_points(point1: tuple[float, float], point2: tuple[fl
     return theta
 
 
+def segment_intersects_circle(
+    start: tuple[float, float],
+    end: tuple[float, float],
+    center: tuple[float, float],
+    radius: float
+) -> bool:
+    """
+    Check whether a point moving from start to end passes within radius of
+    center (a swept-circle test, so fast movers cannot tunnel through)
+    """
+    dx, dy = end[0] - start[0], end[1] - start[1]
+    fx, fy = start[0] - center[0], start[1] - center[1]
+    length_squared = dx * dx + dy * dy
+    # Fraction of the segment closest to the center
+    t = 0.0 if length_squared == 0 else min(max(-(fx * dx + fy * dy) / length_squared, 0.0), 1.0)
+    closest_x, closest_y = fx + t * dx, fy + t * dy
+    return closest_x * closest_x + closest_y * closest_y <= radius * radius
+
+
 def tint_image(image: Image.Image, color: tuple[int, int, int]) -> Image.Image:
     """
     Applies a multiplicative tint to a PIL Image.
@@ -0,0 +1,157 @@
+import json
+import os
+import random
+import struct
+import time
+from datetime import datetime
+from typing import Any, Callable, Iterator, NamedTuple
+
+
+class InputEvent(NamedTuple):
+    """
+    A single recorded input event
+    """
+    timestamp_ns: int
+    kind: int
+    code: int = 0
+    modifiers: int = 0
+    payload: str = ""
+
+
+class InputLog:
+    """
+    A compact binary log of the input events of a game session.
+
+    The file starts with a header (magic, version, RNG seed and a JSON block
+    with the game name, its setup and the final results), followed by one
+    fixed-size record per event plus an optional UTF-8 payload.
+    """
+
+    MAGIC = b"TSIL"
+    VERSION = 1
+    HEADER = struct.Struct("<4sHQI")
+    RECORD = struct.Struct("<qBIHH")
+    # Event kinds
+    TEXT = 1        # code: unicode code point of the typed character
+    KEY_PRESS = 2   # code: key symbol, modifiers: key modifiers
+    BACKSPACE = 3
+    PAUSE = 4
+    RESUME = 5
+    UPDATE = 6      # code: frame delta time in microseconds
+    TEXT_CHUNK = 7  # payload: streamed words, separated by spaces
+    START = 8
+
+    def __init__(self, game: str, seed: int, metadata: dict[str, Any] | None = None) -> None:
+        """
+        Initializer
+        """
+        self.game = game
+        self.seed = seed
+        self.metadata = metadata if metadata is not None else {}
+        self.events: list[InputEvent] = []
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    def __iter__(self) -> Iterator[InputEvent]:
+        return iter(self.events)
+
+    def to_bytes(self) -> bytes:
+        """
+        Serializes the log
+        """
+        header_json = json.dumps(dict(game=self.game, metadata=self.metadata)).encode("utf-8")
+        chunks = [
+            self.HEADER.pack(self.MAGIC, self.VERSION, self.seed, len(header_json)),
+            header_json
+        ]
+        for event in self.events:
+            payload = event.payload.encode("utf-8")
+            chunks.append(
+                self.RECORD.pack(event.timestamp_ns, event.kind, event.code, event.modifiers, len(payload))
+            )
+            chunks.append(payload)
+        return b"".join(chunks)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "InputLog":
+        """
+        Deserializes a log
+        """
+        magic, version, seed, header_size = cls.HEADER.unpack_from(data, 0)
+        if magic != cls.MAGIC or version != cls.VERSION:
+            raise ValueError(f"Not an input log (version {cls.VERSION})")
+        offset = cls.HEADER.size
+        header = json.loads(data[offset:offset + header_size].decode("utf-8"))
+        offset += header_size
+        log = cls(header["game"], seed, header["metadata"])
+        while offset < len(data):
+            timestamp_ns, kind, code, modifiers, payload_size = cls.RECORD.unpack_from(data, offset)
+            offset += cls.RECORD.size
+            payload = data[offset:offset + payload_size].decode("utf-8")
+            offset += payload_size
+            log.events.append(InputEvent(timestamp_ns, kind, code, modifiers, payload))
+        return log
+
+    def save(self, file_path: str) -> None:
+        """
+        Writes the log to a file
+        """
+        with open(file_path, "wb") as file:
+            file.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, file_path: str) -> "InputLog":
+        """
+        Reads a log from a file
+        """
+        with open(file_path, "rb") as file:
+            return cls.from_bytes(file.read())
+
+
+class InputRecorder:
+    """
+    Records the input events of a session into an InputLog.
+
+    Creating a recorder seeds the global `random` module, so that a session
+    can be reproduced from the seed and the recorded events.
+    """
+
+    RECORDINGS_FOLDER = "recordings/"
+
+    def __init__(
+        self,
+        game: str,
+        metadata: dict[str, Any] | None = None,
+        seed: int | None = None,
+        clock: Callable[[], int] = time.perf_counter_ns
+    ) -> None:
+        """
+        Initializer
+        """
+        if seed is None:
+            seed = random.getrandbits(63)
+        random.seed(seed)
+        self.log = InputLog(game, seed, metadata)
+        self.clock = clock
+
+    def record(self, kind: int, code: int = 0, modifiers: int = 0, payload: str = "", clock_ns: int | None = None) -> None:
+        """
+        Appends an event, timestamped with the given clock reading (default: now)
+        """
+        if clock_ns is None:
+            clock_ns = self.clock()
+        self.log.events.append(InputEvent(clock_ns, kind, code, modifiers, payload))
+
+    def save(self, profile_name: str, results: dict[str, Any] | None = None) -> str:
+        """
+        Saves the log (with the final results of the session) to the recordings
+        folder and returns its path
+        """
+        if results is not None:
+            self.log.metadata["results"] = results
+        os.makedirs(self.RECORDINGS_FOLDER, exist_ok=True)
+        filename = f"{profile_name}_{self.log.game}_{datetime.now():%Y%m%d_%H%M%S}.tslog"
+        file_path = os.path.join(self.RECORDINGS_FOLDER, filename)
+        self.log.save(file_path)
+        return file_path
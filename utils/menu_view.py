@@ -103,7 +103,7 @@ class MenuView(arcade.View):
         """
         self.clear()
         arcade.draw_texture_rect(
-            SEPIA_BACKGROUND,
+            SEPIA_BACKGROUND.get(),
             arcade.LBWH(0, 0, self.window.width, self.window.height)
         )
         self.ui.draw()
@@ -0,0 +1,153 @@
+"""
+Replays recorded input logs headlessly and checks that they reproduce the
+recorded results.
+
+Usage: python -m utils.replay recordings/<log>.tslog [...] [--realtime]
+"""
+import argparse
+import json
+import random
+import sys
+import time
+from typing import Any, Callable
+import arcade
+from utils.input_log import InputLog
+from utils.helpers import key_mapping
+from typing_trainer.trainer_engine import TrainerEngine
+from space_shooter.simulation import SpaceShooterSimulation
+from space_shooter.difficulty import Difficulty
+
+
+def _pace(log: InputLog, realtime: bool, sleep: Callable[[float], None]) -> Callable[[int], None]:
+    """
+    Returns a function that waits until an event is due (in realtime mode)
+    """
+    if not realtime or not log.events:
+        return lambda timestamp_ns: None
+    first_ns = log.events[0].timestamp_ns
+    replay_start_ns = time.perf_counter_ns()
+
+    def wait(timestamp_ns: int) -> None:
+        delay_ns = (timestamp_ns - first_ns) - (time.perf_counter_ns() - replay_start_ns)
+        if delay_ns > 0:
+            sleep(delay_ns / 1e9)
+    return wait
+
+
+def replay_trainer_log(log: InputLog, realtime: bool = False, sleep: Callable[[float], None] = time.sleep) -> dict[str, Any]:
+    """
+    Feeds a typing trainer log through a TrainerEngine and returns its results
+    """
+    random.seed(log.seed)
+    chunks = iter([event.payload.split(" ") for event in log if event.kind == InputLog.TEXT_CHUNK])
+    engine = TrainerEngine(
+        log.metadata["words"],
+        word_chunks=chunks if log.metadata.get("endless") else None,
+        summarize_segments=True
+    )
+    wait = _pace(log, realtime, sleep)
+    for event in log:
+        wait(event.timestamp_ns)
+        if event.kind == InputLog.TEXT:
+            engine.type_char(chr(event.code), clock_ns=event.timestamp_ns)
+        elif event.kind == InputLog.BACKSPACE:
+            engine.backspace(clock_ns=event.timestamp_ns)
+        elif event.kind == InputLog.START:
+            engine.start(clock_ns=event.timestamp_ns)
+        elif event.kind == InputLog.PAUSE:
+            engine.pause(clock_ns=event.timestamp_ns)
+        elif event.kind == InputLog.RESUME:
+            engine.resume(clock_ns=event.timestamp_ns)
+    return engine.recording_results()
+
+
+def replay_shooter_log(log: InputLog, realtime: bool = False, sleep: Callable[[float], None] = time.sleep) -> dict[str, Any]:
+    """
+    Feeds a space shooter log through a SpaceShooterSimulation and returns its results
+    """
+    difficulty_setting = log.metadata.get("difficulty_setting")
+    simulation = SpaceShooterSimulation(
+        log.metadata.get("width", 1280),
+        log.metadata.get("height", 720),
+        difficulty_level=log.metadata.get("difficulty_level", 1),
+        seed=log.seed,
+        difficulty_setting=Difficulty.DifficultySetting.from_data(difficulty_setting) if difficulty_setting else None
+    )
+    wait = _pace(log, realtime, sleep)
+    for event in log:
+        wait(event.timestamp_ns)
+        if event.kind == InputLog.UPDATE:
+            simulation.advance(event.code)
+        elif event.kind == InputLog.KEY_PRESS and event.code != arcade.key.ESCAPE:
+            simulation.type_key(key_mapping.get(event.code, ""))
+    return simulation.get_results()
+
+
+REPLAYERS = {
+    "typing_trainer": replay_trainer_log,
+    "space_shooter": replay_shooter_log,
+}
+
+
+def replay(log: InputLog, realtime: bool = False) -> dict[str, Any]:
+    """
+    Replays a log of any supported game and returns its results
+    """
+    replayer = REPLAYERS.get(log.game)
+    if replayer is None:
+        raise ValueError(f"Replaying '{log.game}' logs is not supported")
+    return replayer(log, realtime=realtime)
+
+
+def compare_results(expected: dict[str, Any], actual: dict[str, Any]) -> list[str]:
+    """
+    Returns the differences between recorded and replayed results (empty if they match)
+    """
+    # Compare the JSON forms, as the recorded results went through JSON
+    actual = json.loads(json.dumps(actual))
+    differences = []
+    for name in sorted(set(expected) | set(actual)):
+        if name not in expected or name not in actual:
+            differences.append(f"{name}: only in {'replay' if name in actual else 'recording'}")
+        elif isinstance(expected[name], list) and isinstance(actual[name], list):
+            if len(expected[name]) != len(actual[name]):
+                differences.append(f"{name}: {len(expected[name])} recorded, {len(actual[name])} replayed")
+            for i, (expected_item, actual_item) in enumerate(zip(expected[name], actual[name])):
+                if isinstance(expected_item, dict) and isinstance(actual_item, dict):
+                    differences.extend(
+                        f"{name}[{i}].{field}" for field in sorted(set(expected_item) | set(actual_item))
+                        if expected_item.get(field) != actual_item.get(field)
+                    )
+                elif expected_item != actual_item:
+                    differences.append(f"{name}[{i}]")
+        elif expected[name] != actual[name]:
+            differences.append(f"{name}: {expected[name]!r} recorded, {actual[name]!r} replayed")
+    return differences
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    Replays the given logs and reports whether they match their recordings
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("logs", nargs="+", help="Input logs to replay")
+    parser.add_argument("--realtime", action="store_true", help="Replay at the recorded pace")
+    args = parser.parse_args(argv)
+    exit_code = 0
+    for path in args.logs:
+        log = InputLog.load(path)
+        start = time.perf_counter()
+        results = replay(log, realtime=args.realtime)
+        elapsed = time.perf_counter() - start
+        differences = compare_results(log.metadata.get("results", {}), results)
+        status = "OK" if not differences else "MISMATCH"
+        print(f"{path}: {status} ({len(log)} events in {elapsed:.3f} s)")
+        for difference in differences:
+            print(f"  {difference}")
+        if differences:
+            exit_code = 1
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
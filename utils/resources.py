@@ -1,54 +1,213 @@
 import arcade
+from PIL import Image
 from utils.colors import BROWN, BEIGE
-from utils.helpers import load_image
+from utils.sound_manager import SoundManager
+from utils.audio_cache import AudioCache, CachedSound, warm_up_audio
+from utils.assets import AssetHandle, AssetRegistry
+from utils.texture_cache import TextureCache
+from utils.texture_atlas import AnimationAtlas, displayed_frame_indices
 
+# Every asset is a lazy handle: call `get()` to use it. Nothing is loaded at
+# import time; the manifests at the bottom are preloaded from the main menu.
+ASSETS = AssetRegistry()
+# Inverted and tinted images, derived once and then read from the disk cache
+TEXTURE_CACHE = TextureCache()
+# The explosion animation lasts 0.6 s, i.e. 36 updates at 60 fps, so only 36
+# of the 160 frames of the spritesheet are ever shown. They are kept at half
+# resolution (explosions are drawn at twice the texture scale).
+EXPLOSION_DISPLAYED_FRAMES = 36
+EXPLOSION_TEXTURE_SCALE = 0.5
+EXPLOSION_ATLAS_COLUMNS = 6
 
-# Textures
-SEPIA_BACKGROUND = arcade.load_texture("assets/images/sepia_background.png")
-METEOR_SPRITE_1 = arcade.load_texture("assets/sprites/meteorBrown_big1.png")
-METEOR_SPRITE_2 = arcade.load_texture("assets/sprites/meteorBrown_big3.png")
-METEOR_SPRITE_3 = arcade.load_texture("assets/sprites/meteorBrown_big4.png")
-SPACESHIP_SPRITE = arcade.Texture(
-    load_image(
-        "assets/sprites/playerShip2_red.png",
-        tint_color=BEIGE[:3]
+
+def _load_explosion_textures() -> list[arcade.Texture]:
+    """
+    Loads the explosion animation from its atlas: only the frames that are
+    displayed, trimmed and downsampled (derived once from the spritesheet)
+    """
+    path = "assets/images/explosion.png"
+    frame_indices = displayed_frame_indices(16*10, EXPLOSION_DISPLAYED_FRAMES)
+    image = TEXTURE_CACHE.load_derived(
+        path,
+        ("animation_atlas", (256, 256), 16, tuple(frame_indices), EXPLOSION_TEXTURE_SCALE, EXPLOSION_ATLAS_COLUMNS),
+        lambda: AnimationAtlas.build_image(
+            Image.open(path).convert("RGBA"),
+            frame_size=(256, 256),
+            sheet_columns=16,
+            frame_indices=frame_indices,
+            scale=EXPLOSION_TEXTURE_SCALE,
+            columns=EXPLOSION_ATLAS_COLUMNS
+        )
     )
+    atlas = AnimationAtlas(image, len(frame_indices), EXPLOSION_ATLAS_COLUMNS)
+    # Explosions never collide, so skip computing detailed hit boxes
+    return [
+        arcade.Texture(atlas.frame(i), hit_box_algorithm=arcade.hitbox.algo_bounding_box)
+        for i in range(atlas.frame_count)
+    ]
+
+
+# Textures
+SEPIA_BACKGROUND = ASSETS.register(
+    "sepia_background",
+    lambda: arcade.load_texture("assets/images/sepia_background.png")
 )
-SPACESHIP_DAMAGE_SPRITE_1 = arcade.load_texture("assets/sprites/playerShip2_damage1.png")
-SPACESHIP_DAMAGE_SPRITE_2 = arcade.load_texture("assets/sprites/playerShip2_damage2.png")
-LASER_SPRITE = arcade.Texture(
-    load_image(
-        "assets/sprites/laserRed16.png",
-        tint_color=BEIGE[:3]
+METEOR_SPRITE_1 = ASSETS.register(
+    "meteor_1",
+    lambda: arcade.load_texture("assets/sprites/meteorBrown_big1.png")
+)
+METEOR_SPRITE_2 = ASSETS.register(
+    "meteor_2",
+    lambda: arcade.load_texture("assets/sprites/meteorBrown_big3.png")
+)
+METEOR_SPRITE_3 = ASSETS.register(
+    "meteor_3",
+    lambda: arcade.load_texture("assets/sprites/meteorBrown_big4.png")
+)
+
+
+def spaceship_sprite(tint_color: tuple[int, int, int]) -> AssetHandle:
+    """
+    Returns the handle of the spaceship texture tinted with a color (e.g. the
+    ship color of a user profile), registering it on first request
+    """
+    name = "spaceship_{:02x}{:02x}{:02x}".format(*tint_color)
+    handle = ASSETS.handles.get(name)
+    if handle is None:
+        handle = ASSETS.register(
+            name,
+            lambda: arcade.Texture(
+                TEXTURE_CACHE.load_image(
+                    "assets/sprites/playerShip2_red.png",
+                    tint_color=tint_color
+                )
+            )
+        )
+    return handle
+
+
+SPACESHIP_SPRITE = spaceship_sprite(BEIGE[:3])
+SPACESHIP_DAMAGE_SPRITE_1 = ASSETS.register(
+    "spaceship_damage_1",
+    lambda: arcade.load_texture("assets/sprites/playerShip2_damage1.png")
+)
+SPACESHIP_DAMAGE_SPRITE_2 = ASSETS.register(
+    "spaceship_damage_2",
+    lambda: arcade.load_texture("assets/sprites/playerShip2_damage2.png")
+)
+LASER_SPRITE = ASSETS.register(
+    "laser",
+    lambda: arcade.Texture(
+        TEXTURE_CACHE.load_image(
+            "assets/sprites/laserRed16.png",
+            tint_color=BEIGE[:3]
+        )
     )
 )
-USER_PROFILE_SPRITE = arcade.Texture(
-    load_image(
-        "assets/sprites/account.png",
-        invert=True,
-        tint_color=BROWN[:3]
+USER_PROFILE_SPRITE = ASSETS.register(
+    "user_profile",
+    lambda: arcade.Texture(
+        TEXTURE_CACHE.load_image(
+            "assets/sprites/account.png",
+            invert=True,
+            tint_color=BROWN[:3]
+        )
     )
 )
 
 # Texture list for explosion
-EXPLOSION_SPRITESHEET = arcade.load_spritesheet("assets/images/explosion.png")
-EXPLOSION_TEXTURE_LIST = EXPLOSION_SPRITESHEET.get_texture_grid(
-    size=(256, 256),
-    columns=16,
-    count=16*10
-)
+EXPLOSION_TEXTURE_LIST = ASSETS.register("explosion_textures", _load_explosion_textures)
 
 # Music
-MAIN_MENU_MUSIC = arcade.Sound("assets/sounds/hard_boiled.mp3", streaming=True)
-AI_TRAINER_MUSIC = arcade.Sound("assets/sounds/vibing_over_venus.mp3", streaming=True)
-SPACE_SHOOTER_MUSIC = arcade.Sound("assets/sounds/space_jazz.mp3", streaming=True)
-
-# Sounds
-KEYPRESS_SOUND = arcade.Sound("assets/sounds/eklee-KeyPressMac06.wav", streaming=False)
-ERROR_SOUND = arcade.Sound("assets/sounds/error-03-125761.mp3", streaming=False)
-GAME_OVER_SOUND = arcade.Sound("assets/sounds/game-over-417465.mp3", streaming=False)
-LASER_SOUND = arcade.Sound("assets/sounds/laser2.wav", streaming=False)
-EXPLOSION_SOUND = arcade.Sound("assets/sounds/explosion2.wav", streaming=False)
-
-# Hack: for fixing the initial sound distortion, play something at zero volume
-arcade.play_sound(LASER_SOUND, volume=0)
\ No newline at end of file
+MAIN_MENU_MUSIC = ASSETS.register(
+    "main_menu_music",
+    lambda: arcade.Sound("assets/sounds/hard_boiled.mp3", streaming=True)
+)
+AI_TRAINER_MUSIC = ASSETS.register(
+    "ai_trainer_music",
+    lambda: arcade.Sound("assets/sounds/vibing_over_venus.mp3", streaming=True)
+)
+SPACE_SHOOTER_MUSIC = ASSETS.register(
+    "space_shooter_music",
+    lambda: arcade.Sound("assets/sounds/space_jazz.mp3", streaming=True)
+)
+
+# Sounds (decoded once, then memory-mapped from the audio cache)
+AUDIO_CACHE = AudioCache()
+
+
+def _load_sound_effect(file_name: str, voice_count: int, steal: bool = True) -> CachedSound:
+    """
+    Loads a sound effect and sets its voices (concurrency cap)
+    """
+    sound = AUDIO_CACHE.load(file_name)
+    SoundManager.configure(sound, voice_count=voice_count, steal=steal)
+    return sound
+
+
+KEYPRESS_SOUND = ASSETS.register(
+    "keypress_sound",
+    lambda: _load_sound_effect("assets/sounds/eklee-KeyPressMac06.wav", voice_count=4)
+)
+ERROR_SOUND = ASSETS.register(
+    "error_sound",
+    lambda: _load_sound_effect("assets/sounds/error-03-125761.mp3", voice_count=2)
+)
+GAME_OVER_SOUND = ASSETS.register(
+    "game_over_sound",
+    lambda: _load_sound_effect("assets/sounds/game-over-417465.mp3", voice_count=1, steal=False)
+)
+LASER_SOUND = ASSETS.register(
+    "laser_sound",
+    lambda: _load_sound_effect("assets/sounds/laser2.wav", voice_count=6)
+)
+EXPLOSION_SOUND = ASSETS.register(
+    "explosion_sound",
+    lambda: _load_sound_effect("assets/sounds/explosion2.wav", voice_count=4)
+)
+SOUND_EFFECTS = [KEYPRESS_SOUND, ERROR_SOUND, GAME_OVER_SOUND, LASER_SOUND, EXPLOSION_SOUND]
+
+# Preload manifests
+ASSETS.add_manifest("main_menu", [SEPIA_BACKGROUND, USER_PROFILE_SPRITE, MAIN_MENU_MUSIC])
+ASSETS.add_manifest("sound_effects", SOUND_EFFECTS)
+ASSETS.add_manifest(
+    "space_shooter",
+    [
+        SEPIA_BACKGROUND,
+        METEOR_SPRITE_1,
+        METEOR_SPRITE_2,
+        METEOR_SPRITE_3,
+        SPACESHIP_SPRITE,
+        SPACESHIP_DAMAGE_SPRITE_1,
+        SPACESHIP_DAMAGE_SPRITE_2,
+        LASER_SPRITE,
+        EXPLOSION_TEXTURE_LIST,
+        SPACE_SHOOTER_MUSIC,
+        KEYPRESS_SOUND,
+        ERROR_SOUND,
+        GAME_OVER_SOUND,
+        LASER_SOUND,
+        EXPLOSION_SOUND
+    ]
+)
+ASSETS.add_manifest(
+    "typing_trainer",
+    [SEPIA_BACKGROUND, AI_TRAINER_MUSIC, KEYPRESS_SOUND, ERROR_SOUND]
+)
+
+
+def preload_game_assets() -> None:
+    """
+    Starts loading, in the background, the assets of the games behind the main
+    menu. Once the sound effects are loaded, the audio device is opened (also in
+    the background) and their voices allocated, so that neither the menu nor the
+    first plays wait for the audio path.
+    """
+    ASSETS.preload(
+        "sound_effects",
+        on_ready=lambda: warm_up_audio(
+            lambda: SoundManager.warm_up([sound.get() for sound in SOUND_EFFECTS])
+        )
+    )
+    ASSETS.preload("space_shooter")
+    ASSETS.preload("typing_trainer")
@@ -3,8 +3,11 @@ import os
 import json
 from utils.user_profile import UserProfile
 from typing_trainer.session_stats import SessionStats, SessionStatsList
+from typing_trainer.key_timing import KeyTimingStats
+from typing_trainer.bigram_stats import BigramStats
+from typing_trainer.confusion_matrix import ConfusionMatrix
+from typing_trainer.rolling_stats import RollingWindowStore
 from space_shooter.game_stats import GameStats, GameStatsList
-from dataclasses import asdict
 from collections import defaultdict
 
 
@@ -14,6 +17,8 @@ class SaveManager:
     """
 
     SAVE_FOLDER = "save/"
+    # Rolling window stores, shared by all the SaveManager instances of a profile
+    _rolling_window_stores: dict[str, RollingWindowStore] = {}
 
     def __init__(self, user_profile: UserProfile):
         """
@@ -37,13 +42,25 @@ class SaveManager:
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             session_start_time TIMESTAMP NOT NULL,
             char_confusion_matrix TEXT,
+            -- Raw flight times, only in rows saved before char_timing
             char_times TEXT,
             wpm REAL,
             word_mistype_counts TEXT,
             chars_typed_correctly INTEGER,
             chars_typed_total INTEGER,
             accuracy REAL,
-            duration_seconds REAL
+            duration_seconds REAL,
+            char_timing TEXT
+        )
+        """
+        create_bigram_stats_table_sql = """
+        CREATE TABLE IF NOT EXISTS trainer_bigram_stats (
+            previous_char TEXT NOT NULL,
+            char TEXT NOT NULL,
+            count INTEGER,
+            mean REAL,
+            m2 REAL,
+            PRIMARY KEY (previous_char, char)
         )
         """
         create_space_shooter_table_sql = """
@@ -53,10 +70,53 @@ class SaveManager:
             score INTEGER
         )
         """
+        create_user_profile_table_sql = """
+        CREATE TABLE IF NOT EXISTS user_profile (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            ship_color TEXT
+        )
+        """
         with sqlite3.connect(self.file_path) as conn:
             cursor = conn.cursor()
             cursor.execute(create_session_stats_table_sql)
+            cursor.execute(create_bigram_stats_table_sql)
             cursor.execute(create_space_shooter_table_sql)
+            cursor.execute(create_user_profile_table_sql)
+            self._add_missing_columns(
+                cursor,
+                "trainer_session_stats",
+                {"char_timing": "TEXT"}
+            )
+
+    def _add_missing_columns(self, cursor: sqlite3.Cursor, table: str, columns: dict[str, str]) -> None:
+        """
+        Adds columns introduced after the table was first created (for older save files)
+        """
+        cursor.execute(f"PRAGMA table_info({table})")
+        existing_columns = {row[1] for row in cursor.fetchall()}
+        for column, column_type in columns.items():
+            if column not in existing_columns:
+                cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {column_type}")
+
+    def load_user_profile(self) -> None:
+        """
+        Loads the saved settings of the user profile (if any) into it
+        """
+        with sqlite3.connect(self.file_path) as conn:
+            row = conn.execute("SELECT ship_color FROM user_profile WHERE id = 1").fetchone()
+        if row is not None and row[0] is not None:
+            self.user_profile.ship_color = tuple(json.loads(row[0]))
+
+    def save_user_profile(self) -> None:
+        """
+        Saves the settings of the user profile
+        """
+        with sqlite3.connect(self.file_path) as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO user_profile (id, ship_color) VALUES (1, ?)",
+                (json.dumps(list(self.user_profile.ship_color)),)
+            )
+            conn.commit()
 
     def save_game_score_to_db(self, game_stats: GameStats) -> None:
         """
@@ -105,33 +165,61 @@ class SaveManager:
         INSERT INTO trainer_session_stats (
             session_start_time, 
             char_confusion_matrix,
-            char_times,
             wpm,
             word_mistype_counts,
             chars_typed_correctly,
             chars_typed_total,
             accuracy,
-            duration_seconds
+            duration_seconds,
+            char_timing
         )
         VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
         """
         if self._is_session_significant(session_stats):
-            stats_dict = asdict(session_stats)
             data_tuple = (
-                stats_dict["session_start_time"],
-                json.dumps(stats_dict["char_confusion_matrix"]),
-                json.dumps(stats_dict["char_times"]),
-                stats_dict["wpm"],
-                json.dumps(stats_dict["word_mistype_counts"]),
-                stats_dict["chars_typed_correctly"],
-                stats_dict["chars_typed_total"],
-                stats_dict["accuracy"],
-                stats_dict["duration_seconds"]
+                session_stats.session_start_time,
+                json.dumps(session_stats.char_confusion_matrix.to_dict()),
+                session_stats.wpm,
+                json.dumps(session_stats.word_mistype_counts),
+                session_stats.chars_typed_correctly,
+                session_stats.chars_typed_total,
+                session_stats.accuracy,
+                session_stats.duration_seconds,
+                json.dumps(session_stats.char_timing.to_dict())
             )
             with sqlite3.connect(self.file_path) as conn:
                 cursor = conn.cursor()
                 cursor.execute(insert_query, data_tuple)
+                self._merge_bigram_stats(cursor, session_stats.bigram_timing)
                 conn.commit()
+            if self.file_path in self._rolling_window_stores:
+                self._rolling_window_stores[self.file_path].add(session_stats)
+
+    def _merge_bigram_stats(self, cursor: sqlite3.Cursor, bigram_stats: BigramStats) -> None:
+        """
+        Merges a session's bigram accumulator into the stored (profile-wide) accumulator.
+        Only the cells touched by the session are rewritten.
+        """
+        if len(bigram_stats) == 0:
+            return
+        cursor.execute("SELECT previous_char, char, count, mean, m2 FROM trainer_bigram_stats")
+        stored_stats = BigramStats.from_rows(cursor.fetchall())
+        stored_stats.merge(bigram_stats)
+        touched = set((row[0], row[1]) for row in bigram_stats.to_rows())
+        cursor.executemany(
+            "INSERT OR REPLACE INTO trainer_bigram_stats VALUES (?, ?, ?, ?, ?)",
+            [row for row in stored_stats.to_rows() if (row[0], row[1]) in touched]
+        )
+
+    def get_bigram_stats(self) -> BigramStats:
+        """
+        Gets the accumulated bigram (transition) timing stats from the database.
+        """
+        query = "SELECT previous_char, char, count, mean, m2 FROM trainer_bigram_stats"
+        with sqlite3.connect(self.file_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute(query)
+            return BigramStats.from_rows(cursor.fetchall())
 
     def _is_session_significant(self, session_stats: SessionStats) -> bool:
         """
@@ -183,6 +271,27 @@ class SaveManager:
                     word_mistype_counts[word] += count
         return word_mistype_counts
 
+    def _session_stats_from_row(self, row: sqlite3.Row) -> SessionStats:
+        """
+        Builds a SessionStats object from a trainer_session_stats row.
+        """
+        if row["char_timing"] is not None:
+            char_timing = KeyTimingStats.from_dict(json.loads(row["char_timing"]))
+        else:
+            # Rows saved before the accumulators only have the raw flight times
+            char_timing = KeyTimingStats.from_char_times(json.loads(row["char_times"]))
+        return SessionStats(
+            session_start_time=row["session_start_time"],
+            char_confusion_matrix=ConfusionMatrix.from_dict(json.loads(row["char_confusion_matrix"])),
+            char_timing=char_timing,
+            wpm=row["wpm"],
+            word_mistype_counts=json.loads(row["word_mistype_counts"]),
+            chars_typed_correctly=row["chars_typed_correctly"],
+            chars_typed_total=row["chars_typed_total"],
+            accuracy=row["accuracy"],
+            duration_seconds=row["duration_seconds"],
+        )
+
     def get_all_session_stats(self, limit=20) -> SessionStatsList:
         """
         Gets all session stats from the database.
@@ -194,22 +303,35 @@ class SaveManager:
             cursor = conn.cursor()
             cursor.execute(query)
             for row in cursor.fetchall():
-                session_stats_list.append(
-                    SessionStats(
-                        session_start_time=row["session_start_time"],
-                        char_confusion_matrix=json.loads(row["char_confusion_matrix"]),
-                        char_times=json.loads(row["char_times"]),
-                        wpm=row["wpm"],
-                        word_mistype_counts=json.loads(row["word_mistype_counts"]),
-                        chars_typed_correctly=row["chars_typed_correctly"],
-                        chars_typed_total=row["chars_typed_total"],
-                        accuracy=row["accuracy"],
-                        duration_seconds=row["duration_seconds"],
-                    )
-                )
+                session_stats_list.append(self._session_stats_from_row(row))
         session_stats_list.reverse()
         return session_stats_list
-    
+
+    def get_rolling_window_store(self) -> RollingWindowStore:
+        """
+        Returns the rolling window store for this profile.
+
+        The store is built once per profile (reading only as much recent history
+        as its windows need) and then kept up to date as sessions are saved.
+        """
+        store = self._rolling_window_stores.get(self.file_path)
+        if store is None:
+            store = RollingWindowStore()
+            recent_sessions = []
+            keystrokes = 0
+            query = "SELECT * FROM trainer_session_stats ORDER BY session_start_time DESC"
+            with sqlite3.connect(self.file_path) as conn:
+                conn.row_factory = sqlite3.Row
+                for row in conn.execute(query):
+                    recent_sessions.append(self._session_stats_from_row(row))
+                    keystrokes += row["chars_typed_total"]
+                    if store.history_is_sufficient(len(recent_sessions), keystrokes, row["session_start_time"]):
+                        break
+            for session_stats in reversed(recent_sessions):
+                store.add(session_stats)
+            self._rolling_window_stores[self.file_path] = store
+        return store
+
     def get_number_of_sessions(self) -> int:
         """
         Returns the number of sessions stored in the database
@@ -0,0 +1,180 @@
+import time
+from typing import Any, Callable
+import arcade
+from pyglet import media
+
+
+class Voice(media.Player):
+    """
+    A player that keeps its source (and its driver voice) when playback ends,
+    so that it can be restarted without allocating anything
+    """
+
+    def on_eos(self) -> None:
+        """
+        Rewinds and pauses instead of advancing to the next source
+        """
+        self.pause()
+        self.seek(0.0)
+
+
+def create_voice(source: media.Source) -> Voice:
+    """
+    Creates a voice with the given source queued
+    """
+    voice = Voice()
+    voice.queue(source)
+    return voice
+
+
+class SoundPool:
+    """
+    A fixed set of preallocated voices for one sound.
+
+    A play uses a free voice; when all the voices are busy, the one that started
+    first is restarted (stolen), or the play is dropped if stealing is disabled.
+    Plays within `coalesce_seconds` of the previous one are merged into it.
+    """
+
+    def __init__(
+        self,
+        source: Any,
+        voice_count: int,
+        steal: bool = True,
+        coalesce_seconds: float = 1 / 60,
+        voice_factory: Callable[[Any], Any] = create_voice,
+        clock: Callable[[], float] = time.perf_counter
+    ) -> None:
+        """
+        Initializer
+        """
+        self.voices = [voice_factory(source) for _ in range(voice_count)]
+        self.start_times = [float("-inf")] * voice_count
+        self.steal = steal
+        self.coalesce_seconds = coalesce_seconds
+        self.clock = clock
+        self.last_voice = None
+        self.last_play_time = float("-inf")
+        self.plays = 0
+        self.coalesced = 0
+        self.stolen = 0
+        self.dropped = 0
+
+    def voices_in_use(self) -> int:
+        return sum(voice.playing for voice in self.voices)
+
+    def play(self, volume: float = 1.0, speed: float = 1.0) -> bool:
+        """
+        Plays the sound. Returns False if the play was coalesced or dropped.
+        """
+        now = self.clock()
+        if self.last_voice is not None and now - self.last_play_time < self.coalesce_seconds:
+            self.coalesced += 1
+            self.last_voice.volume = max(self.last_voice.volume, volume)
+            return False
+        index = next((i for i, voice in enumerate(self.voices) if not voice.playing), None)
+        if index is None:
+            if not self.steal:
+                self.dropped += 1
+                return False
+            index = min(range(len(self.voices)), key=self.start_times.__getitem__)
+            self.stolen += 1
+        voice = self.voices[index]
+        if voice.playing:
+            voice.pause()
+            voice.seek(0.0)
+        voice.volume = volume
+        voice.pitch = speed
+        voice.play()
+        self.start_times[index] = now
+        self.last_voice = voice
+        self.last_play_time = now
+        self.plays += 1
+        return True
+
+    def delete(self) -> None:
+        """
+        Releases the voices
+        """
+        for voice in self.voices:
+            voice.delete()
+        self.voices.clear()
+
+
+class SoundManager:
+    """
+    Plays sound effects through pooled voices, instead of creating a new
+    player for every play like `arcade.play_sound` does.
+    """
+
+    DEFAULT_VOICE_COUNT = 4
+    _pools: dict[arcade.Sound, SoundPool] = {}
+    _settings: dict[arcade.Sound, dict[str, Any]] = {}
+    voice_factory: Callable[[Any], Any] = staticmethod(create_voice)
+
+    @classmethod
+    def configure(cls, sound: arcade.Sound, voice_count: int = DEFAULT_VOICE_COUNT, steal: bool = True) -> None:
+        """
+        Sets the number of voices (i.e. the concurrency cap) of a sound, and
+        whether busy voices are stolen or new plays dropped.
+        """
+        cls._settings[sound] = dict(voice_count=voice_count, steal=steal)
+        pool = cls._pools.pop(sound, None)
+        if pool is not None:
+            pool.delete()
+
+    @classmethod
+    def get_pool(cls, sound: arcade.Sound) -> SoundPool:
+        """
+        Returns the pool of a sound, allocating its voices on first use
+        """
+        pool = cls._pools.get(sound)
+        if pool is None:
+            settings = cls._settings.get(sound, dict(voice_count=cls.DEFAULT_VOICE_COUNT))
+            pool = cls._pools[sound] = SoundPool(
+                sound.source, voice_factory=cls.voice_factory, **settings
+            )
+        return pool
+
+    @classmethod
+    def play_sound(cls, sound: arcade.Sound, volume: float = 1.0, speed: float = 1.0) -> bool:
+        """
+        Plays a sound effect. Returns False if the play was coalesced or dropped.
+        """
+        return cls.get_pool(sound).play(volume, speed)
+
+    @classmethod
+    def warm_up(cls, sounds: list[arcade.Sound]) -> None:
+        """
+        Allocates the voices of the given sounds and starts one of them silently,
+        so that the first audible play does not pay for initializing the audio path
+        """
+        pools = [cls.get_pool(sound) for sound in sounds]
+        if pools and pools[0].voices:
+            voice = pools[0].voices[0]
+            voice.volume = 0.0
+            voice.play()
+
+    @classmethod
+    def get_counters(cls) -> dict[str, int]:
+        """
+        Returns the number of voices in use and the play counters over all sounds
+        """
+        pools = cls._pools.values()
+        return dict(
+            voices=sum(len(pool.voices) for pool in pools),
+            voices_in_use=sum(pool.voices_in_use() for pool in pools),
+            plays=sum(pool.plays for pool in pools),
+            coalesced=sum(pool.coalesced for pool in pools),
+            stolen=sum(pool.stolen for pool in pools),
+            dropped=sum(pool.dropped for pool in pools)
+        )
+
+    @classmethod
+    def reset(cls) -> None:
+        """
+        Releases all the voices
+        """
+        for pool in cls._pools.values():
+            pool.delete()
+        cls._pools.clear()
@@ -0,0 +1,101 @@
+import math
+from PIL import Image
+
+
+def displayed_frame_indices(count: int, displayed_count: int) -> list[int]:
+    """
+    Returns the indices of the frames of an animation that are actually shown,
+    when its `count` frames are played back over `displayed_count` updates
+    """
+    return [i * count // displayed_count for i in range(displayed_count)]
+
+
+def centered_trim_box(frames: list[Image.Image]) -> tuple[int, int, int, int]:
+    """
+    Returns the smallest box around the frames' center that contains every
+    non-transparent pixel of every frame. The box is symmetric, so sprites of
+    the trimmed frames stay centered on the same point.
+    """
+    width, height = frames[0].size
+    half_width = half_height = 1
+    for frame in frames:
+        box = frame.getchannel("A").getbbox()
+        if box is None:
+            continue
+        left, top, right, bottom = box
+        half_width = max(half_width, width // 2 - left, right - width // 2)
+        half_height = max(half_height, height // 2 - top, bottom - height // 2)
+    half_width = min(half_width, width // 2)
+    half_height = min(half_height, height // 2)
+    return (
+        width // 2 - half_width,
+        height // 2 - half_height,
+        width // 2 + half_width,
+        height // 2 + half_height
+    )
+
+
+class AnimationAtlas:
+    """
+    The frames of an animation packed in a grid in a single image, with the
+    rect (left, top, width, height) of each frame
+    """
+
+    def __init__(self, image: Image.Image, frame_count: int, columns: int) -> None:
+        """
+        Initializer
+        """
+        self.image = image
+        self.frame_count = frame_count
+        self.columns = columns
+        rows = math.ceil(frame_count / columns)
+        self.frame_width = image.width // columns
+        self.frame_height = image.height // rows
+        self.rects = [
+            (
+                (i % columns) * self.frame_width,
+                (i // columns) * self.frame_height,
+                self.frame_width,
+                self.frame_height
+            )
+            for i in range(frame_count)
+        ]
+
+    @classmethod
+    def build_image(
+        cls,
+        sheet: Image.Image,
+        frame_size: tuple[int, int],
+        sheet_columns: int,
+        frame_indices: list[int],
+        scale: float,
+        columns: int
+    ) -> Image.Image:
+        """
+        Builds the atlas image of some frames of a spritesheet: the frames are
+        trimmed of their transparent borders, downsampled by `scale` and packed
+        `columns` per row
+        """
+        frame_width, frame_height = frame_size
+        frames = []
+        for index in frame_indices:
+            row, column = divmod(index, sheet_columns)
+            left, top = column * frame_width, row * frame_height
+            frames.append(sheet.crop((left, top, left + frame_width, top + frame_height)))
+        trim_box = centered_trim_box(frames)
+        trimmed_width = trim_box[2] - trim_box[0]
+        trimmed_height = trim_box[3] - trim_box[1]
+        size = (max(1, round(trimmed_width * scale)), max(1, round(trimmed_height * scale)))
+        rows = math.ceil(len(frames) / columns)
+        image = Image.new("RGBA", (size[0] * columns, size[1] * rows), (0, 0, 0, 0))
+        for i, frame in enumerate(frames):
+            frame = frame.crop(trim_box).resize(size, Image.Resampling.LANCZOS)
+            image.paste(frame, ((i % columns) * size[0], (i // columns) * size[1]))
+        return image
+
+    def frame(self, index: int) -> Image.Image:
+        """
+        Returns the image of a frame
+        """
+        left, top, width, height = self.rects[index]
+        return self.image.crop((left, top, left + width, top + height))
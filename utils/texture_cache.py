@@ -0,0 +1,87 @@
+import hashlib
+import os
+import struct
+import threading
+from typing import Any, Callable
+from PIL import Image
+from utils.helpers import load_image
+
+
+class TextureCache:
+    """
+    Disk cache of derived images (inverted and/or tinted sprites, atlases).
+
+    A derived image is computed once and stored as raw RGBA (after a small size
+    header) under the hash of the source file and of the transform parameters,
+    so edited assets and new tints are derived again. Later loads wrap the
+    cached pixels without any PIL processing.
+    """
+
+    CACHE_FOLDER = "cache/textures/"
+    # Bump when the transforms change, to invalidate the cached images
+    VERSION = 1
+    HEADER = struct.Struct("<4sII")
+    MAGIC = b"RGBA"
+
+    def __init__(self, folder: str = CACHE_FOLDER) -> None:
+        """
+        Initializer
+        """
+        self.folder = folder
+        self.derived_count = 0
+
+    def cache_path(self, path: str, *transform: Any) -> str:
+        """
+        Returns the path of the cached image for a source file and transform
+        (any parameters with a stable repr)
+        """
+        digest = hashlib.sha1()
+        with open(path, "rb") as file:
+            digest.update(file.read())
+        digest.update(repr(transform).encode("utf-8"))
+        return os.path.join(self.folder, f"{digest.hexdigest()}_v{self.VERSION}.rgba")
+
+    def _write(self, cache_path: str, image: Image.Image) -> None:
+        """
+        Writes a cache file atomically, so that a crash never leaves a partial file
+        """
+        os.makedirs(self.folder, exist_ok=True)
+        temp_path = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, "wb") as file:
+            file.write(self.HEADER.pack(self.MAGIC, image.width, image.height))
+            file.write(image.tobytes())
+        os.replace(temp_path, cache_path)
+
+    def load_derived(self, path: str, transform: tuple, derive: Callable[[], Image.Image]) -> Image.Image:
+        """
+        Returns the RGBA image derived from a source file by a transform,
+        calling `derive` only if it is not cached yet
+        """
+        cache_path = self.cache_path(path, *transform)
+        if not os.path.exists(cache_path):
+            image = derive().convert("RGBA")
+            self._write(cache_path, image)
+            self.derived_count += 1
+            return image
+        with open(cache_path, "rb") as file:
+            data = file.read()
+        magic, width, height = self.HEADER.unpack_from(data, 0)
+        if magic != self.MAGIC or len(data) != self.HEADER.size + width * height * 4:
+            raise ValueError(f"Corrupt texture cache file: {cache_path}")
+        return Image.frombuffer("RGBA", (width, height), memoryview(data)[self.HEADER.size:], "raw", "RGBA", 0, 1)
+
+    def load_image(
+        self,
+        path: str,
+        invert: bool = False,
+        tint_color: tuple[int, int, int] = (255, 255, 255)
+    ) -> Image.Image:
+        """
+        Returns the RGBA image of `load_image(path, invert, tint_color)`,
+        deriving it only if it is not cached yet
+        """
+        return self.load_derived(
+            path,
+            (bool(invert), tuple(tint_color)),
+            lambda: load_image(path, invert=invert, tint_color=tint_color)
+        )
@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from utils.colors import BEIGE, SHIP_COLORS
 
 
 @dataclass
@@ -7,4 +8,14 @@ class UserProfile:
     Represents a user profile.
     """
     name: str
-    display_name: str
\ No newline at end of file
+    display_name: str
+    # Tint of the player's spaceship in the Space Shooter
+    ship_color: tuple[int, int, int] = BEIGE[:3]
+
+    def next_ship_color(self) -> tuple[int, int, int]:
+        """
+        Returns the ship color following the current one in SHIP_COLORS
+        """
+        if self.ship_color not in SHIP_COLORS:
+            return SHIP_COLORS[0]
+        return SHIP_COLORS[(SHIP_COLORS.index(self.ship_color) + 1) % len(SHIP_COLORS)]
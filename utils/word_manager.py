@@ -1,18 +1,27 @@
 import random
+import numpy as np
 import pandas as pd
 from collections import defaultdict
+from typing_trainer.bigram_stats import BigramStats
 
 
-def calculate_char_weights(char_metrics_df: pd.DataFrame, noise: float = 1.0) -> defaultdict[str, float]:
+def calculate_char_weights(
+    char_metrics_df: pd.DataFrame,
+    noise: float = 1.0,
+    rng: random.Random | None = None
+) -> defaultdict[str, float]:
     """
-    Calculates weights for each character based on accuracy.
+    Calculates weights for each character based on accuracy (with noise drawn
+    from the given random generator, or the global one).
     """
+    if rng is None:
+        rng = random
     if char_metrics_df.shape[0] > 0:
         weights = char_metrics_df.apply(
             lambda x: 100 * (1 - x['accuracy']) +\
                 0.5 * min(100.0, x['mean_flight_time'] * 50) +\
                 10.0 * int(x['count_total'] < 50) +\
-                noise * random.gauss(), 
+                noise * rng.gauss(), 
             axis=1
         )
         char_weights = defaultdict(
@@ -43,17 +52,37 @@ def calculate_word_weights(word_mistype_counts, weight_decay_exponent=1.1):
     return word_weights
 
 
+def calculate_bigram_weights(bigram_stats: BigramStats, min_count: int = 3) -> np.ndarray:
+    """
+    Calculates a weight for each bigram based on its mean flight time, relative
+    to the overall mean (1.0 is average, above 1.0 is slower than average).
+    Bigrams with fewer than `min_count` samples get the neutral weight.
+
+    Returns a flat array indexed by (previous * BigramStats.SIZE + next).
+    """
+    weights = np.ones(BigramStats.SIZE * BigramStats.SIZE)
+    count = bigram_stats.count.ravel()
+    mean = bigram_stats.mean.ravel()
+    reliable = count >= min_count
+    if reliable.any():
+        overall_mean = np.average(mean[reliable], weights=count[reliable])
+        weights[reliable] = mean[reliable] / overall_mean
+    return weights
+
+
 class WordManager:
     """Class for loading and managing words"""
 
     # --- Weight Calculation Constants ---
     WEIGHT_CHAR_SCORE = 1.0
     WEIGHT_WORD_SCORE = 0.0
+    WEIGHT_BIGRAM_SCORE = 20.0
     WEIGHT_RANDOM = 2.0
 
     def __init__(self, file_path="words_v1.txt"):
         self._load_words(file_path)
         self._group_words_by_length()
+        self._bigram_index = None
 
     def _load_words(self, file_path):
         """
@@ -61,32 +90,75 @@ class WordManager:
         """
         self.word_list = []
         with open(file_path, 'r') as file:
-            self.word_list = list(set(file.read().split()))
+            # Sorted, so that seeded samples do not depend on the hash seed
+            self.word_list = sorted(set(file.read().split()))
     
     def _group_words_by_length(self):
         self.words_by_length = defaultdict(list)
-        for word in self.word_list:
+        self.word_indexes_by_length = defaultdict(list)
+        for i, word in enumerate(self.word_list):
             self.words_by_length[len(word)].append(word)
+            self.word_indexes_by_length[len(word)].append(i)
+
+    def _build_bigram_index(self):
+        """
+        Precomputes the bigram ids of every word in the word list.
+
+        All words are joined into one buffer and encoded at once. For word k,
+        its bigrams are the ids at positions starts[k] .. starts[k] + lengths[k] - 2.
+        Ids of bigrams that fall outside BigramStats.ALPHABET are -1.
+        """
+        lookup = np.full(256, -1, dtype=np.int64)
+        for c, i in BigramStats.CHAR_INDEX.items():
+            lookup[ord(c)] = i
+        joined = " ".join(self.word_list).encode("ascii", errors="replace")
+        codes = lookup[np.frombuffer(joined, dtype=np.uint8)]
+        lengths = np.array([len(word) for word in self.word_list], dtype=np.int64)
+        starts = np.concatenate([[0], np.cumsum(lengths + 1)[:-1]])
+        bigram_ids = codes[:-1] * BigramStats.SIZE + codes[1:]
+        bigram_ids[(codes[:-1] < 0) | (codes[1:] < 0)] = -1
+        self._bigram_index = (bigram_ids, starts, lengths)
+
+    def calculate_bigram_scores(self, bigram_weights):
+        """
+        Returns the mean bigram weight of every word in the word list (1.0 for
+        words without bigrams), aligned with `self.word_list`.
+        """
+        if self._bigram_index is None:
+            self._build_bigram_index()
+        bigram_ids, starts, lengths = self._bigram_index
+        valid = bigram_ids >= 0
+        weights = np.where(valid, bigram_weights[np.maximum(bigram_ids, 0)], 0.0)
+        weight_sums = np.concatenate([[0.0], np.cumsum(weights)])
+        valid_counts = np.concatenate([[0], np.cumsum(valid)])
+        ends = starts + np.maximum(lengths - 1, 0)
+        totals = weight_sums[ends] - weight_sums[starts]
+        counts = valid_counts[ends] - valid_counts[starts]
+        return np.where(counts > 0, totals / np.maximum(counts, 1), 1.0)
 
-    def _calculate_hybrid_word_weights(self, word_list, char_weights, word_weights, weight_base_multiplier=1.0):
+    def _calculate_hybrid_word_weights(self, word_list, char_weights, word_weights, weight_base_multiplier=1.0, bigram_scores=None, rng=None):
         """
-        Calculates a hybrid weight for each word based on character and word weights.
+        Calculates a hybrid weight for each word based on character, word and bigram weights.
         """
+        if rng is None:
+            rng = random
         weighted_word_list = []
-        for word in word_list:
+        for i, word in enumerate(word_list):
             character_score = sum(char_weights[char] for char in word) * 1.0 / len(word)
             word_score = word_weights[word]
+            bigram_score = bigram_scores[i] if bigram_scores is not None else 0.0
 
             # Calculate final hybrid weight
             final_weight = (self.WEIGHT_CHAR_SCORE * character_score) + \
                            (self.WEIGHT_WORD_SCORE * word_score) + \
-                           self.WEIGHT_RANDOM * random.gauss()
+                           (self.WEIGHT_BIGRAM_SCORE * bigram_score) + \
+                           self.WEIGHT_RANDOM * rng.gauss()
 
             weighted_word_list.append((word, final_weight))
 
         return weighted_word_list
 
-    def get_weighted_sample(self, num_words, char_weights, word_weights, min_character_count=1, max_character_count=99):
+    def get_weighted_sample(self, num_words, char_weights, word_weights, min_character_count=1, max_character_count=99, bigram_weights=None, rng=None):
         """
         Generates a list of words using a weighted sampling algorithm.
 
@@ -96,18 +168,30 @@ class WordManager:
             word_weights (defaultdict): A dictionary mapping words to their weights.
             min_character_count (int): The minimum length of words to include.
             max_character_count (int): The maximum length of words to include.
+            bigram_weights (np.ndarray | None): Optional flat array of bigram weights
+                (see `calculate_bigram_weights`), used to favor words with slow transitions.
+            rng (random.Random | None): The random generator of the weight noise
+                (default: the global one).
 
         Returns:
             list: A list of unique words.
         """
         filtered_word_list = []
+        filtered_indexes = []
         for length in range(min_character_count, max_character_count + 1):
             filtered_word_list.extend(self.words_by_length.get(length, []))
+            filtered_indexes.extend(self.word_indexes_by_length.get(length, []))
 
         if not filtered_word_list:
             return []
 
-        weighted_words = self._calculate_hybrid_word_weights(filtered_word_list, char_weights, word_weights)
+        bigram_scores = None
+        if bigram_weights is not None:
+            bigram_scores = self.calculate_bigram_scores(bigram_weights)[filtered_indexes]
+
+        weighted_words = self._calculate_hybrid_word_weights(
+            filtered_word_list, char_weights, word_weights, bigram_scores=bigram_scores, rng=rng
+        )
 
         scored_words = []
         for word, weight in weighted_words:
@@ -147,10 +231,48 @@ class WordManager:
         final_word_list = random.sample(filtered_word_list, num_words)
         return final_word_list
 
-    def generate_word(self, min_character_count=4, max_character_count=7):
+    def stream_word_chunks(self, chunk_size, candidates=None, min_character_count=3, max_character_count=9):
+        """
+        Generator that endlessly yields chunks of words.
+
+        Args:
+            chunk_size (int): The number of words in each chunk.
+            candidates (callable | None): Optional function returning the current
+                pool of (targeted) words. It is called for every chunk, so the pool
+                can be replaced while streaming. Without a pool (or with an empty
+                one), the words are sampled randomly.
+            min_character_count (int): The minimum length of random words.
+            max_character_count (int): The maximum length of random words.
+
+        Yields:
+            list: A list of `chunk_size` words. Words of the previous chunk are not
+                repeated when the pool is large enough.
+        """
+        previous_chunk = set()
+        while True:
+            pool = candidates() if candidates is not None else None
+            if pool:
+                fresh = [word for word in pool if word not in previous_chunk]
+                if len(fresh) < chunk_size:
+                    fresh = list(pool)
+                chunk = random.sample(fresh, min(chunk_size, len(fresh)))
+                while len(chunk) < chunk_size:
+                    chunk.append(random.choice(pool))
+            else:
+                chunk = [
+                    self.generate_word(min_character_count, max_character_count)
+                    for _ in range(chunk_size)
+                ]
+            previous_chunk = set(chunk)
+            yield chunk
+
+    def generate_word(self, min_character_count=4, max_character_count=7, rng=None):
         """
-        Generate new words by sampling from the existing list
+        Generate new words by sampling from the existing list (with the given
+        random generator, or the global one)
         """
-        character_count = random.randint(min_character_count, max_character_count)
-        word = random.choice(self.words_by_length[character_count])
+        if rng is None:
+            rng = random
+        character_count = rng.randint(min_character_count, max_character_count)
+        word = rng.choice(self.words_by_length[character_count])
         return word